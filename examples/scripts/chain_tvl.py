@@ -1,5 +1,4 @@
 
-import requests
 import pandas as pd
 from string import Template
 import sys
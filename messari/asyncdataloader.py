@@ -0,0 +1,364 @@
+"""This module is meant to contain the AsyncDataLoader class"""
+
+
+import asyncio
+import contextvars
+import functools
+import inspect
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+import aiohttp
+
+from messari.dataloader import DataLoader, query_items, header_items
+from messari.cache import request_key
+from messari.pagination import AsyncPaginator
+from messari.streaming import ColumnBuffer
+
+# State of the method call being replayed, None outside of a replay
+_REPLAY: contextvars.ContextVar = contextvars.ContextVar('replay', default=None)
+
+
+class _Replay:
+    """Responses fetched & fan_out items completed so far by a replayed method call.
+
+    fan_out items are keyed by their path, the position of each enclosing
+    fan_out call & item, so a pass reuses what earlier passes already parsed
+    instead of running func again (its parsing, DataFrame building & errors).
+    """
+
+    def __init__(self):
+        self.responses: Dict = {}
+        # {item path: (item, result, errors)} of items that didn't wait on a request
+        self.results: Dict = {}
+        # fan_out calls made by this pass under each enclosing item path
+        self.calls: Dict = {}
+        self.path: Tuple = ()
+
+    def next_call(self) -> Tuple:
+        """Path of a fan_out call made under the current item, in call order"""
+        count = self.calls.get(self.path, 0)
+        self.calls[self.path] = count + 1
+        return self.path + (count,)
+
+    def completed(self, path: Tuple, item: Any) -> Union[Tuple, None]:
+        """(result, errors) of the item at path if an earlier pass completed it"""
+        if path not in self.results:
+            return None
+        done_item, result, errors = self.results[path]
+        try:
+            same = bool(done_item == item)
+        except (TypeError, ValueError):
+            same = False
+        return (result, errors) if same else None
+
+
+class _PendingRequests(BaseException):
+    """Raised from get_content when a replayed method needs responses that
+    haven't been fetched yet. Derives from BaseException so the error handling
+    inside data source methods (i.e. fan_out collecting errors) never catches it
+    """
+
+    def __init__(self, requests_in: Dict):
+        BaseException.__init__(self, f'{len(requests_in)} pending requests')
+        self.requests = requests_in
+
+
+def _async_method(func: Callable) -> Callable:
+    """Turn a synchronous data source method into a coroutine function"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if _REPLAY.get() is not None:
+            # Called by another method that is already being replayed, stay synchronous
+            return func(self, *args, **kwargs)
+        # wrapper is installed as a method of an AsyncDataLoader subclass
+        return self._replay(func, *args, **kwargs)  # pylint: disable=protected-access
+
+    wrapper.async_wrapped = True
+    return wrapper
+
+
+class AsyncDataLoader(DataLoader):
+    """This class is meant to represent an asyncio version of DataLoader.
+
+    Async data sources mix this class in front of the synchronous wrapper,
+    i.e. class AsyncMessari(AsyncDataLoader, Messari), and every public method
+    of the wrapper becomes a coroutine (iter_ methods return an AsyncPaginator
+    & set_ methods stay synchronous).
+    The synchronous method is replayed, each pass reads responses already
+    fetched & the requests it is still missing are gathered concurrently on a
+    pooled aiohttp connector, until the method returns. Parsing & DataFrame
+    building is shared with the synchronous classes, only the transport differs.
+
+    Most methods replay once, after a single round of requests. Methods whose
+    requests depend on earlier responses (i.e. Scanner.rpc_batch rounds,
+    get_logs_range windows, crawl_account_records bisection) take a pass per
+    round. fan_out items completed in an earlier pass are reused as they were
+    returned, so only the method's own code between fan_out calls runs again,
+    a request made outside of fan_out is decoded again on each pass.
+    fan_out funcs shouldn't depend on state the method changes between passes.
+
+    Methods that can't be replayed (i.e. ones driving a process pool) are
+    overridden w/ a coroutine of the same name by the async data source, those
+    overrides disable pylint's invalid-overridden-method.
+    """
+    # Max open connections for the pooled connector, 0 means no limit
+    connector_limit = 100
+    _client_session = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, attr in inspect.getmembers(cls, inspect.isfunction):
+            # iter_ methods return paginators, they make their requests when iterated,
+            # set_ methods configure the data source
+            if name.startswith(('_', 'iter_', 'set_')) or hasattr(AsyncDataLoader, name):
+                continue
+            if not inspect.isfunction(inspect.getattr_static(cls, name)):
+                continue
+            # already wrapped, or written as a coroutine by the async data source
+            if getattr(attr, 'async_wrapped', False) or inspect.iscoroutinefunction(attr):
+                continue
+            setattr(cls, name, _async_method(attr))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the aiohttp session & its pooled connections"""
+        if self._client_session is not None and not self._client_session.closed:
+            await self._client_session.close()
+        self._client_session = None
+
+    def get_content(self, endpoint_url: str, params: Dict = None, headers: Dict = None) -> bytes:
+        """Returns the response body fetched for this request during the current replay.
+
+        :param endpoint_url: str
+            URL API string.
+        :param params: dict
+            Dictionary of query parameters.
+        :param headers: str:
+            Dictionary of headers
+        :return: bytes of the response body
+        :raises SystemError if HTTP error occurs
+        """
+        replay = _REPLAY.get()
+        if replay is None:
+            raise RuntimeError(f'{type(self).__name__} requests are made by awaiting its methods')
+
+        request = (endpoint_url, query_items(params), header_items(headers))
+        if request not in replay.responses:
+            raise _PendingRequests({request: None})
+        content = replay.responses[request]
+        if isinstance(content, Exception):
+            raise content
+        return content
+
+    def post_content(self, endpoint_url: str, data: bytes, headers: Dict = None) -> bytes:
+        """Returns the response body POSTed for this request during the current replay.
+
+        :param endpoint_url: str
+            URL API string.
+        :param data: bytes
+            Request body
+        :param headers: str:
+            Dictionary of headers
+        :return: bytes of the response body
+        :raises SystemError if HTTP error occurs
+        """
+        replay = _REPLAY.get()
+        if replay is None:
+            raise RuntimeError(f'{type(self).__name__} requests are made by awaiting its methods')
+
+        # POSTs are told apart from GETs by the body at the end of the request
+        request = (endpoint_url, (), header_items(headers), data)
+        if request not in replay.responses:
+            raise _PendingRequests({request: None})
+        content = replay.responses[request]
+        if isinstance(content, Exception):
+            raise content
+        return content
+
+    def stream_response(self, endpoint_url: str, patterns: List[str], params: Dict = None,
+                        headers: Dict = None, flatten: bool = False,
+                        min_size: int = None) -> Dict[str, ColumnBuffer]:
+        """Parses the body fetched for this request incrementally, keeping only the
+        items found at patterns. aiohttp reads the whole body during the fetch
+        round, only the decoded document is never built.
+
+        :param endpoint_url: str
+            URL API string.
+        :param patterns: list
+            ijson style prefixes of the items to keep, i.e. 'chainTvls.*.tvl.item'
+        :param params: dict
+            Dictionary of query parameters.
+        :param headers: str:
+            Dictionary of headers
+        :param flatten: bool
+            Merge nested objects into their item, see messari.streaming.ColumnBuffer
+        :param min_size: int
+            Bodies under this many bytes are decoded whole instead
+        :return: {prefix: ColumnBuffer}, see messari.streaming.stream_columns
+        :raises SystemError if HTTP error occurs
+        """
+        content = self.get_content(endpoint_url, params=params, headers=headers)
+        return self._parse_columns(content, patterns, flatten, min_size)
+
+    def fan_out(self, func: Callable[[Any], Any], items: List,
+                fail_fast: bool = None) -> List:
+        """Runs func over every item, collecting the requests each item is
+        waiting on so they are all fetched together in the next round. Items
+        completed in an earlier pass of the replay aren't run again.
+
+        :param func: Callable
+            Function run once per item, usually wraps a get_response call
+        :param items: list
+            Inputs passed to func one at a time (slugs, addresses, blocks...)
+        :param fail_fast: bool
+            True raises the first error. False logs the error, appends
+            (item, error) to self.errors & returns None for that item.
+            Defaults to self.fail_fast
+        :return: List of results ordered like items
+        """
+        if fail_fast is None:
+            fail_fast = self.fail_fast
+        replay = _REPLAY.get()
+        if replay is None:
+            with self.errors_scope():
+                return [self._fan_out_call(func, item, fail_fast) for item in items]
+
+        call_path = replay.next_call()
+        results = []
+        pending: Dict = {}
+        with self.errors_scope() as errors:
+            for index, item in enumerate(items):
+                path = call_path + (index,)
+                completed = replay.completed(path, item)
+                if completed is not None:
+                    result, item_errors = completed
+                    errors.extend(item_errors)
+                    results.append(result)
+                    continue
+
+                errors_len = len(errors)
+                replay.path = path
+                try:
+                    result = self._fan_out_call(func, item, fail_fast)
+                except _PendingRequests as e:
+                    pending.update(e.requests)
+                    results.append(None)
+                    continue
+                finally:
+                    replay.path = call_path[:-1]
+                replay.results[path] = (item, result, errors[errors_len:])
+                results.append(result)
+        if pending:
+            raise _PendingRequests(pending)
+        return results
+
+    def paginate(self, fetch_page: Callable[[int], List], page_size: int = None,
+                 start: int = 0, prefetch: int = 0, max_pages: int = None) -> AsyncPaginator:
+        """Wraps a function fetching one page in a lazy AsyncPaginator, the iter_
+        methods of async data sources return these to be iterated w/ async for.
+
+        :param fetch_page: Callable
+            Returns the list of records on a page, given its page number
+        :param page_size: int
+            Records on a full page, a shorter page is the last one
+        :param start: int
+            Number of the first page
+        :param prefetch: int
+            Pages fetched concurrently ahead of the one being consumed
+        :param max_pages: int
+            Stop after this many pages
+        :return: AsyncPaginator, async iterating it yields records & iter_pages yields pages
+        """
+        return AsyncPaginator(self, fetch_page, page_size=page_size, start=start,
+                              prefetch=prefetch, max_pages=max_pages)
+
+    async def _replay(self, func: Callable, *args, **kwargs) -> Any:
+        """Rerun func until every request it makes has a response"""
+        replay = _Replay()
+        # every pass collects errors into the same list, self.errors of this call
+        with self.errors_scope() as errors:
+            errors_len = len(errors)
+            while True:
+                replay.calls = {}
+                token = _REPLAY.set(replay)
+                try:
+                    return func(self, *args, **kwargs)
+                except _PendingRequests as e:
+                    # errors from this pass are recorded again on the next one
+                    del errors[errors_len:]
+                    pending = list(e.requests)
+                finally:
+                    _REPLAY.reset(token)
+
+                contents = await asyncio.gather(*[self._fetch(*request) for request in pending])
+                replay.responses.update(zip(pending, contents))
+
+    async def _fetch(self, endpoint_url: str, params: Tuple, headers: Tuple,
+                     data: bytes = None) -> Any:
+        """Fetch a single request, errors are returned to be raised during the replay.
+        POSTs (data isn't None) skip the request memo & cache"""
+        if data is not None:
+            return await self._fetch_content(endpoint_url, params, headers, data)
+        memo_key = request_key(endpoint_url, params, headers)
+        return await self.memo.get_or_fetch_async(
+            memo_key, lambda: self._fetch_content(endpoint_url, params, headers),
+            reuse=self._memo_reuse(endpoint_url, params))
+
+    async def _fetch_content(self, endpoint_url: str, params: Tuple, headers: Tuple,
+                             data: bytes = None) -> Any:
+        """Makes the request for _fetch, using the cache, rate limiter & retries"""
+        if data is not None:
+            cache_key, entry, ttl = None, None, None
+        else:
+            cache_key, entry, ttl = self._cache_lookup(endpoint_url, params, headers)
+        request_headers = dict(headers)
+        if entry is not None:
+            if entry.is_fresh:
+                return entry.content
+            request_headers.update(entry.conditional_headers)
+
+        session = self._get_client_session()
+        try:
+            for attempt in range(self.max_retries + 1):
+                await asyncio.sleep(self._rate_limit_wait(endpoint_url))
+                if data is not None:
+                    request = session.post(endpoint_url, data=data, headers=request_headers)
+                else:
+                    request = session.get(endpoint_url, params=list(params),
+                                          headers=request_headers)
+                async with request as response:
+                    content = await response.read()
+                    retry_status = self._retry_status(response.status, content)
+                    if response.status == 304 and entry is not None:
+                        self.cache.refresh(cache_key, ttl)
+                        return entry.content
+                    if retry_status is None or attempt == self.max_retries:
+                        response.raise_for_status()
+                        if retry_status is None:
+                            self._cache_store(cache_key, endpoint_url, ttl,
+                                              content, response.headers)
+                        return content
+                    delay = self._retry_delay(endpoint_url, retry_status,
+                                              response.headers.get('Retry-After'), attempt)
+                await asyncio.sleep(delay)
+        except aiohttp.ClientResponseError as e:
+            return SystemError(e)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return e
+
+    def _get_client_session(self) -> aiohttp.ClientSession:
+        """Lazily create the aiohttp session, it has to be made inside the running loop.
+        Keep-alive & timeouts follow self.transport, aiohttp has no HTTP/2 support"""
+        if self._client_session is None or self._client_session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connector_limit,
+                                             force_close=not self.transport.keep_alive)
+            timeout = aiohttp.ClientTimeout(total=None,
+                                            sock_connect=self.transport.connect_timeout,
+                                            sock_read=self.transport.read_timeout)
+            self._client_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._client_session
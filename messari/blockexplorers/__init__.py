@@ -3,11 +3,11 @@
 from .scanner import *
 
 # Localize imports of Explorers
-from .etherscan import Etherscan
-from .snowtrace import SnowTrace
-from .bscscan import BSCscan
-from .ftmscan import FTMscan
-from .arbiscan import Arbiscan
-from .polygonscan import Polygonscan
-from .optimisticetherscan import OptimisticEtherscan
-from .solscan import Solscan
+from .etherscan import Etherscan, AsyncEtherscan
+from .snowtrace import SnowTrace, AsyncSnowTrace
+from .bscscan import BSCscan, AsyncBSCscan
+from .ftmscan import FTMscan, AsyncFTMscan
+from .arbiscan import Arbiscan, AsyncArbiscan
+from .polygonscan import Polygonscan, AsyncPolygonscan
+from .optimisticetherscan import OptimisticEtherscan, AsyncOptimisticEtherscan
+from .solscan import Solscan, AsyncSolscan
@@ -5,14 +5,15 @@ import pandas as pd
 from typing import Union, List
 from messari.blockexplorers import Scanner
 from messari.utils import validate_input
+from messari.asyncdataloader import AsyncDataLoader
 
 BASE_URL='https://api.arbiscan.io/api'
 class Arbiscan(Scanner):
     """This class is a wrapper around the arbiscan API
     """
 
-    def __init__(self, api_key: str=None):
-        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
+    def __init__(self, api_key: str=None, api_tier: str='free'):
+        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key, api_tier=api_tier)
 
     ##### Accounts
     # NOTE: no changes
@@ -101,14 +102,15 @@ class Arbiscan(Scanner):
                 DataFrame containing total supply for token(s)
         """
         tokens = validate_input(tokens_in)
-        supply_dict = {}
-        for token in tokens:
+
+        def get_supply(token):
             params = {'module': 'stats',
                       'action': 'tokenCsupply',
                       'contractaddress': token}
             params.update(self.api_dict)
-            supply = self.get_response(self.base_url, params=params)['result']
-            supply_dict[token] = supply
+            return self.get_response(self.base_url, params=params)['result']
+
+        supply_dict = dict(zip(tokens, self.fan_out(get_supply, tokens)))
         supply_df = pd.Series(supply_dict).to_frame(name='supply')
         return supply_df
 
@@ -125,3 +127,9 @@ class Arbiscan(Scanner):
 
     ##### Stats
     # NOTE: no changes
+
+
+class AsyncArbiscan(AsyncDataLoader, Arbiscan):
+    """This class is an asyncio wrapper around the Arbiscan API,
+    every public Arbiscan method is a coroutine
+    """
@@ -5,14 +5,15 @@ import pandas as pd
 from typing import Union, List
 from messari.blockexplorers import Scanner
 from messari.utils import validate_input
+from messari.asyncdataloader import AsyncDataLoader
 
 BASE_URL='https://api.bscscan.com/api'
 class BSCscan(Scanner):
     """This class is a wrapper around the BSCscan API
     """
 
-    def __init__(self, api_key: str=None):
-        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
+    def __init__(self, api_key: str=None, api_tier: str='free'):
+        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key, api_tier=api_tier)
 
     ##### Accounts
     # NOTE: no changes
@@ -53,14 +54,15 @@ class BSCscan(Scanner):
                 DataFrame containing total supply for token(s)
         """
         tokens = validate_input(tokens_in)
-        supply_dict = {}
-        for token in tokens:
+
+        def get_supply(token):
             params = {'module': 'stats',
                       'action': 'tokenCsupply',
                       'contractaddress': token}
             params.update(self.api_dict)
-            supply = self.get_response(self.base_url, params=params)['result']
-            supply_dict[token] = supply
+            return self.get_response(self.base_url, params=params)['result']
+
+        supply_dict = dict(zip(tokens, self.fan_out(get_supply, tokens)))
         supply_df = pd.Series(supply_dict).to_frame(name='supply')
         return supply_df
 
@@ -117,3 +119,9 @@ class BSCscan(Scanner):
         price_dict = {'btc': bnbbtc, 'usd': bnbusd}
         price_df = pd.Series(price_dict).to_frame(name='bnb_price')
         return price_df
+
+
+class AsyncBSCscan(AsyncDataLoader, BSCscan):
+    """This class is an asyncio wrapper around the BSCscan API,
+    every public BSCscan method is a coroutine
+    """
@@ -6,6 +6,7 @@ import pandas as pd
 
 from messari.utils import validate_datetime
 from messari.blockexplorers import Scanner
+from messari.asyncdataloader import AsyncDataLoader
 
 # Refrence: https://docs.etherscan.io/
 
@@ -14,8 +15,8 @@ class Etherscan(Scanner):
     """This class is a wrapper around the Etherscan API
     """
 
-    def __init__(self, api_key: str=None):
-        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
+    def __init__(self, api_key: str=None, api_tier: str='free'):
+        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key, api_tier=api_tier)
 
     ##### Accounts
     # NOTE: no changes
@@ -136,3 +137,9 @@ class Etherscan(Scanner):
         params.update(self.api_dict)
         nodes_count = self.get_response(self.base_url, params=params)['result']['TotalNodeCount']
         return int(nodes_count)
+
+
+class AsyncEtherscan(AsyncDataLoader, Etherscan):
+    """This class is an asyncio wrapper around the Etherscan API,
+    every public Etherscan method is a coroutine
+    """
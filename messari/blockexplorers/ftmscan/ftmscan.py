@@ -4,14 +4,15 @@
 import pandas as pd
 from typing import Union, List
 from messari.blockexplorers import Scanner
+from messari.asyncdataloader import AsyncDataLoader
 
 BASE_URL='https://api.ftmscan.com/api'
 class FTMscan(Scanner):
     """This class is a wrapper around the FTMscan API
     """
 
-    def __init__(self, api_key: str=None):
-        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
+    def __init__(self, api_key: str=None, api_tier: str='free'):
+        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key, api_tier=api_tier)
 
     ##### Accounts
     # NOTE: no changes
@@ -147,3 +148,9 @@ class FTMscan(Scanner):
         params.update(self.api_dict)
         response = self.get_response(self.base_url, params=params)['result']
         return pd.DataFrame(response)
+
+
+class AsyncFTMscan(AsyncDataLoader, FTMscan):
+    """This class is an asyncio wrapper around the FTMscan API,
+    every public FTMscan method is a coroutine
+    """
@@ -1,13 +1,266 @@
 """This module is dedicated to helpers for the Scanners class"""
 
-from typing import List, Union
+import warnings
+from decimal import Decimal
+from typing import Dict, List, Tuple, Union
+import numpy as np
+import pandas as pd
 from messari.utils import validate_int
 
-def int_to_hex(ints_in: Union[int, List]) -> List[str]:
-    """Converts a lits of integers to a list of hex strings '0x'
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # Arrow parses decimal columns faster but is optional
+    pa = None
+
+# Fields decoded to numbers by typed output, hex ('0x') or decimal strings
+INT_FIELDS = frozenset([
+    'blockNumber', 'nonce', 'transactionIndex', 'value', 'gas', 'gasPrice', 'gasUsed',
+    'cumulativeGasUsed', 'confirmations', 'isError', 'txreceipt_status', 'tokenDecimal',
+    'tokenID', 'blockReward', 'logIndex', 'number', 'difficulty', 'totalDifficulty', 'size',
+    'gasLimit', 'baseFeePerGas', 'effectiveGasPrice', 'status', 'type', 'chainId',
+    'maxFeePerGas', 'maxPriorityFeePerGas', 'balances', 'supply'])
+# Fields holding unix timestamps, decoded to datetime64 by typed output
+TIMESTAMP_FIELDS = frozenset(['timeStamp', 'timestamp'])
+# longdouble is 80 bit extended precision on x86 Linux & macOS but plain float64 on
+# Windows & ARM (Apple silicon, aarch64 Linux is 128 bit), wei-scale values lose digits
+LONGDOUBLE_IS_DOUBLE = np.finfo(np.longdouble).nmant <= np.finfo(np.float64).nmant
+
+def int_to_hex(ints_in: Union[int, List, np.ndarray, pd.Series]) -> List[str]:
+    """Converts a lits of integers to a list of hex strings '0x',
+    numpy arrays & Series of ints are converted whole
     """
+    if isinstance(ints_in, (np.ndarray, pd.Series)):
+        ints_in = ints_in.tolist()
+    elif isinstance(ints_in, np.integer):
+        ints_in = int(ints_in)
     ints = validate_int(ints_in)
-    hex_out = []
-    for int_in in ints:
-        hex_out.append(hex(int_in))
-    return hex_out
+    return [hex(int_in) for int_in in ints]
+
+def _parse_decimal_strings(strings: List[str]) -> np.ndarray:
+    """Column of decimal strings to int64, uint64 or longdouble"""
+    if pa is None:
+        raw = np.array(strings, dtype=bytes)
+        for dtype in (np.int64, np.uint64):
+            try:
+                return raw.astype(dtype)
+            except OverflowError:
+                pass
+        return raw.astype(np.longdouble)
+
+    array = pa.array(strings, type=pa.string())
+    # failed casts are slow, pick the type from the longest string instead
+    width = pc.max(pc.utf8_length(array)).as_py()
+    try:
+        if width <= 18:
+            return pc.cast(array, pa.int64()).to_numpy()
+        if width <= 20:
+            values = pc.cast(array, pa.uint64()).to_numpy()
+            return values.astype(np.int64) if values.max(initial=0) < 2 ** 63 else values
+    except pa.ArrowInvalid:
+        pass
+    if not pc.all(pc.match_substring_regex(array, r'^[0-9]+$')).as_py():
+        raise ValueError('not a base 10 number')
+
+    # wei-scale, cast 18 digit limbs from the right & combine them as longdouble
+    values = np.zeros(len(strings), dtype=np.longdouble)
+    scale = np.longdouble(1)
+    while width > 0:
+        limb = pc.utf8_slice_codeunits(array, start=-18)
+        limb = pc.if_else(pc.equal(limb, ''), '0', limb)
+        values += pc.cast(limb, pa.uint64()).to_numpy().astype(np.longdouble) * scale
+        scale *= np.longdouble(10 ** 18)
+        array = pc.utf8_slice_codeunits(array, start=0, stop=-18)
+        width -= 18
+    return values
+
+def _parse_hex_strings(strings: List[str]) -> np.ndarray:
+    """Column of '0x' hex strings to int64, uint64 or longdouble"""
+    raw = np.array(strings, dtype=bytes)
+    lengths = np.char.str_len(raw)
+    # right align the digits in 16 digit (64 bit) limbs, the 0x prefix turns into leading zeros
+    width = -(-(raw.dtype.itemsize - 2) // 16) * 16 + 2
+    matrix = np.char.zfill(raw, width).view(np.uint8).reshape(len(raw), width)
+    rows, prefix = np.arange(len(raw)), width - lengths
+    if (lengths < 3).any() or not ((matrix[rows, prefix] == ord('0'))
+                                   & (matrix[rows, prefix + 1] == ord('x'))).all():
+        raise ValueError('hex strings should start w/ 0x')
+    matrix[rows, prefix + 1] = ord('0')
+    # bytes.fromhex raises on anything that isn't a hex digit
+    limbs = np.frombuffer(bytes.fromhex(matrix[:, 2:].tobytes().decode('ascii')),
+                          dtype='>u8').reshape(len(raw), -1).astype(np.uint64)
+
+    if not limbs[:, :-1].any():
+        values = limbs[:, -1]
+        return values.astype(np.int64) if values.max(initial=0) < 2 ** 63 else values
+    values = np.zeros(len(raw), dtype=np.longdouble)
+    for limb in limbs.T:
+        values = values * np.longdouble(2 ** 64) + limb
+    return values
+
+def parse_int_strings(strings: List[str], base: int) -> np.ndarray:
+    """Parses a whole column of decimal or hex ('0x' prefixed) strings at once,
+    w/o a Python int per value
+
+    Returns int64 when every value fits, then uint64, then longdouble for
+    wei-scale values, its precision depends on the platform (see LONGDOUBLE_IS_DOUBLE)
+    :raises ValueError if a string isn't a number in base
+    """
+    if base == 16:
+        return _parse_hex_strings(strings)
+    return _parse_decimal_strings(strings)
+
+def decode_int_column(column: pd.Series, exact: bool=True) -> pd.Series:
+    """Decodes a column of hex or decimal strings to int64/uint64, wei-scale
+    columns to exact Decimal or, if not exact, longdouble. Missing values are
+    kept as nullable ints (or NaN/None)
+
+    :raises ValueError if the column isn't all hex or all decimal strings
+    """
+    values = column.to_numpy(dtype=object)
+    missing = pd.isna(column).to_numpy() | (values == '')
+    present = values[~missing].tolist()
+    if not all(isinstance(value, str) for value in present):
+        raise ValueError('column should hold strings')
+    base = 16 if present and present[0].startswith('0x') else 10
+    parsed = parse_int_strings(present, base) if present else np.zeros(0, dtype=np.int64)
+    if exact and parsed.dtype == np.longdouble:
+        parsed = np.array([Decimal(int(value, base)) for value in present], dtype=object)
+    elif parsed.dtype == np.longdouble and LONGDOUBLE_IS_DOUBLE:
+        warnings.warn(f'{column.name} is wei-scale & longdouble is float64 on this platform, '
+                      'values are rounded to 16 digits, decode w/ exact=True to keep them',
+                      RuntimeWarning)
+
+    if not missing.any():
+        return pd.Series(parsed, index=column.index, name=column.name)
+    if parsed.dtype.kind in 'iu':
+        filled = np.zeros(len(values), dtype=parsed.dtype)
+        filled[~missing] = parsed
+        return pd.Series(pd.arrays.IntegerArray(filled, missing), index=column.index,
+                         name=column.name)
+    filled = np.full(len(values), None if parsed.dtype == object else np.nan, dtype=parsed.dtype)
+    filled[~missing] = parsed
+    return pd.Series(filled, index=column.index, name=column.name)
+
+def decode_columns(df: pd.DataFrame, exact: bool=True) -> pd.DataFrame:
+    """Typed copy of a result frame, INT_FIELDS are decoded w/ decode_int_column &
+    TIMESTAMP_FIELDS to datetime64, columns that don't parse are left as strings
+    """
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if name in INT_FIELDS or name in TIMESTAMP_FIELDS:
+            try:
+                column = decode_int_column(column, exact=exact)
+            except ValueError:
+                pass
+            else:
+                if name in TIMESTAMP_FIELDS:
+                    column = pd.to_datetime(column, unit='s', origin='unix')
+        columns[name] = column
+    return pd.DataFrame(columns, index=df.index)
+
+# Columns returned by list actions, used to type empty results
+RESULT_COLUMNS = {
+    'txlist': ['blockNumber', 'timeStamp', 'hash', 'nonce', 'blockHash', 'transactionIndex',
+               'from', 'to', 'value', 'gas', 'gasPrice', 'isError', 'txreceipt_status',
+               'input', 'contractAddress', 'cumulativeGasUsed', 'gasUsed', 'confirmations',
+               'methodId', 'functionName'],
+    'txlistinternal': ['blockNumber', 'timeStamp', 'hash', 'from', 'to', 'value',
+                       'contractAddress', 'input', 'type', 'gas', 'gasUsed', 'traceId',
+                       'isError', 'errCode'],
+    'tokentx': ['blockNumber', 'timeStamp', 'hash', 'nonce', 'blockHash', 'from',
+                'contractAddress', 'to', 'value', 'tokenName', 'tokenSymbol', 'tokenDecimal',
+                'transactionIndex', 'gas', 'gasPrice', 'gasUsed', 'cumulativeGasUsed',
+                'input', 'confirmations'],
+    'tokennfttx': ['blockNumber', 'timeStamp', 'hash', 'nonce', 'blockHash', 'from',
+                   'contractAddress', 'to', 'tokenID', 'tokenName', 'tokenSymbol',
+                   'tokenDecimal', 'transactionIndex', 'gas', 'gasPrice', 'gasUsed',
+                   'cumulativeGasUsed', 'input', 'confirmations'],
+    'getminedblocks': ['blockNumber', 'timeStamp', 'blockReward'],
+    'getlogs': ['address', 'topics', 'data', 'blockNumber', 'timeStamp', 'gasPrice',
+                'gasUsed', 'logIndex', 'transactionHash', 'transactionIndex'],
+}
+
+# Fields identifying a record of a list action, used to dedupe crawled histories
+RECORD_KEYS = {
+    'txlist': ('hash',),
+    'txlistinternal': ('hash', 'traceId'),
+    'tokentx': ('hash', 'logIndex'),
+    'tokennfttx': ('hash', 'logIndex'),
+    'getlogs': ('transactionHash', 'logIndex'),
+}
+
+def record_key(record: Dict, action: str) -> Tuple:
+    """Identity of a record, the whole record when the action's key fields are missing
+    (i.e. explorers leaving logIndex out of tokentx)
+    """
+    fields = RECORD_KEYS.get(action, ())
+    key = tuple(record.get(field) for field in fields)
+    if fields and all(value not in (None, '') for value in key):
+        return key
+    return tuple(sorted((field, str(value)) for field, value in record.items()))
+
+def split_block_range(start_block: int, end_block: int, shards: int) -> List[Tuple[int, int]]:
+    """Splits [start_block, end_block] into up to shards contiguous inclusive ranges
+    """
+    shards = max(1, min(shards, end_block - start_block + 1))
+    size, extra = divmod(end_block - start_block + 1, shards)
+    ranges = []
+    first = start_block
+    for shard in range(shards):
+        last = first + size - 1 + (1 if shard < extra else 0)
+        ranges.append((first, last))
+        first = last + 1
+    return ranges
+
+def result_to_df(result: List[Dict], action: str) -> pd.DataFrame:
+    """Converts a list result to a DataFrame, empty results keep the action's columns
+    """
+    if not result and action in RESULT_COLUMNS:
+        return pd.DataFrame(columns=RESULT_COLUMNS[action], dtype=object)
+    return pd.DataFrame(result)
+
+def records_to_long_df(results: List[Union[List[Dict], None]], keys: List[str], action: str,
+                       key_name: str='account') -> pd.DataFrame:
+    """Long format frame of every entity's list result, one row per record w/ the
+    entity in key_name. Built as one Arrow table straight from the records
+    (no per-entity frames or padding), low cardinality strings are dictionary
+    encoded. W/o pyarrow a plain frame w/ a categorical key_name is returned
+    """
+    categories = list(dict.fromkeys(keys))
+    codes = {key: code for code, key in enumerate(categories)}
+    records, key_codes = [], []
+    for key, result in zip(keys, results):
+        if result:
+            records += result
+            key_codes += [codes[key]] * len(result)
+
+    if pa is None:
+        frame = pd.DataFrame(records, columns=None if records else RESULT_COLUMNS.get(action))
+        frame.insert(0, key_name, pd.Categorical.from_codes(key_codes, categories))
+        return frame
+
+    # the union of every record's fields, the action's columns first
+    names = [name for name in RESULT_COLUMNS.get(action, [])
+             if not records or any(name in record for record in records[:1000])]
+    names += sorted(set().union(*map(dict.keys, records)).difference(names))
+    columns = {}
+    for name in names:
+        values = [record.get(name) for record in records]
+        first = next((value for value in values if value is not None), '')
+        if isinstance(first, str):
+            columns[name] = pa.array(values, type=pa.string())
+            # dictionary encode strings that repeat, judging by a sample
+            sample = values[:1000]
+            if sample and len(set(sample)) <= len(sample) // 2:
+                columns[name] = pc.dictionary_encode(columns[name])
+        else:
+            columns[name] = pa.array(values)
+    table = pa.table(columns)
+    key_column = pa.DictionaryArray.from_arrays(pa.array(key_codes, type=pa.int32()),
+                                                pa.array(categories, type=pa.string()))
+    table = table.add_column(0, key_name, key_column)
+    if not hasattr(pd, 'ArrowDtype'):  # pandas < 1.5, columns convert to numpy dtypes
+        return table.to_pandas()
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
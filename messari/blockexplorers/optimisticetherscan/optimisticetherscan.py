@@ -5,6 +5,7 @@ import pandas as pd
 
 from messari.blockexplorers import Scanner
 from messari.utils import validate_input
+from messari.asyncdataloader import AsyncDataLoader
 
 BASE_URL='https://api-optimistic.etherscan.io/api'
 # Reference: https://optimistic.etherscan.io/apis
@@ -12,42 +13,44 @@ class OptimisticEtherscan(Scanner):
     """This class is a wrapper around the OptimisticEtherscan API
     """
 
-    def __init__(self, api_key: str=None):
-        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
+    def __init__(self, api_key: str=None, api_tier: str='free'):
+        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key, api_tier=api_tier)
 
     ##### Accounts
     def get_account_l1_deposits(self, accounts_in: Union[str, List],
                                 ascending:bool=True) -> pd.DataFrame:
         accounts = validate_input(accounts_in)
         sort = 'asc' if ascending else 'desc'
-        df_list=[]
-        for account in accounts:
+
+        def get_deposits_df(account):
             params = {'module': 'account',
                       'action': 'getdeposittx',
                       'address': account,
                       'sortorder': sort}
             params.update(self.api_dict)
-            response = self.get_response(self.BASE_URL, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        deposits_df = pd.concat(df_list, keys=accounts, axis=1)
+            response = self.get_response(self.base_url, params=params)['result']
+            return pd.DataFrame(response)
+
+        df_list = self.fan_out(get_deposits_df, accounts)
+        deposits_df = self.concat_entities(df_list, accounts, key_name='account')
         return deposits_df
 
     def get_account_l2_withdrawals(self, accounts_in: Union[str, List], ascending:bool=True) -> pd.DataFrame:
         accounts = validate_input(accounts_in)
         # NOTE: sort may not be an argument
         sort = 'asc' if ascending else 'desc'
-        df_list=[]
-        for account in accounts:
+
+        def get_withdrawals_df(account):
             params = {'module': 'account',
                       'action': 'getwithdrawaltx',
                       'address': account,
                       'sortorder': sort}
             params.update(self.api_dict)
-            response = self.get_response(self.BASE_URL, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        deposits_df = pd.concat(df_list, keys=accounts, axis=1)
+            response = self.get_response(self.base_url, params=params)['result']
+            return pd.DataFrame(response)
+
+        df_list = self.fan_out(get_withdrawals_df, accounts)
+        deposits_df = self.concat_entities(df_list, accounts, key_name='account')
         return deposits_df
 
     #TODO: missing a lot?
@@ -162,5 +165,11 @@ class OptimisticEtherscan(Scanner):
         params = {'module': 'stats',
                   'action': 'optimismsupply'}
         params.update(self.api_dict)
-        response = self.get_response(self.BASE_URL, params=params)['result']
+        response = self.get_response(self.base_url, params=params)['result']
         return int(response)
+
+
+class AsyncOptimisticEtherscan(AsyncDataLoader, OptimisticEtherscan):
+    """This class is an asyncio wrapper around the Optimistic Etherscan API,
+    every public OptimisticEtherscan method is a coroutine
+    """
@@ -5,14 +5,15 @@ import pandas as pd
 from messari.utils import validate_input
 
 from messari.blockexplorers import Scanner
+from messari.asyncdataloader import AsyncDataLoader
 
 BASE_URL='https://api.polygonscan.com/api'
 class Polygonscan(Scanner):
     """This class is a wrapper around the Polygonscan API
     """
 
-    def __init__(self, api_key: str=None):
-        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
+    def __init__(self, api_key: str=None, api_tier: str='free'):
+        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key, api_tier=api_tier)
 
     ##### Accounts
     # NOTE: no changes
@@ -53,14 +54,15 @@ class Polygonscan(Scanner):
                 DataFrame containing total supply for token(s)
         """
         tokens = validate_input(tokens_in)
-        supply_dict = {}
-        for token in tokens:
+
+        def get_supply(token):
             params = {'module': 'stats',
                       'action': 'tokenCsupply',
                       'contractaddress': token}
             params.update(self.api_dict)
-            supply = self.get_response(self.base_url, params=params)['result']
-            supply_dict[token] = supply
+            return self.get_response(self.base_url, params=params)['result']
+
+        supply_dict = dict(zip(tokens, self.fan_out(get_supply, tokens)))
         supply_df = pd.Series(supply_dict).to_frame(name='supply')
         return supply_df
 
@@ -107,3 +109,9 @@ class Polygonscan(Scanner):
         price_dict = {'btc': maticbtc, 'usd': maticusd}
         price_df = pd.Series(price_dict).to_frame(name='matic_price')
         return price_df
+
+
+class AsyncPolygonscan(AsyncDataLoader, Polygonscan):
+    """This class is an asyncio wrapper around the Polygonscan API,
+    every public Polygonscan method is a coroutine
+    """
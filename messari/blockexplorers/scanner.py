@@ -1,25 +1,222 @@
 """This module is meant to contain the Scanner class"""
 
-from typing import Union, List, Dict
+from collections import deque
+from typing import Iterator, Union, List, Dict, Tuple
+import json
+import logging
+from urllib.parse import urlparse
 import pandas as pd
 
 from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
+from messari.pagination import Paginator
 from messari.utils import validate_input, validate_int
-from .helpers import int_to_hex
+from .helpers import (decode_columns, decode_int_column, int_to_hex, record_key,
+                      records_to_long_df, result_to_df, split_block_range)
+
+# Calls per second for each API plan, requests w/o an API key get 1 call every 5 seconds
+# Refrence: https://docs.etherscan.io/support/rate-limits
+API_TIER_LIMITS = {'free': 5,
+                   'standard': 10,
+                   'advanced': 20,
+                   'professional': 30}
+
+# Account queries only return their first 10000 results, page * offset can't go past it
+RESULT_WINDOW = 10000
+# balancemulti takes at most 20 addresses per request
+BALANCE_MULTI_MAX = 20
+# getlogs returns at most 1000 logs per request
+LOGS_CAP = 1000
+# Calls per JSON-RPC batch, batch sizing starts at RPC_BATCH_SIZE & adapts up to RPC_BATCH_MAX
+RPC_BATCH_SIZE = 100
+RPC_BATCH_MAX = 1000
+LOG_TOPIC_PARAMS = ('topic0', 'topic1', 'topic2', 'topic3',
+                    'topic0_1_opr', 'topic1_2_opr', 'topic2_3_opr',
+                    'topic0_2_opr', 'topic0_3_opr', 'topic1_3_opr')
+
+class ScannerError(SystemError):
+    """Raised when a block explorer API answers with an error payload
+    ({"status": "0", "message": "NOTOK", ...} or a JSON-RPC error)
+    """
+
+
+class ScannerRateLimitError(ScannerError):
+    """Raised when a block explorer API still reports a rate limit after every retry
+    """
+
+
+def is_rate_limit_message(message: str) -> bool:
+    """True if a block explorer error message is about rate limiting
+    (i.e. 'Max rate limit reached', 'Max calls per sec rate limit reached (5/sec)')
+    """
+    return isinstance(message, str) and 'rate limit' in message.lower()
+
 
 # Refrence: https://docs.etherscan.io/
 class Scanner(DataLoader):
     """This class is a wrapper around the blockexplorer APIs
     """
-
-    def __init__(self, base_url: str, api_key: str=None):
+    # Free tier API keys are limited to 5 calls per second
+    max_workers = 5
+    # Explorers w/o action=balancemulti set this to False, see get_account_native_balance
+    balance_multi = True
+    # Decode numeric strings to typed columns, see set_typed_output
+    typed_output = False
+    exact_wei = True
+    # How long responses are cached when a cache is set, blocks by number never change
+    cache_ttls = [(r'action=(eth_blockNumber|eth_gasPrice|gasoracle|gasestimate|'
+                   r'getblockcountdown)&', 0),
+                  (r'action=eth_(getBlockByNumber|getBlockTransactionCountByNumber|'
+                   r'getUncleByBlockNumberAndIndex|getTransactionByBlockNumberAndIndex)&'
+                   r'.*tag=0x', None),
+                  (r'action=(getabi|getsourcecode|getblockreward|getblocknobytime)&', 86400),
+                  (r'module=account(&|$)', 60)]
+
+    def __init__(self, base_url: str, api_key: str=None, api_tier: str='free'):
+        if api_tier not in API_TIER_LIMITS:
+            raise ValueError(f'api_tier should be one of {list(API_TIER_LIMITS.keys())}')
         self.base_url = base_url
         api_dict = {'apikey': api_key}
         DataLoader.__init__(self, api_dict=api_dict, taxonomy_dict={})
 
+        # JSON-RPC node the proxy methods are batched to, see set_rpc_url
+        self.rpc_url = None
+        self.rpc_rate_limit = None
+        self.rpc_batch_size = RPC_BATCH_SIZE
+        self.rpc_batch_max = RPC_BATCH_MAX
+
+        if api_key:
+            self.set_rate_limit(API_TIER_LIMITS[api_tier])
+            self.set_max_workers(API_TIER_LIMITS[api_tier])
+        else:
+            self.set_rate_limit(1, period=5)
+
+    def set_typed_output(self, typed: bool=True, exact: bool=True) -> None:
+        """Decodes the numeric strings of results (wei values, gas, hex & decimal
+        block numbers, timestamps) a whole column at a time, see helpers.decode_columns.
+        Block & transaction proxy methods then return one typed row per block or
+        transaction instead of one column
+
+        Parameters
+        ----------
+            typed: bool
+                True returns int64/uint64 & datetime64 columns, False raw strings
+            exact: bool
+                wei-scale values overflowing uint64 as Decimal, False decodes them to
+                longdouble which is faster but platform dependent: 80 bit (~19 digits)
+                on x86 Linux & macOS, only float64 (~16 digits) on Windows & ARM macOS
+        """
+        self.typed_output = typed
+        self.exact_wei = exact
+
+    def _results_to_df(self, results: List, keys: List[str], action: str,
+                       key_name: str='account') -> pd.DataFrame:
+        """Frame of the list results of many entities, shaped by output_format"""
+        if self.output_format == 'long':
+            return self._typed_df(records_to_long_df(results, keys, action, key_name=key_name))
+        df_list = [None if result is None else self._result_to_df(result, action)
+                   for result in results]
+        return self.concat_entities(df_list, keys, key_name=key_name)
+
+    def _result_to_df(self, result: List[Dict], action: str) -> pd.DataFrame:
+        """helpers.result_to_df, typed if set_typed_output is on"""
+        return self._typed_df(result_to_df(result, action))
+
+    def _typed_df(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Decode the numeric columns of df if set_typed_output is on"""
+        if not self.typed_output:
+            return df
+        return decode_columns(df, exact=self.exact_wei)
+
+    def set_rpc_url(self, rpc_url: Union[str, None], batch_size: int=None,
+                    max_batch_size: int=RPC_BATCH_MAX, rate_limit: float=None) -> None:
+        """Sends the Geth/Parity proxy methods (get_eth_block, get_eth_transaction_by_hash,
+        get_eth_transaction_receipt, get_eth_block_transaction_count &
+        get_eth_account_transaction_count) to a JSON-RPC node in batches instead
+        of one explorer request per item
+
+        Parameters
+        ----------
+            rpc_url: str
+                JSON-RPC endpoint of a node or provider, None goes back to the explorer
+            batch_size: int
+                fixed calls per batch, default sizes batches automatically
+            max_batch_size: int
+                largest batch automatic sizing grows to
+            rate_limit: float
+                batches per second sent to the node, default doesn't limit them. The
+                explorer's rate limit never applies to the node
+        """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError('batch_size should be at least 1')
+        self.rpc_url = rpc_url
+        self.rpc_rate_limit = rate_limit
+        self.rpc_batch_size = batch_size or RPC_BATCH_SIZE
+        self.rpc_batch_max = batch_size or max_batch_size
+        self._limit_rpc_host()
+
+    def set_rate_limit(self, calls: float, period: float = 1.0, host_limits: Dict = None) -> None:
+        """DataLoader.set_rate_limit, the node set w/ set_rpc_url keeps its own limit"""
+        DataLoader.set_rate_limit(self, calls, period=period, host_limits=host_limits)
+        self._limit_rpc_host()
+
+    def _limit_rpc_host(self) -> None:
+        """Give the node's host its own bucket in the rate limiter"""
+        if self.rpc_url is None or self.rate_limiter is None:
+            return
+        self.rate_limiter.set_host_limit(urlparse(self.rpc_url).netloc, self.rpc_rate_limit)
+
+    def is_rate_limited(self, content: bytes) -> bool:
+        """Rate limits are returned as 200 responses w/ status '0', retry them like a 429
+
+        :param content: bytes
+            Raw response body
+        :return: bool
+        """
+        # skip decoding anything that can't be a rate limit message
+        if b'rate limit' not in content.lower():
+            return False
+        try:
+            response = self.json_loads(content)
+        except ValueError:
+            return False
+        return (isinstance(response, dict) and response.get('status') == '0'
+                and is_rate_limit_message(response.get('result')))
+
+    def validate_response(self, response: Dict) -> Dict:
+        """Classify status '0' responses, the API returns them w/ HTTP 200
+
+        :param response: Dict
+            Decoded JSON response
+        :return: response, empty results are normalized to an empty list
+        :raises ScannerRateLimitError if still rate limited after every retry
+        :raises ScannerError if the API returned an error
+        """
+        if not isinstance(response, dict):
+            return response
+
+        # Geth/Parity proxy endpoints return JSON-RPC errors
+        if isinstance(response.get('error'), dict):
+            error = response['error']
+            raise ScannerError(f"{error.get('code')}: {error.get('message')}")
+
+        if response.get('status') != '0':
+            return response
+
+        message = str(response.get('message', ''))
+        result = response.get('result')
+        if is_rate_limit_message(result) or is_rate_limit_message(message):
+            raise ScannerRateLimitError(f'{message}: {result}')
+        if not result or message.startswith('No '):
+            # i.e. 'No transactions found', return the empty result so frames keep their columns
+            response['result'] = []
+            return response
+        raise ScannerError(f'{message}: {result}')
+
     ##### Accounts
     def get_account_native_balance(self, accounts_in: Union[str, List]) -> pd.DataFrame:
-        """Returns the native token balance of a given address
+        """Returns the native token balance of a given address, lists of accounts
+        are fetched 20 at a time w/ action=balancemulti where the explorer supports it
 
         Parameters
         ----------
@@ -32,72 +229,314 @@ class Scanner(DataLoader):
                 DataFrame containing accounts_in native (sol) balance
         """
         accounts = validate_input(accounts_in)
-        balance_dict={}
-        for account in accounts:
+
+        def get_balance(account):
             params = {'module': 'account',
                       'action': 'balance',
                       'address': account,
                       'tag': 'latest'}
             params.update(self.api_dict)
-            balance = self.get_response(self.base_url, params=params)['result']
-            balance_dict[account] = balance
-        balances_df = pd.Series(balance_dict).to_frame(name='balances')
+            return self.get_response(self.base_url, params=params)['result']
+
+        def get_chunk_balances(chunk):
+            params = {'module': 'account',
+                      'action': 'balancemulti',
+                      'address': ','.join(chunk),
+                      'tag': 'latest'}
+            params.update(self.api_dict)
+            try:
+                result = self.get_response(self.base_url, params=params)['result']
+            except ScannerRateLimitError:
+                raise
+            except ScannerError as error:
+                # i.e. 'Error! Missing Or invalid Action name', or an invalid address in the chunk
+                if 'action' in str(error).lower():
+                    self.balance_multi = False
+                return None
+            balances = {balance['account'].lower(): balance['balance'] for balance in result}
+            return [balances.get(account.lower()) for account in chunk]
+
+        balance_dict = {}
+        with self.errors_scope():
+            if self.balance_multi and len(accounts) > 1:
+                # up to 20 addresses per request, accounts a chunk missed are fetched one at a time
+                chunks = [accounts[i:i + BALANCE_MULTI_MAX]
+                          for i in range(0, len(accounts), BALANCE_MULTI_MAX)]
+                for chunk, balances in zip(chunks, self.fan_out(get_chunk_balances, chunks)):
+                    if balances is not None:
+                        balance_dict.update((account, balance) for account, balance
+                                            in zip(chunk, balances) if balance is not None)
+            remaining = [account for account in accounts if account not in balance_dict]
+            balance_dict.update(zip(remaining, self.fan_out(get_balance, remaining)))
+        balance_dict = {account: balance_dict[account] for account in accounts}
+        balances_df = self._typed_df(pd.Series(balance_dict).to_frame(name='balances'))
         return balances_df
 
-    def get_account_normal_transactions(self, accounts_in: Union[str, List]) -> pd.DataFrame:
-        """Returns the list of transactions performed by an address, with optional pagination
+    def get_account_normal_transactions(self, accounts_in: Union[str, List],
+                                        start_block: int=None, end_block: int=None,
+                                        shards: int=1) -> pd.DataFrame:
+        """Returns the complete list of transactions performed by an address,
+        see crawl_account_records for how histories past the 10000 result cap are fetched
 
         Parameters
         ----------
             accounts_in: str, List
                 single account in or list of accounts in
+            start_block: int
+                block to start search
+            end_block: int
+                block to end search
+            shards: int
+                block ranges each history is split into up front, fetched in parallel
 
         Returns
         -------
             DataFrame
                 DataFrame containing accounts_in normal transactions
         """
-        # TODO paging
         accounts = validate_input(accounts_in)
-        df_list=[]
-        for account in accounts:
-            params = {'module': 'account',
-                      'action': 'txlist',
-                      'address': account}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        account_transactions_df = pd.concat(df_list, keys=accounts, axis=1)
+
+        def get_transactions(account):
+            return self.crawl_account_records('txlist', {'address': account},
+                                              start_block=start_block,
+                                              end_block=end_block, shards=shards)
+
+        responses = self.fan_out(get_transactions, accounts)
+        account_transactions_df = self._results_to_df(responses, accounts, 'txlist')
         return account_transactions_df
 
-    def get_account_internal_transactions(self, accounts_in: Union[str, List]) -> pd.DataFrame:
-        """Returns the list of internal transactions performed by an address
+    def get_account_internal_transactions(self, accounts_in: Union[str, List],
+                                          start_block: int=None, end_block: int=None,
+                                          shards: int=1) -> pd.DataFrame:
+        """Returns the complete list of internal transactions performed by an address,
+        see crawl_account_records for how histories past the 10000 result cap are fetched
 
         Parameters
         ----------
             accounts_in: str, List
                 single account in or list of accounts in
+            start_block: int
+                block to start search
+            end_block: int
+                block to end search
+            shards: int
+                block ranges each history is split into up front, fetched in parallel
 
         Returns
         -------
             DataFrame
                 DataFrame with internal transactions performed in given account(s)
         """
-        # TODO paging
         accounts = validate_input(accounts_in)
-        df_list=[]
-        for account in accounts:
-            params = {'module': 'account',
-                      'action': 'txlistinternal',
-                      'address': account}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        account_transactions_df = pd.concat(df_list, keys=accounts, axis=1)
+
+        def get_transactions(account):
+            return self.crawl_account_records('txlistinternal', {'address': account},
+                                              start_block=start_block,
+                                              end_block=end_block, shards=shards)
+
+        responses = self.fan_out(get_transactions, accounts)
+        account_transactions_df = self._results_to_df(responses, accounts, 'txlistinternal')
         return account_transactions_df
 
+    def iter_account_normal_transactions(self, account: str, start_block: int=None,
+                                         end_block: int=None, ascending: bool=True,
+                                         page_size: int=1000, prefetch: int=0) -> Paginator:
+        """Lazily pages through the transactions performed by an address
+
+        Parameters
+        ----------
+            account: str
+                single account
+            start_block: int
+                block to start search
+            end_block: int
+                block to end search
+            ascending: bool
+                return results ascending or descending (default True)
+            page_size: int
+                transactions per request, at most 10000
+            prefetch: int
+                pages requested concurrently ahead of the one being read
+
+        Returns
+        -------
+            Paginator
+                yields transaction dicts, iter_pages() yields lists of them.
+                Only the first 10000 transactions of the block range are returned
+        """
+        return self._paginate_account('txlist', {'address': account}, start_block, end_block,
+                                      ascending, page_size, prefetch)
+
+    def iter_account_internal_transactions(self, account: str, start_block: int=None,
+                                           end_block: int=None, ascending: bool=True,
+                                           page_size: int=1000, prefetch: int=0) -> Paginator:
+        """Lazily pages through the internal transactions performed by an address
+
+        Parameters
+        ----------
+            account: str
+                single account
+            start_block: int
+                block to start search
+            end_block: int
+                block to end search
+            ascending: bool
+                return results ascending or descending (default True)
+            page_size: int
+                transactions per request, at most 10000
+            prefetch: int
+                pages requested concurrently ahead of the one being read
+
+        Returns
+        -------
+            Paginator
+                yields internal transaction dicts, iter_pages() yields lists of them.
+                Only the first 10000 transactions of the block range are returned
+        """
+        return self._paginate_account('txlistinternal', {'address': account}, start_block,
+                                      end_block, ascending, page_size, prefetch)
+
+    def iter_account_token_transfers(self, account: str, token: str=None,
+                                     start_block: int=None, end_block: int=None,
+                                     ascending: bool=True, page_size: int=1000,
+                                     prefetch: int=0) -> Paginator:
+        """Lazily pages through the ERC-20 tokens transferred by an address,
+        with optional filtering by token contract
+
+        Parameters
+        ----------
+            account: str
+                single account
+            token: str
+                single token address, used to filter results
+            start_block: int
+                block to start search
+            end_block: int
+                block to end search
+            ascending: bool
+                return results ascending or descending (default True)
+            page_size: int
+                transfers per request, at most 10000
+            prefetch: int
+                pages requested concurrently ahead of the one being read
+
+        Returns
+        -------
+            Paginator
+                yields token transfer dicts, iter_pages() yields lists of them.
+                Only the first 10000 transfers of the block range are returned
+        """
+        params = {'address': account, 'contractaddress': token}
+        return self._paginate_account('tokentx', params, start_block, end_block,
+                                      ascending, page_size, prefetch)
+
+    def _paginate_account(self, action: str, params: Dict, start_block: Union[int, None],
+                          end_block: Union[int, None], ascending: bool, page_size: int,
+                          prefetch: int) -> Paginator:
+        """Paginator over an account module action, pages count from 1"""
+        if not 0 < page_size <= RESULT_WINDOW:
+            raise ValueError(f'page_size should be between 1 and {RESULT_WINDOW}')
+        params = dict(params, module='account', action=action,
+                      startblock=start_block, endblock=end_block,
+                      sort='asc' if ascending else 'desc', offset=page_size)
+        params.update(self.api_dict)
+
+        def get_page(page):
+            return self.get_response(self.base_url, params=dict(params, page=page))['result']
+
+        return self.paginate(get_page, page_size=page_size, start=1, prefetch=prefetch,
+                             max_pages=RESULT_WINDOW // page_size)
+
+    def crawl_account_records(self, action: str, params: Dict, start_block: int=None,
+                              end_block: int=None, ascending: bool=True,
+                              shards: int=1) -> List[Dict]:
+        """Returns every record of an account list action (txlist, txlistinternal, tokentx,
+        tokennfttx) between two blocks. Explorers cap each response at 10000 records,
+        so block ranges that hit the cap are split & fetched again in parallel.
+
+        The records of a saturated range are complete up to the block of its last
+        record, only the rest of the range is bisected. Records are merged in block
+        order & deduped on (hash, logIndex/traceId).
+
+        Parameters
+        ----------
+            action: str
+                account module action
+            params: dict
+                extra query parameters, i.e. {'address': account}
+            start_block: int
+                block to start search, default is 0
+            end_block: int
+                block to end search, default is the latest block
+            ascending: bool
+                return results ascending or descending (default True)
+            shards: int
+                ranges [start_block, end_block] is split into up front, use more for
+                histories known to be long
+
+        Returns
+        -------
+            List
+                list of record dicts
+        """
+        sort = 'asc' if ascending else 'desc'
+        start_block = start_block or 0
+        if end_block is None and shards > 1:
+            end_block = self.get_eth_block_number()
+
+        def get_range(block_range):
+            first, last = block_range
+            range_params = dict(params, module='account', action=action,
+                                startblock=first, endblock=last, sort=sort)
+            range_params.update(self.api_dict)
+            return self.get_response(self.base_url, params=range_params)['result']
+
+        ranges = split_block_range(start_block, end_block, shards) if end_block is not None \
+            else [(start_block, None)]
+        complete = {}
+        while ranges:
+            # a failed range would leave a gap, always fail fast
+            results = self.fan_out(get_range, ranges, fail_fast=True)
+            next_ranges = []
+            for (first, last), records in zip(ranges, results):
+                if len(records) < RESULT_WINDOW:
+                    complete[first] = records
+                    continue
+                if last is None:
+                    last = self.get_eth_block_number()
+                if first >= last:
+                    logging.warning('%s %s block %s has over %s records, results are truncated',
+                                    type(self).__name__, action, first, RESULT_WINDOW)
+                    complete[first] = records
+                    continue
+
+                # keep the blocks the response fully covers, the boundary block may be cut off
+                boundary = int(records[-1].get('blockNumber', first if ascending else last))
+                if ascending and first < boundary:
+                    complete[first] = [record for record in records
+                                       if int(record['blockNumber']) < boundary]
+                    first = boundary
+                elif not ascending and boundary < last:
+                    complete[boundary + 1] = [record for record in records
+                                              if int(record['blockNumber']) > boundary]
+                    last = boundary
+                if first == last:
+                    next_ranges.append((first, last))
+                else:
+                    middle = (first + last) // 2
+                    next_ranges += [(first, middle), (middle + 1, last)]
+            ranges = next_ranges
+
+        seen = set()
+        crawled = []
+        for first in sorted(complete, reverse=not ascending):
+            for record in complete[first]:
+                key = record_key(record, action)
+                if key not in seen:
+                    seen.add(key)
+                    crawled.append(record)
+        return crawled
+
     def get_transaction_internal_transactions(self,
                                               transactions_in: Union[str, List]) -> pd.DataFrame:
         """Returns the list of internal transactions performed within a transaction
@@ -112,21 +551,24 @@ class Scanner(DataLoader):
                 DataFrame with internal transactions performed in given transaction(s)
         """
         transactions = validate_input(transactions_in)
-        df_list=[]
-        for transaction in transactions:
+
+        def get_transactions(transaction):
             params = {'module': 'account',
                       'action': 'txlistinternal',
                       'txhash': transaction}
             params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        transactions_df = pd.concat(df_list, keys=transactions, axis=1)
+            return self.get_response(self.base_url, params=params)['result']
+
+        responses = self.fan_out(get_transactions, transactions)
+        transactions_df = self._results_to_df(responses, transactions, 'txlistinternal',
+                                              key_name='transaction')
         return transactions_df
 
     def get_block_range_internal_transactions(self, start_block: int, end_block: int, page: int=0,
-                                              offset: int=0, ascending:bool=True) -> pd.DataFrame:
-        """Returns the list of internal transactions performed within a block range
+                                              offset: int=0, ascending:bool=True,
+                                              shards: int=1) -> pd.DataFrame:
+        """Returns the list of internal transactions performed within a block range.
+        W/o page & offset the complete list is crawled, see crawl_account_records
         Parameters
         ----------
             start_block: int
@@ -139,13 +581,20 @@ class Scanner(DataLoader):
                 Offset starting at 0. Increment value to offset paginated results
             ascending: bool
                 return results ascending or descending (default True)
+            shards: int
+                block ranges the crawl is split into up front, fetched in parallel
 
         Returns
         -------
             DataFrame
                 DataFrame with internal transactions for a given block range
         """
-        # TODO check paging
+        if not page and not offset:
+            response = self.crawl_account_records('txlistinternal', {}, start_block=start_block,
+                                                  end_block=end_block, ascending=ascending,
+                                                  shards=shards)
+            return self._result_to_df(response, 'txlistinternal')
+
         sort = 'asc' if ascending else 'desc'
         params = {'module': 'account',
                   'action': 'txlistinternal',
@@ -156,16 +605,17 @@ class Scanner(DataLoader):
                   'sort': sort}
         params.update(self.api_dict)
         response = self.get_response(self.base_url, params=params)['result']
-        transactions_df = pd.DataFrame(response)
+        transactions_df = self._result_to_df(response, 'txlistinternal')
         return transactions_df
 
     def get_account_token_transfers(self, accounts_in: Union[str, List],
                                     tokens_in: Union[str, List]=None,
                                     start_block: int=None, end_block: int=None,
                                     page:int=0, offset:int=0,
-                                    ascending:bool=True) -> pd.DataFrame:
+                                    ascending:bool=True, shards: int=1) -> pd.DataFrame:
         """Returns the list of ERC-20 tokens transferred by an address,
-        with optional filtering by token contract
+        with optional filtering by token contract. W/o page & offset the complete
+        list is crawled, see crawl_account_records
 
         Parameters
         ----------
@@ -183,6 +633,8 @@ class Scanner(DataLoader):
                 Offset starting at 0. Increment value to offset paginated results
             ascending: bool
                 return results ascending or descending (default True)
+            shards: int
+                block ranges each crawl is split into up front, fetched in parallel
 
         Returns
         -------
@@ -191,8 +643,16 @@ class Scanner(DataLoader):
         """
         sort = 'asc' if ascending else 'desc'
         accounts = validate_input(accounts_in)
-        df_list=[]
-        for account in accounts:
+        # optional token filters, one request per (account, token) pair
+        tokens = validate_input(tokens_in) if tokens_in else [None]
+
+        def get_transfers(account_token):
+            account, token = account_token
+            if not page and not offset:
+                return self.crawl_account_records('tokentx',
+                                                  {'address': account, 'contractaddress': token},
+                                                  start_block=start_block, end_block=end_block,
+                                                  ascending=ascending, shards=shards)
             params = {'module': 'account',
                       'action': 'tokentx',
                       'sort': sort,
@@ -202,31 +662,33 @@ class Scanner(DataLoader):
             if start_block:
                 params.update({'startblock': str(start_block)})
             if end_block:
-                params.update({'endblock': str(start_block)})
+                params.update({'endblock': str(end_block)})
+            if token:
+                params['contractaddress'] = token
             params.update(self.api_dict)
+            return self.get_response(self.base_url, params=params)['result']
 
+        pairs = [(account, token) for account in accounts for token in tokens]
+        responses = self.fan_out(get_transfers, pairs)
 
-            # iterate through optional token filters
+        account_responses = []
+        for index in range(len(accounts)):
             response=[]
-            if tokens_in:
-                tokens = validate_input(tokens_in)
-                for token in tokens:
-                    params['contractaddress'] = token
-                    response += self.get_response(self.base_url, params=params)['result']
-            else:
-                response = self.get_response(self.base_url, params=params)['result']
-
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        token_transfers_df = pd.concat(df_list, keys=accounts, axis=1)
+            for transfers in responses[index * len(tokens):(index + 1) * len(tokens)]:
+                if transfers is not None:
+                    response += transfers
+            account_responses.append(response)
+        token_transfers_df = self._results_to_df(account_responses, accounts, 'tokentx')
         return token_transfers_df
 
     def get_account_nft_transfers(self, accounts_in: Union[str, List],
                                   nfts_in: Union[str, List]=None,
                                   start_block: int=None, end_block: int=None,
-                                  page:int=0, offset:int=0, ascending:bool=True) -> pd.DataFrame:
+                                  page:int=0, offset:int=0, ascending:bool=True,
+                                  shards: int=1) -> pd.DataFrame:
         """Returns the list of ERC-721 ( NFT ) tokens transferred by an address,
-        with optional filtering by token contract
+        with optional filtering by token contract. W/o page & offset the complete
+        list is crawled, see crawl_account_records
 
         Parameters
         ----------
@@ -244,6 +706,8 @@ class Scanner(DataLoader):
                 Offset starting at 0. Increment value to offset paginated results
             ascending: bool
                 return results ascending or descending (default True)
+            shards: int
+                block ranges each crawl is split into up front, fetched in parallel
 
         Returns
         -------
@@ -252,8 +716,16 @@ class Scanner(DataLoader):
         """
         sort = 'asc' if ascending else 'desc'
         accounts = validate_input(accounts_in)
-        df_list=[]
-        for account in accounts:
+        # optional nft filters, one request per (account, nft) pair
+        nfts = validate_input(nfts_in) if nfts_in else [None]
+
+        def get_transfers(account_nft):
+            account, nft = account_nft
+            if not page and not offset:
+                return self.crawl_account_records('tokennfttx',
+                                                  {'address': account, 'contractaddress': nft},
+                                                  start_block=start_block, end_block=end_block,
+                                                  ascending=ascending, shards=shards)
             params = {'module': 'account',
                       'action': 'tokennfttx',
                       'sort': sort,
@@ -263,24 +735,23 @@ class Scanner(DataLoader):
             if start_block:
                 params.update({'startblock': start_block})
             if end_block:
-                params.update({'endblock': start_block})
+                params.update({'endblock': end_block})
+            if nft:
+                params['contractaddress'] = nft
             params.update(self.api_dict)
+            return self.get_response(self.base_url, params=params)['result']
 
+        pairs = [(account, nft) for account in accounts for nft in nfts]
+        responses = self.fan_out(get_transfers, pairs)
 
-            # iterate through optional token filters
+        account_responses = []
+        for index in range(len(accounts)):
             response=[]
-            if nfts_in:
-                nfts = validate_input(nfts_in)
-                for nft in nfts:
-                    params['contractaddress'] = nft
-                    response += self.get_response(self.base_url, params=params)['result']
-            else:
-                response = self.get_response(self.base_url, params=params)['result']
-
-
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        nft_transfers_df = pd.concat(df_list, keys=accounts, axis=1)
+            for transfers in responses[index * len(nfts):(index + 1) * len(nfts)]:
+                if transfers is not None:
+                    response += transfers
+            account_responses.append(response)
+        nft_transfers_df = self._results_to_df(account_responses, accounts, 'tokennfttx')
         return nft_transfers_df
 
     # NOTE: this is the same as blocks validated on PoS chains
@@ -303,8 +774,8 @@ class Scanner(DataLoader):
                 DataFrame with blocks mined by given account(s)
         """
         accounts = validate_input(accounts_in)
-        df_list=[]
-        for account in accounts:
+
+        def get_blocks(account):
             params = {'module': 'account',
                       'action': 'getminedblocks',
                       'blocktype': block_type,
@@ -312,10 +783,10 @@ class Scanner(DataLoader):
                       'offset': offset,
                       'address': account}
             params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        blocks_mined_df = pd.concat(df_list, keys=accounts, axis=1)
+            return self.get_response(self.base_url, params=params)['result']
+
+        responses = self.fan_out(get_blocks, accounts)
+        blocks_mined_df = self._results_to_df(responses, accounts, 'getminedblocks')
         return blocks_mined_df
 
     ##### Contracts
@@ -333,14 +804,16 @@ class Scanner(DataLoader):
                 Dictionary with {contract: contract_abi}
         """
         contracts = validate_input(contracts_in)
-        abi_dict = {}
-        for contract in contracts:
+
+        def get_abi(contract):
             params = {'module': 'contract',
                       'action': 'getabi',
                       'address': contract}
             params.update(self.api_dict)
-            abi = self.get_response(self.base_url, params=params)['result']
-            abi_dict[contract] = abi
+            return self.get_response(self.base_url, params=params)['result']
+
+        abis = self.fan_out(get_abi, contracts)
+        abi_dict = {contract: abi for contract, abi in zip(contracts, abis) if abi is not None}
         return abi_dict
 
     def get_contract_source_code(self, contracts_in: Union[str, List]) -> pd.DataFrame:
@@ -357,16 +830,17 @@ class Scanner(DataLoader):
                 DataFrame with contract source code
         """
         contracts = validate_input(contracts_in)
-        df_list=[]
-        for contract in contracts:
+
+        def get_source_df(contract):
             params = {'module': 'contract',
                       'action': 'getsourcecode',
                       'address': contract}
             params.update(self.api_dict)
             response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        source_df = pd.concat(df_list, keys=contracts, axis=1)
+            return pd.DataFrame(response)
+
+        df_list = self.fan_out(get_source_df, contracts)
+        source_df = self.concat_entities(df_list, contracts, key_name='contract')
         return source_df
 
     ##### Transactions
@@ -384,14 +858,15 @@ class Scanner(DataLoader):
                 DataFrame with contract execution status
         """
         transactions = validate_input(transactions_in)
-        transactions_dict={}
-        for transaction in transactions:
+
+        def get_status(transaction):
             params = {'module': 'transaction',
                       'action': 'getstatus',
                       'txhah': transaction}
             params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            transactions_dict[transaction] = response
+            return self.get_response(self.base_url, params=params)['result']
+
+        transactions_dict = dict(zip(transactions, self.fan_out(get_status, transactions)))
         transactions_df = pd.Series(transactions_dict).to_frame(name='transactions')
         return transactions_df
 
@@ -409,14 +884,15 @@ class Scanner(DataLoader):
                 DataFrame with transaction execution status
         """
         transactions = validate_input(transactions_in)
-        transactions_dict={}
-        for transaction in transactions:
+
+        def get_status(transaction):
             params = {'module': 'transaction',
                       'action': 'gettxreceiptstatus',
                       'txhah': transaction}
             params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            transactions_dict[transaction] = response
+            return self.get_response(self.base_url, params=params)['result']
+
+        transactions_dict = dict(zip(transactions, self.fan_out(get_status, transactions)))
         transactions_df = pd.Series(transactions_dict).to_frame(name='transactions')
         return transactions_df
 
@@ -436,16 +912,17 @@ class Scanner(DataLoader):
                 DataFrame with block reward(s)
         """
         blocks = validate_int(blocks_in)
-        series_list = []
-        for block in blocks:
+
+        def get_reward_series(block):
             params = {'module': 'block',
                       'action': 'getblockreward',
                       'blockno': block}
             params.update(self.api_dict)
             response = self.get_response(self.base_url, params=params)['result']
-            block_reward_series = pd.Series(response)
-            series_list.append(block_reward_series)
-        reward_df = pd.concat(series_list, keys=blocks, axis=1)
+            return pd.Series(response)
+
+        series_list = self.fan_out(get_reward_series, blocks)
+        reward_df = self.concat_entities(series_list, blocks, key_name='block')
         return reward_df
 
     def get_block_countdown(self, blocks_in: Union[int, List]) -> pd.DataFrame:
@@ -462,14 +939,16 @@ class Scanner(DataLoader):
                 DataFrame with time(s) remaining until block confirmation
         """
         blocks = validate_int(blocks_in)
-        countdown_list=[]
-        for block in blocks:
+
+        def get_countdown(block):
             params = {'module': 'block',
                       'action': 'getblockcountdown',
                       'blockno': block}
             params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            countdown_list.append(response)
+            return self.get_response(self.base_url, params=params)['result']
+
+        countdowns = self.fan_out(get_countdown, blocks)
+        countdown_list = [countdown for countdown in countdowns if countdown is not None]
         countdown_df = pd.DataFrame(countdown_list)
         return countdown_df
 
@@ -490,15 +969,16 @@ class Scanner(DataLoader):
         """
         closest = 'before' if before else 'after'
         times = validate_int(times_in)
-        blocks_list=[]
-        for time in times:
+
+        def get_block(time):
             params = {'module': 'block',
                      'action': 'getblocknobytime',
                      'timestamp': time,
                      'closest': closest}
             params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            blocks_list.append(response)
+            return self.get_response(self.base_url, params=params)['result']
+
+        blocks_list = [block for block in self.fan_out(get_block, times) if block is not None]
         blocks_df = pd.DataFrame(blocks_list)
         return blocks_df
 
@@ -513,8 +993,131 @@ class Scanner(DataLoader):
                  topic0_3_opr: str=None, topic1_3_opr: str=None) -> pd.DataFrame:
         """This function is a wrapper around the Etherscan API which is a wrapper
         around the native eth_getLogs. Please check out their documentation for a
-        more in depth explanation: https://docs.etherscan.io/api-endpoints/logs"""
+        more in depth explanation: https://docs.etherscan.io/api-endpoints/logs
+
+        Responses are capped at 1000 logs, see get_logs_range for wide block ranges"""
+        params = self._logs_params(address, from_block, to_block,
+                                   {'topic0': topic0, 'topic1': topic1,
+                                    'topic2': topic2, 'topic3': topic3,
+                                    'topic0_1_opr': topic0_1_opr, 'topic1_2_opr': topic1_2_opr,
+                                    'topic2_3_opr': topic2_3_opr, 'topic0_2_opr': topic0_2_opr,
+                                    'topic0_3_opr': topic0_3_opr, 'topic1_3_opr': topic1_3_opr})
+        logs = self.get_response(self.base_url, params=params)['result']
+        logs_df = self._result_to_df(logs, 'getlogs')
+        return logs_df
+
+    def get_logs_range(self, address: str, from_block: int, to_block: int=None,
+                       window: int=None, **topics) -> pd.DataFrame:
+        """Returns every log between two blocks, see iter_logs_range
+
+        Parameters
+        ----------
+            address: str
+                contract address
+            from_block: int
+                block to start search
+            to_block: int
+                block to end search, default is the latest block
+            window: int
+                blocks in the first requests, default is 1% of the range
+            topics: str
+                topic0 - topic3 & topic operators (i.e. topic0_1_opr='and'), like get_logs
+
+        Returns
+        -------
+            DataFrame
+                DataFrame of logs in block order
+        """
+        logs = list(self.iter_logs_range(address, from_block, to_block=to_block,
+                                         window=window, **topics))
+        return self._result_to_df(logs, 'getlogs')
+
+    def iter_logs_range(self, address: str, from_block: int, to_block: int=None,
+                        window: int=None, **topics) -> Iterator[Dict]:
+        """Lazily yields every log between two blocks in block order.
 
+        Responses are capped at 1000 logs, so the range is fetched in windows sized
+        from the log density seen so far to hold about half that. max_workers
+        windows are fetched concurrently & windows that come back full are split
+        & fetched again before their logs are yielded. Synchronous loaders only,
+        async loaders use get_logs_range.
+
+        Parameters
+        ----------
+            address: str
+                contract address
+            from_block: int
+                block to start search
+            to_block: int
+                block to end search, default is the latest block
+            window: int
+                blocks in the first requests, default is 1% of the range
+            topics: str
+                topic0 - topic3 & topic operators (i.e. topic0_1_opr='and'), like get_logs
+
+        Returns
+        -------
+            Iterator
+                log dicts in block order
+        """
+        if to_block is None:
+            to_block = self.get_eth_block_number()
+        window = window or max(1, (to_block - from_block + 1) // 100)
+        params = self._logs_params(address, from_block, to_block, topics)
+        target = LOGS_CAP // 2
+        # (blocks, logs) of recent unsaturated windows, the density estimate
+        recent: deque = deque(maxlen=10)
+
+        def get_window(block_range):
+            first, last = block_range
+            window_params = dict(params, fromBlock=first, toBlock=last)
+            return self.get_response(self.base_url, params=window_params)['result']
+
+        # windows in block order, a window's logs are None until it's fetched
+        windows: List = []
+        next_block = from_block
+        while windows or next_block <= to_block:
+            unfetched = [block_range for block_range, logs in windows if logs is None]
+            while len(unfetched) < self.max_workers and next_block <= to_block:
+                block_range = (next_block, min(next_block + window - 1, to_block))
+                windows.append((block_range, None))
+                unfetched.append(block_range)
+                next_block = block_range[1] + 1
+
+            fetched = dict(zip(unfetched, self.fan_out(get_window, unfetched, fail_fast=True)))
+            next_windows = []
+            for block_range, logs in windows:
+                logs = fetched.get(block_range, logs)
+                first, last = block_range
+                if block_range in fetched:
+                    # full windows count too, their density is at least this high
+                    recent.append((last - first + 1, len(logs)))
+                    if len(logs) >= LOGS_CAP and first < last:
+                        middle = (first + last) // 2
+                        next_windows += [((first, middle), None), ((middle + 1, last), None)]
+                        window = min(window, max(1, (last - first + 1) // 2))
+                        continue
+                    if len(logs) >= LOGS_CAP:
+                        logging.warning('%s block %s has over %s logs, results are truncated',
+                                        type(self).__name__, first, LOGS_CAP)
+                next_windows.append((block_range, logs))
+            windows = next_windows
+
+            # resize windows to the recent density, growing at most 4x at a time
+            blocks, caught = map(sum, zip(*recent)) if recent else (0, 0)
+            if caught:
+                window = max(1, min(window * 4, int(target * blocks / caught)))
+            elif recent:
+                window *= 4
+
+            # yield every window up to the first one still missing logs
+            while windows and windows[0][1] is not None:
+                _, logs = windows.pop(0)
+                yield from logs
+
+    def _logs_params(self, address: str, from_block: Union[int, str],
+                     to_block: Union[int, str], topics: Dict) -> Dict:
+        """Query parameters for getlogs, topics holds topic0 - topic3 & the topic operators"""
         params = {'module': 'logs',
                   'action': 'getlogs',
                   'toBlock': to_block,
@@ -522,36 +1125,111 @@ class Scanner(DataLoader):
                   'address': address}
         params.update(self.api_dict)
 
-        # topics
-        if topic0:
-            params['topic0'] = topic0
-        if topic1:
-            params['topic1'] = topic1
-        if topic2:
-            params['topic2'] = topic2
-        if topic3:
-            params['topic3'] = topic3
-
-        # operators
         valid = ['and', 'or']
-        if topic0_1_opr in valid:
-            params['topic0_1_opr'] = topic0_1_opr
-        if topic1_2_opr in valid:
-            params['topic1_2_opr'] = topic1_2_opr
-        if topic2_3_opr in valid:
-            params['topic2_3_opr'] = topic2_3_opr
-        if topic0_2_opr in valid:
-            params['topic0_2_opr'] = topic0_2_opr
-        if topic0_3_opr in valid:
-            params['topic0_3_opr'] = topic0_3_opr
-        if topic1_3_opr in valid:
-            params['topic1_3_opr'] = topic1_3_opr
-
-        logs = self.get_response(self.base_url, params=params)['result']
-        logs_df = pd.DataFrame(logs)
-        return logs_df
+        for key, value in topics.items():
+            if key not in LOG_TOPIC_PARAMS:
+                raise ValueError(f'{key} is not a getlogs topic, options are {LOG_TOPIC_PARAMS}')
+            # operators are only sent w/ a valid value
+            if key.endswith('_opr'):
+                if value in valid:
+                    params[key] = value
+            elif value:
+                params[key] = value
+        return params
 
     ##### Geth/Parity Proxy
+    def rpc_batch(self, method: str, params_list: List) -> List:
+        """Calls a JSON-RPC method once per params in batches sent to the node set
+        w/ set_rpc_url, max_workers batches at a time.
+
+        Batches double after a round where every batch was accepted, up to
+        rpc_batch_max, & batches the node rejects (i.e. too large) are halved
+        until they fit. The size reached is kept for the next call.
+
+        Parameters
+        ----------
+            method: str
+                JSON-RPC method (i.e. eth_getTransactionReceipt)
+            params_list: List
+                list of params, one per call
+
+        Returns
+        -------
+            List
+                call results ordered like params_list, None for calls that errored
+                unless failing fast
+        """
+        if self.rpc_url is None:
+            raise ValueError(f'{type(self).__name__} has no RPC url, see set_rpc_url')
+        headers = {'Content-Type': 'application/json'}
+
+        def call_batch(calls: List) -> Tuple[List, int]:
+            """Results of calls & the largest batch the node accepted"""
+            body = json.dumps([{'jsonrpc': '2.0', 'id': call_id, 'method': method, 'params': params}
+                               for call_id, params in enumerate(calls)]).encode()
+            try:
+                response = self.json_loads(self.post_content(self.rpc_url, body, headers=headers))
+            except (SystemError, ValueError) as error:
+                response = error
+            if isinstance(response, list) and len(response) == len(calls):
+                by_id = {entry.get('id'): entry for entry in response}
+                results = []
+                for call_id in range(len(calls)):
+                    entry = by_id.get(call_id, {})
+                    if isinstance(entry.get('error'), dict):
+                        error = entry['error']
+                        results.append(ScannerError(f"{error.get('code')}: {error.get('message')}"))
+                    else:
+                        results.append(entry.get('result'))
+                return results, len(calls)
+
+            # the whole batch was rejected, a single call's error is its own
+            if len(calls) == 1:
+                if isinstance(response, Exception):
+                    raise response
+                if isinstance(response, dict) and isinstance(response.get('error'), dict):
+                    error = response['error']
+                    raise ScannerError(f"{error.get('code')}: {error.get('message')}")
+                raise ScannerError(f'Unexpected JSON-RPC response from {self.rpc_url}')
+            middle = len(calls) // 2
+            first, first_size = call_batch(calls[:middle])
+            last, last_size = call_batch(calls[middle:])
+            return first + last, min(first_size, last_size)
+
+        # sized locally so async replays batch the same way on every pass
+        size = self.rpc_batch_size
+        # errors of every round, & of single calls, are kept together
+        with self.errors_scope():
+            results: List = []
+            position = 0
+            while position < len(params_list):
+                batches = []
+                while len(batches) < self.max_workers and position < len(params_list):
+                    batches.append(params_list[position:position + size])
+                    position += size
+
+                accepted = size
+                for calls, batch in zip(batches, self.fan_out(call_batch, batches)):
+                    if batch is None:
+                        results += [None] * len(calls)
+                        continue
+                    batch_results, batch_size = batch
+                    results += batch_results
+                    if batch_size < len(calls):
+                        accepted = min(accepted, batch_size)
+                size = accepted if accepted < size else min(size * 2, self.rpc_batch_max)
+            self.rpc_batch_size = size
+
+            for index, result in enumerate(results):
+                if isinstance(result, ScannerError):
+                    if self.fail_fast:
+                        raise result
+                    logging.warning('%s failed for %s: %s', type(self).__name__,
+                                    params_list[index], result)
+                    self.errors.append((params_list[index], result))
+                    results[index] = None
+        return results
+
     def get_eth_block_number(self) -> int:
         """Returns the number of most recent block
 
@@ -568,7 +1246,8 @@ class Scanner(DataLoader):
         return block_num
 
     def get_eth_block(self, blocks_in: Union[int, List]) -> pd.DataFrame:
-        """Returns information about a block by block number
+        """Returns information about a block by block number,
+        batched to the JSON-RPC node when one is set, see set_rpc_url
 
         Parameters
         ----------
@@ -583,17 +1262,26 @@ class Scanner(DataLoader):
         blocks = validate_int(blocks_in)
         blocks_hex = int_to_hex(blocks)
 
-        series_list = []
-        for block in blocks_hex:
+        def get_block_series(block):
             params = {'module': 'proxy',
                       'action': 'eth_getBlockByNumber',
                       'tag': block,
                       'boolean': 'true'}
             params.update(self.api_dict)
             response = self.get_response(self.base_url, params=params)['result']
-            block_series = pd.Series(response)
-            series_list.append(block_series)
-        series_df = pd.concat(series_list, keys=blocks, axis=1)
+            return pd.Series(response)
+
+        if self.rpc_url is not None:
+            responses = self.rpc_batch('eth_getBlockByNumber',
+                                       [[block, True] for block in blocks_hex])
+            series_list = [pd.Series(response) for response in responses]
+        else:
+            series_list = self.fan_out(get_block_series, blocks_hex)
+        series_df = self.concat_entities(series_list, blocks, key_name='block')
+        if self.output_format == 'long':
+            return self._typed_df(series_df)
+        if self.typed_output:
+            return self._typed_df(series_df.T)
         return series_df
 
     def get_eth_uncle(self, block: int, index: int) -> Dict:
@@ -625,7 +1313,8 @@ class Scanner(DataLoader):
         return response
 
     def get_eth_block_transaction_count(self, blocks_in: Union[int, List]) -> pd.DataFrame:
-        """Returns the number of transactions in a block
+        """Returns the number of transactions in a block,
+        batched to the JSON-RPC node when one is set, see set_rpc_url
 
         Parameters
         ----------
@@ -639,20 +1328,28 @@ class Scanner(DataLoader):
         """
         blocks = validate_int(blocks_in)
         blocks_hex = int_to_hex(blocks)
-        count_dict={}
-        for block in blocks_hex:
+
+        def get_count(block):
             params = {'module': 'proxy',
                       'action': 'eth_getBlockTransactionCountByNumber',
                       'tag': block}
             params.update(self.api_dict)
-            count = self.get_response(self.base_url, params=params)['result']
-            count_int = int(count, 16)
-            count_dict[block] = count_int
-        count_df = pd.Series(count_dict).to_frame(name='transaction_count')
+            return self.get_response(self.base_url, params=params)['result']
+
+        if self.rpc_url is not None:
+            counts = self.rpc_batch('eth_getBlockTransactionCountByNumber',
+                                    [[block] for block in blocks_hex])
+        else:
+            counts = self.fan_out(get_count, blocks_hex)
+        # hex counts are decoded as one column
+        count_dict = dict(zip(blocks_hex, counts))
+        count_df = decode_int_column(pd.Series(count_dict, dtype=object))
+        count_df = count_df.to_frame(name='transaction_count')
         return count_df
 
     def get_eth_transaction_by_hash(self, transactions_in: Union[str, List]) -> pd.DataFrame:
-        """Returns the information about a transaction requested by transaction hash
+        """Returns the information about a transaction requested by transaction hash,
+        batched to the JSON-RPC node when one is set, see set_rpc_url
 
         Parameters
         ----------
@@ -665,16 +1362,26 @@ class Scanner(DataLoader):
                 DataFrame containing transaction details
         """
         transactions = validate_input(transactions_in)
-        series_list=[]
-        for transaction in transactions:
+
+        def get_transaction_series(transaction):
             params = {'module': 'proxy',
                       'action': 'eth_getTransactionByHash',
                       'txhash': transaction}
             params.update(self.api_dict)
             response = self.get_response(self.base_url, params=params)['result']
-            tmp_series = pd.Series(response)
-            series_list.append(tmp_series)
-        transactions_df = pd.concat(series_list, keys=transactions, axis=1)
+            return pd.Series(response)
+
+        if self.rpc_url is not None:
+            responses = self.rpc_batch('eth_getTransactionByHash',
+                                       [[transaction] for transaction in transactions])
+            series_list = [pd.Series(response) for response in responses]
+        else:
+            series_list = self.fan_out(get_transaction_series, transactions)
+        transactions_df = self.concat_entities(series_list, transactions, key_name='transaction')
+        if self.output_format == 'long':
+            return self._typed_df(transactions_df)
+        if self.typed_output:
+            return self._typed_df(transactions_df.T)
         return transactions_df
 
     def get_eth_transaction_by_block_index(self, block: int, index: int) -> pd.DataFrame:
@@ -704,7 +1411,8 @@ class Scanner(DataLoader):
         return txn_df
 
     def get_eth_account_transaction_count(self, accounts_in: Union[str, List]) -> pd.DataFrame:
-        """Returns the number of transactions performed by an address
+        """Returns the number of transactions performed by an address,
+        batched to the JSON-RPC node when one is set, see set_rpc_url
 
         Parameters
         ----------
@@ -717,21 +1425,29 @@ class Scanner(DataLoader):
                 DataFrame containing transaction count(s) for the given account(s)
         """
         accounts = validate_input(accounts_in)
-        count_dict={}
-        for account in accounts:
+
+        def get_count(account):
             params = {'module': 'proxy',
                       'action': 'eth_getTransactionCount',
                       'address': account,
                       'tag': 'latest'}
             params.update(self.api_dict)
-            count = self.get_response(self.base_url, params=params)['result']
-            count_int = int(count, 16)
-            count_dict[account] = count_int
-        count_df = pd.Series(count_dict).to_frame(name='transaction_count')
+            return self.get_response(self.base_url, params=params)['result']
+
+        if self.rpc_url is not None:
+            counts = self.rpc_batch('eth_getTransactionCount',
+                                    [[account, 'latest'] for account in accounts])
+        else:
+            counts = self.fan_out(get_count, accounts)
+        # hex counts are decoded as one column
+        count_dict = dict(zip(accounts, counts))
+        count_df = decode_int_column(pd.Series(count_dict, dtype=object))
+        count_df = count_df.to_frame(name='transaction_count')
         return count_df
 
     def get_eth_transaction_receipt(self, transactions_in: Union[str, List]) -> pd.DataFrame:
-        """Returns the receipt of a transaction by transaction hash
+        """Returns the receipt of a transaction by transaction hash,
+        batched to the JSON-RPC node when one is set, see set_rpc_url
 
         Parameters
         ----------
@@ -744,16 +1460,22 @@ class Scanner(DataLoader):
                 DataFrame with transaction receipts
         """
         transactions = validate_input(transactions_in)
-        df_list=[]
-        for transaction in transactions:
+
+        def get_receipt_df(transaction):
             params = {'module': 'proxy',
                       'action': 'eth_getTransactionReceipt',
                       'txhash': transaction}
             params.update(self.api_dict)
             response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        transactions_df = pd.concat(df_list, keys=transactions, axis=1)
+            return pd.DataFrame(response)
+
+        if self.rpc_url is not None:
+            responses = self.rpc_batch('eth_getTransactionReceipt',
+                                       [[transaction] for transaction in transactions])
+            df_list = [pd.DataFrame(response) for response in responses]
+        else:
+            df_list = self.fan_out(get_receipt_df, transactions)
+        transactions_df = self.concat_entities(df_list, transactions, key_name='transaction')
         return transactions_df
 
     def get_eth_gas_price(self) -> int:
@@ -786,15 +1508,16 @@ class Scanner(DataLoader):
                 DataFrame containing total supply for token(s)
         """
         tokens = validate_input(tokens_in)
-        supply_dict = {}
-        for token in tokens:
+
+        def get_supply(token):
             params = {'module': 'stats',
                       'action': 'tokensupply',
                       'contractaddress': token}
             params.update(self.api_dict)
-            supply = self.get_response(self.base_url, params=params)['result']
-            supply_dict[token] = supply
-        supply_df = pd.Series(supply_dict).to_frame(name='supply')
+            return self.get_response(self.base_url, params=params)['result']
+
+        supply_dict = dict(zip(tokens, self.fan_out(get_supply, tokens)))
+        supply_df = self._typed_df(pd.Series(supply_dict).to_frame(name='supply'))
         return supply_df
 
     def get_token_account_balance(self, tokens_in: Union[str, List],
@@ -815,21 +1538,26 @@ class Scanner(DataLoader):
         """
         tokens = validate_input(tokens_in)
         accounts = validate_input(accounts_in)
+
+        def get_balance(account_token):
+            account, token = account_token
+            params = {'module': 'account',
+                      'action': 'tokenbalance',
+                      'contractaddress': token,
+                      'address': account,
+                      'tag': 'latest'}
+            params.update(self.api_dict)
+            return self.get_response(self.base_url, params=params)['result']
+
+        pairs = [(account, token) for account in accounts for token in tokens]
+        balances = self.fan_out(get_balance, pairs)
+
         series_list = []
-        for account in accounts:
-            token_dict = {}
-            for token in tokens:
-                params = {'module': 'account',
-                          'action': 'tokenbalance',
-                          'contractaddress': token,
-                          'address': account,
-                          'tag': 'latest'}
-                params.update(self.api_dict)
-                balance = self.get_response(self.base_url, params=params)['result']
-                token_dict[token] = balance
-            token_series = pd.Series(token_dict)
+        for index in range(len(accounts)):
+            account_balances = balances[index * len(tokens):(index + 1) * len(tokens)]
+            token_series = pd.Series(dict(zip(tokens, account_balances)))
             series_list.append(token_series)
-        balances_df = pd.concat(series_list, keys=accounts, axis=1)
+        balances_df = self.concat_entities(series_list, accounts, key_name='account')
         return balances_df
 
     ##### Gas Tracker
@@ -869,3 +1597,9 @@ class Scanner(DataLoader):
         response = self.get_response(self.base_url, params=params)['result']
         oracle_df = pd.Series(response).to_frame(name='gas_oracle')
         return oracle_df
+
+
+class AsyncScanner(AsyncDataLoader, Scanner):
+    """This class is an asyncio wrapper around the Etherscan style block explorer APIs,
+    every public Scanner method is a coroutine
+    """
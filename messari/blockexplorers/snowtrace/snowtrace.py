@@ -2,14 +2,15 @@
 
 from typing import Union, List
 from messari.blockexplorers import Scanner
+from messari.asyncdataloader import AsyncDataLoader
 
 BASE_URL='https://api.snowtrace.io/api'
 class SnowTrace(Scanner):
     """This class is a wrapper around the SnowTrace API
     """
 
-    def __init__(self, api_key: str=None):
-        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
+    def __init__(self, api_key: str=None, api_tier: str='free'):
+        Scanner.__init__(self, base_url=BASE_URL, api_key=api_key, api_tier=api_tier)
 
     ##### Accounts
     # NOTE: no changes
@@ -62,3 +63,9 @@ class SnowTrace(Scanner):
     #    params.update(self.api_dict)
     #    response = self.get_response(self.base_url, params=params)['result']
     #    return int(response)
+
+
+class AsyncSnowTrace(AsyncDataLoader, SnowTrace):
+    """This class is an asyncio wrapper around the SnowTrace API,
+    every public SnowTrace method is a coroutine
+    """
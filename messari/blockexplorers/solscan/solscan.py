@@ -1,6 +1,8 @@
 """This module is meant to contain the Solscan class"""
 
 from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
+from messari.pagination import Paginator
 from messari.utils import validate_input
 from string import Template
 from typing import Union, List, Dict
@@ -37,9 +39,17 @@ HEADERS={'accept': 'application/json', 'user-agent': 'Mozilla/5.0 (Macintosh; In
 class Solscan(DataLoader):
     """This class is a wrapper around the Solscan API
     """
+    # Public API allows 150 requests every 30 seconds
+    max_workers = 5
+    # How long responses are cached when a cache is set, finalized blocks never change
+    cache_ttls = [(r'solscan\.io/(block|transaction)/last', 0),
+                  (r'solscan\.io/(chaininfo|market/)', 60),
+                  (r'solscan\.io/block/\d+', None),
+                  (r'solscan\.io/account/', 60)]
 
     def __init__(self):
         DataLoader.__init__(self, api_dict=None, taxonomy_dict=None)
+        self.set_rate_limit(150, period=30)
 
     #################
     # Block endpoints
@@ -90,16 +100,16 @@ class Solscan(DataLoader):
         """
         blocks = validate_input(blocks_in)
 
-        df_list = []
-        for block in blocks:
+        def get_txns_df(block):
             params = {'block': block,
                       'offset': offset,
                       'limit': num_transactions}
             txns = self.get_response(BLOCK_TRANSACTIONS_URL,
-                                         params=params,
-                                         headers=HEADERS)
-            txns_df = pd.DataFrame(txns)
-            df_list.append(txns_df)
+                                     params=params,
+                                     headers=HEADERS)
+            return pd.DataFrame(txns)
+
+        df_list = self.fan_out(get_txns_df, blocks)
         fin_df = pd.concat(df_list, keys=blocks, axis=1)
         fin_df = unpack_dataframe_of_dicts(fin_df)
 
@@ -120,14 +130,15 @@ class Solscan(DataLoader):
         """
         blocks = validate_input(blocks_in)
 
-        df_list = []
-        for block in blocks:
+        def get_block_df(block):
             endpoint_url = BLOCK_BLOCK_URL.substitute(block=block)
             response = self.get_response(endpoint_url,
                                          headers=HEADERS)
             df = pd.DataFrame(response)
             df.drop('currentSlot', axis=1)
-            df_list.append(df)
+            return df
+
+        df_list = self.fan_out(get_block_df, blocks)
         fin_df = pd.concat(df_list, keys=blocks, axis=1)
         fin_df = fin_df.xs('result', axis=1, level=1)
         return fin_df
@@ -174,15 +185,14 @@ class Solscan(DataLoader):
         """
         signatures = validate_input(signatures_in)
 
-        series_list = []
-        for signature in signatures:
+        def get_transaction_series(signature):
             endpoint_url = TRANSACTION_SIGNATURE_URL.substitute(signature=signature)
             response = self.get_response(endpoint_url,
-                                        headers=HEADERS)
-            #print(response)
-            series = pd.Series(response)
-            series_list.append(series)
-        fin_df = pd.concat(series_list, keys=signatures, axis=1)
+                                         headers=HEADERS)
+            return pd.Series(response)
+
+        series_list = self.fan_out(get_transaction_series, signatures)
+        fin_df = self.concat_entities(series_list, signatures, key_name='signature')
         return fin_df
 
     ###################
@@ -202,15 +212,15 @@ class Solscan(DataLoader):
         """
         accounts = validate_input(accounts_in)
 
-        df_list=[]
-        for account in accounts:
+        def get_tokens_df(account):
             params={'account':account}
             response = self.get_response(ACCOUNT_TOKENS_URL,
                                          params=params,
                                          headers=HEADERS)
-            df = pd.DataFrame(response)
-            df_list.append(df)
-        fin_df = pd.concat(df_list, keys=accounts, axis=1)
+            return pd.DataFrame(response)
+
+        df_list = self.fan_out(get_tokens_df, accounts)
+        fin_df = self.concat_entities(df_list, accounts, key_name='account')
         return fin_df
 
     def get_account_transactions(self, accounts_in: Union[str,List]) -> pd.DataFrame:
@@ -228,15 +238,15 @@ class Solscan(DataLoader):
         """
         accounts = validate_input(accounts_in)
 
-        df_list=[]
-        for account in accounts:
+        def get_transactions_df(account):
             params={'account':account}
             response = self.get_response(ACCOUNT_TRANSACTIONS_URL,
                                          params=params,
                                          headers=HEADERS)
-            df = pd.DataFrame(response)
-            df_list.append(df)
-        fin_df = pd.concat(df_list, keys=accounts, axis=1)
+            return pd.DataFrame(response)
+
+        df_list = self.fan_out(get_transactions_df, accounts)
+        fin_df = self.concat_entities(df_list, accounts, key_name='account')
         return fin_df
 
     def get_account_stake(self, accounts_in: Union[str, List]) -> pd.DataFrame:
@@ -254,15 +264,15 @@ class Solscan(DataLoader):
         """
         accounts = validate_input(accounts_in)
 
-        df_list=[]
-        for account in accounts:
+        def get_stake_df(account):
             params={'account':account}
             response = self.get_response(ACCOUNT_STAKE_URL,
                                          params=params,
                                          headers=HEADERS)
-            df = pd.DataFrame(response)
-            df_list.append(df)
-        fin_df = pd.concat(df_list, keys=accounts, axis=1)
+            return pd.DataFrame(response)
+
+        df_list = self.fan_out(get_stake_df, accounts)
+        fin_df = self.concat_entities(df_list, accounts, key_name='account')
         return fin_df
 
     def get_account_spl_transactions(self, accounts_in: Union[str, List],
@@ -292,8 +302,7 @@ class Solscan(DataLoader):
         """
         accounts = validate_input(accounts_in)
 
-        df_list=[]
-        for account in accounts:
+        def get_transfers_df(account):
             params={'account':account,
                     'toTime': to_time,
                     'fromTime': from_time,
@@ -304,11 +313,49 @@ class Solscan(DataLoader):
                                          headers=HEADERS)
             df = pd.DataFrame(response)
             df.drop('total', axis=1)
-            df_list.append(df)
+            return df
+
+        df_list = self.fan_out(get_transfers_df, accounts)
         fin_df = pd.concat(df_list, keys=accounts, axis=1)
         fin_df = unpack_dataframe_of_dicts(fin_df)
         return fin_df
 
+    def iter_account_spl_transactions(self, account: str, from_time: int=None,
+                                      to_time: int=None, page_size: int=50,
+                                      prefetch: int=0) -> Paginator:
+        """Lazily pages through the SPL transfers of an account
+
+        Parameters
+        ----------
+            account: str
+                single account
+            from_time: int
+                unix time to start transaction history
+            to_time: int
+                unix time to end transaction history
+            page_size: int
+                transfers per request
+            prefetch: int
+                pages requested concurrently ahead of the one being read
+
+        Returns
+        -------
+            Paginator
+                yields SPL transfer dicts, iter_pages() yields lists of them
+        """
+        def get_page(page):
+            params={'account':account,
+                    'toTime': to_time,
+                    'fromTime': from_time,
+                    'offset': page * page_size,
+                    'limit': page_size}
+            response = self.get_response(ACCOUNT_SPL_TXNS_URL,
+                                         params=params,
+                                         headers=HEADERS)
+            return response['data']
+
+        return self.paginate(get_page, page_size=page_size, prefetch=prefetch)
+
     def get_account_sol_transactions(self, accounts_in: Union[str, List],
                                      from_time: int=None,
                                      to_time: int=None,
@@ -336,8 +383,7 @@ class Solscan(DataLoader):
         """
         accounts = validate_input(accounts_in)
 
-        df_list=[]
-        for account in accounts:
+        def get_transfers_df(account):
             params={'account':account,
                     'toTime': to_time,
                     'fromTime': from_time,
@@ -346,8 +392,9 @@ class Solscan(DataLoader):
             response = self.get_response(ACCOUNT_SOL_TXNS_URL,
                                          params=params,
                                          headers=HEADERS)
-            df = pd.DataFrame(response)
-            df_list.append(df)
+            return pd.DataFrame(response)
+
+        df_list = self.fan_out(get_transfers_df, accounts)
         fin_df = pd.concat(df_list, keys=accounts, axis=1)
         fin_df = unpack_dataframe_of_dicts(fin_df)
         return fin_df
@@ -376,16 +423,17 @@ class Solscan(DataLoader):
                 list of strings to make csv document
         """
         accounts = validate_input(accounts_in)
-        csv_list=[]
-        for account in accounts:
+
+        def get_csv(account):
             params={'account': account,
                     'type': type_in,
                     'fromTime': from_time,
                     'toTime': to_time}
             # NOTE: need to do this to not return json
-            response = self.session.get(ACCOUNT_EXPORT_TXNS_URL, params=params, headers=HEADERS)
-            csv = response.content.decode('utf-8')
-            csv_list.append(csv)
+            content = self.get_content(ACCOUNT_EXPORT_TXNS_URL, params=params, headers=HEADERS)
+            return content.decode('utf-8')
+
+        csv_list = self.fan_out(get_csv, accounts)
         return csv_list
 
     def get_account(self, accounts_in: Union[str, List]) -> pd.DataFrame:
@@ -402,14 +450,15 @@ class Solscan(DataLoader):
                 DataFrame with account info
         """
         accounts = validate_input(accounts_in)
-        series_list = []
-        for account in accounts:
+
+        def get_account_series(account):
             endpoint_url = ACCOUNT_ACCOUNT_URL.substitute(account=account)
             response = self.get_response(endpoint_url,
                                          headers=HEADERS)
-            series = pd.Series(response)
-            series_list.append(series)
-        fin_df = pd.concat(series_list, keys=accounts, axis=1)
+            return pd.Series(response)
+
+        series_list = self.fan_out(get_account_series, accounts)
+        fin_df = self.concat_entities(series_list, accounts, key_name='account')
         return fin_df
 
     #################
@@ -434,8 +483,7 @@ class Solscan(DataLoader):
         """
         tokens = validate_input(tokens_in)
 
-        df_list = []
-        for token in tokens:
+        def get_holders_df(token):
             params={'tokenAddress': token,
                     'limit': limit,
                     'offset': offset}
@@ -444,7 +492,9 @@ class Solscan(DataLoader):
                                          headers=HEADERS)
             df = pd.DataFrame(response)
             df.drop('total', axis=1)
-            df_list.append(df)
+            return df
+
+        df_list = self.fan_out(get_holders_df, tokens)
         fin_df = pd.concat(df_list, keys=tokens, axis=1)
         fin_df = unpack_dataframe_of_dicts(fin_df)
         return fin_df
@@ -464,15 +514,15 @@ class Solscan(DataLoader):
         """
         tokens = validate_input(tokens_in)
 
-        series_list = []
-        for token in tokens:
+        def get_meta_series(token):
             params={'tokenAddress': token}
             response = self.get_response(TOKEN_META_URL,
                                          params=params,
                                          headers=HEADERS)
-            series = pd.Series(response)
-            series_list.append(series)
-        fin_df = pd.concat(series_list, keys=tokens, axis=1)
+            return pd.Series(response)
+
+        series_list = self.fan_out(get_meta_series, tokens)
+        fin_df = self.concat_entities(series_list, tokens, key_name='token')
         return fin_df
 
     def get_token_list(self, sort_by: str='market_cap', ascending: bool=True,
@@ -511,10 +561,10 @@ class Solscan(DataLoader):
                 'direction': direction,
                 'limit': limit,
                 'offset': offset}
-        response = self.get_response(TOKEN_LIST_URL,
-                                     params=params,
-                                     headers=HEADERS)
-        token_list_df = pd.DataFrame(response['data'])
+        response = self.stream_response(TOKEN_LIST_URL, ['data.item'],
+                                        params=params,
+                                        headers=HEADERS)
+        token_list_df = response['data.item'].to_frame()
         return token_list_df
 
     ##################
@@ -534,14 +584,14 @@ class Solscan(DataLoader):
         """
         tokens = validate_input(tokens_in)
 
-        market_info_list = []
-        for token in tokens:
+        def get_market_info_series(token):
             endpoint_url = MARKET_INFO_URL.substitute(tokenAddress=token)
             market_info = self.get_response(endpoint_url,
                                             headers=HEADERS)
-            market_info_series = pd.Series(market_info)
-            market_info_list.append(market_info_series)
-        market_info_df = pd.concat(market_info_list, keys=tokens, axis=1)
+            return pd.Series(market_info)
+
+        market_info_list = self.fan_out(get_market_info_series, tokens)
+        market_info_df = self.concat_entities(market_info_list, tokens, key_name='token')
         return market_info_df
 
 
@@ -559,3 +609,9 @@ class Solscan(DataLoader):
                                        headers=HEADERS)
         chain_info_df = pd.Series(chain_info).to_frame(name='chain_info')
         return chain_info_df
+
+
+class AsyncSolscan(AsyncDataLoader, Solscan):
+    """This class is an asyncio wrapper around the Solscan API,
+    every public Solscan method is a coroutine
+    """
@@ -0,0 +1,315 @@
+"""This module is meant to contain the ResponseCache class, an optional on-disk
+HTTP cache used by DataLoader, & the RequestMemo class deduping identical requests"""
+
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Tuple, Union
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'messari', 'responses.sqlite')
+
+
+class CacheEntry(NamedTuple):
+    """A cached response body & the validators to revalidate it with"""
+    content: bytes
+    etag: Union[str, None]
+    last_modified: Union[str, None]
+    expires_at: Union[float, None]
+
+    @property
+    def is_fresh(self) -> bool:
+        """True until the entry's TTL runs out, entries w/o expiry never go stale"""
+        return self.expires_at is None or self.expires_at > time.time()
+
+    @property
+    def conditional_headers(self) -> Dict:
+        """Headers asking the server to answer 304 if the cached body is still current"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def request_key(endpoint_url: str, query: Tuple, headers: Tuple) -> str:
+    """Cache key for a request, the headers & query carry the auth scope (API keys)
+    so responses are never shared between credentials. Keys are hashed so
+    credentials aren't written to disk.
+
+    :param endpoint_url: str
+        URL API string.
+    :param query: tuple
+        Flattened (key, value) query parameters
+    :param headers: tuple
+        Sorted (key, value) headers
+    :return: str hex digest
+    """
+    raw = json.dumps([endpoint_url, sorted(query), sorted(headers)])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def match_ttl(ttl_rules: List[Tuple[str, Union[float, None]]], endpoint_url: str,
+              query: Tuple, default: Union[float, None]) -> Union[float, None]:
+    """TTL of the first rule whose pattern is found in 'url?key=value&...'
+
+    :param ttl_rules: list
+        (regex pattern, ttl seconds) pairs, None caches forever & 0 disables caching
+    :param endpoint_url: str
+        URL API string.
+    :param query: tuple
+        Flattened (key, value) query parameters
+    :param default: float
+        TTL used when no rule matches
+    :return: TTL in seconds or None for forever
+    """
+    target = endpoint_url + '?' + '&'.join(f'{key}={value}' for key, value in sorted(query))
+    for pattern, ttl in ttl_rules:
+        if re.search(pattern, target):
+            return ttl
+    return default
+
+
+class ResponseCache:
+    """SQLite backed HTTP response cache, shared by any number of DataLoaders.
+
+    Entries expire after the TTL of the endpoint they came from, expired
+    entries with an ETag or Last-Modified are revalidated instead of
+    downloaded again. Once the stored bodies grow past max_size bytes the
+    least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_size: int = 512 * 1024 ** 2,
+                 default_ttl: Union[float, None] = 3600):
+        """
+        Parameters
+        ----------
+            path: str
+                SQLite file, use ':memory:' for a cache that lives w/ the process
+            max_size: int
+                Max total size in bytes of cached response bodies
+            default_ttl: float
+                Seconds responses stay fresh if the data source has no rule for them
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute('''CREATE TABLE IF NOT EXISTS responses (
+                                            key TEXT PRIMARY KEY,
+                                            url TEXT,
+                                            content BLOB,
+                                            etag TEXT,
+                                            last_modified TEXT,
+                                            expires_at REAL,
+                                            accessed_at REAL,
+                                            size INTEGER)''')
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS accessed ON responses (accessed_at)')
+
+    def get(self, key: str) -> Union[CacheEntry, None]:
+        """Returns the entry for key, fresh or not, None if it isn't cached"""
+        with self._lock, self._connection:
+            row = self._connection.execute('''SELECT content, etag, last_modified, expires_at
+                                              FROM responses WHERE key = ?''', (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute('UPDATE responses SET accessed_at = ? WHERE key = ?',
+                                     (time.time(), key))
+        return CacheEntry(*row)
+
+    def set(self, key: str, url: str, content: bytes, ttl: Union[float, None],
+            etag: str = None, last_modified: str = None) -> None:
+        """Stores a response body, then evicts least recently used entries over max_size"""
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        with self._lock, self._connection:
+            self._connection.execute('''INSERT OR REPLACE INTO responses
+                                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                                     (key, url, content, etag, last_modified,
+                                      expires_at, now, len(content)))
+            self._evict()
+
+    def refresh(self, key: str, ttl: Union[float, None]) -> None:
+        """Restarts the TTL of an entry the server confirmed is still current (304)"""
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        with self._lock, self._connection:
+            self._connection.execute('''UPDATE responses SET expires_at = ?, accessed_at = ?
+                                        WHERE key = ?''', (expires_at, now, key))
+
+    def delete(self, key: str) -> None:
+        """Deletes a single cached response"""
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def clear(self) -> None:
+        """Deletes every cached response"""
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM responses')
+
+    def size(self) -> int:
+        """Total size in bytes of the cached response bodies"""
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_size,
+        caller holds the lock"""
+        total = self._connection.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_size:
+            return
+        rows = self._connection.execute('SELECT key, size FROM responses ORDER BY accessed_at')
+        evict = []
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            evict.append((key,))
+            total -= size
+        self._connection.executemany('DELETE FROM responses WHERE key = ?', evict)
+
+
+class _Flight:
+    """A request in progress that other threads can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.content = None
+        self.error = None
+
+
+class RequestMemo:
+    """In-process memo of recent responses, identical requests made within
+    lifetime seconds share one response. Requests are also single-flight,
+    concurrent identical requests wait on the one already in progress
+    instead of sending their own.
+    """
+
+    def __init__(self, lifetime: float = 5.0):
+        """
+        Parameters
+        ----------
+            lifetime: float
+                Seconds a completed response is reused, 0 turns the memo off
+        """
+        self.lifetime = lifetime
+        self._lock = threading.Lock()
+        self._recent: Dict[str, Tuple[bytes, float]] = {}
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict = {}
+        self._last_prune = time.monotonic()
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], bytes], reuse: bool = True) -> bytes:
+        """Returns the recent response for key or joins/starts the request for it
+
+        :param key: str
+            Request key, see request_key
+        :param fetch: Callable
+            Makes the request & returns the response body
+        :param reuse: bool
+            False for live endpoints, only a request in progress is joined
+            & the response isn't kept
+        :return: bytes response body
+        """
+        if self.lifetime <= 0:
+            return fetch()
+
+        with self._lock:
+            content = self._lookup(key) if reuse else None
+            if content is not None:
+                return content
+            flight = self._flights.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._flights[key] = _Flight()
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.content
+
+        try:
+            flight.content = fetch()
+            if reuse:
+                with self._lock:
+                    self._store(key, flight.content)
+            return flight.content
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def get_or_fetch_async(self, key: str, fetch: Callable[[], Awaitable],
+                                 reuse: bool = True) -> Any:
+        """Coroutine version of get_or_fetch, fetch returns the response
+        body or the exception it ran into. Exceptions aren't memoized.
+
+        :param key: str
+            Request key, see request_key
+        :param fetch: Callable
+            Coroutine function making the request
+        :param reuse: bool
+            False for live endpoints, only a request in progress is joined
+            & the response isn't kept
+        :return: bytes response body or exception
+        """
+        if self.lifetime <= 0:
+            return await fetch()
+
+        with self._lock:
+            content = self._lookup(key) if reuse else None
+        if content is not None:
+            return content
+        if key in self._async_flights:
+            return await asyncio.shield(self._async_flights[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._async_flights[key] = future
+        try:
+            result = await fetch()
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._async_flights.pop(key, None)
+        future.set_result(result)
+        if reuse and not isinstance(result, BaseException):
+            with self._lock:
+                self._store(key, result)
+        return result
+
+    def forget(self, key: str) -> None:
+        """Drops the recent response for key, i.e. when it turned out to be an error"""
+        with self._lock:
+            self._recent.pop(key, None)
+
+    def _lookup(self, key: str) -> Union[bytes, None]:
+        """Recent response body for key if still within lifetime, caller holds the lock"""
+        now = time.monotonic()
+        if now - self._last_prune > self.lifetime:
+            self._recent = {k: v for k, v in self._recent.items() if now - v[1] <= self.lifetime}
+            self._last_prune = now
+        recent = self._recent.get(key)
+        if recent is None or now - recent[1] > self.lifetime:
+            return None
+        return recent[0]
+
+    def _store(self, key: str, content: bytes) -> None:
+        """Remember a completed response, caller holds the lock"""
+        self._recent[key] = (content, time.monotonic())
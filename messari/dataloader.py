@@ -1,23 +1,126 @@
 """This module is meant to contain the DataLoader class"""
 
 
-from typing import List, Union, Dict
-import requests
-from messari.utils import validate_input
+import contextlib
+import contextvars
+import io
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Tuple, Union, Dict
+import pandas as pd
+from messari.utils import validate_input, stack_frames
+from messari.ratelimit import RateLimiter, RETRY_STATUSES, backoff_delay, parse_retry_after
+from messari.cache import ResponseCache, CacheEntry, RequestMemo, match_ttl, request_key
+from messari.transport import (TransportConfig, HTTP_ERRORS, create_session, get_shared_session,
+                               send_get, send_post, iter_body)
+from messari.jsonbackend import get_json_loads
+from messari.pagination import Paginator
+from messari.streaming import ColumnBuffer, ChunkReader, stream_columns, select_columns
+
+
+def query_items(params: Dict) -> Tuple:
+    """Flatten query parameters the same way requests does,
+    None values are dropped, lists repeat the key & values are strings"""
+    items = []
+    for key, value in (params or {}).items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for val in values:
+            if val is not None:
+                items.append((str(key), str(val)))
+    return tuple(items)
+
+
+def header_items(headers: Dict) -> Tuple:
+    """Headers as a hashable tuple, None values are dropped like requests does"""
+    return tuple(sorted((key, str(value)) for key, value in (headers or {}).items()
+                        if value is not None))
 
 
 class DataLoader:
     """This class is meant to represent a base wrapper around
-    a variety of different API's used as data sources
+    a variety of different API's used as data sources.
+
+    With fail_fast off, self.errors holds the (item, error) pairs of the latest
+    fan_out call, or of the latest errors_scope block, made on the calling thread
+    (or asyncio task). Threads sharing a loader each see their own errors.
     """
+    # Default number of concurrent requests, data sources override this to match their API
+    max_workers = 8
+    # Retries for 429 & 5xx responses, waits use jittered exponential backoff (seconds)
+    max_retries = 3
+    backoff_base = 0.5
+    backoff_max = 30.0
+    # (regex, ttl seconds) rules matched against 'url?key=value&...' when a cache is set,
+    # first match wins, None caches forever & 0 never caches. See messari.cache
+    cache_ttls: List[Tuple[str, Union[float, None]]] = []
+    # Seconds identical requests share one response, see messari.cache.RequestMemo.
+    # Endpoints cache_ttls gives a ttl of 0 only share requests in progress
+    memo_lifetime = 5.0
+    # Decoder for JSON responses, None uses the fastest installed, see messari.jsonbackend
+    json_backend: Union[str, None] = None
+    # Bodies over this many bytes are parsed incrementally by get_columns, None decodes
+    # every body whole, which is faster but holds the decoded document. See stream_response
+    stream_threshold: Union[int, None] = None
+    # How methods taking many entities shape their results, see set_output_format
+    output_format = 'wide'
+
     def __init__(self, api_dict: Dict, taxonomy_dict: Dict):
         self.api_dict = api_dict
         self.taxonomy_dict = taxonomy_dict
-        self.session = requests.Session()
+        # Requests per host limit, data sources set this w/ set_rate_limit
+        self.rate_limiter = None
+        # Optional on-disk response cache, see set_cache
+        self.cache = None
+        # Dedupes identical in-flight & recent requests
+        self.memo = RequestMemo(self.memo_lifetime)
+        # Decodes JSON responses, see set_json_backend
+        self.json_loads = get_json_loads(self.json_backend)
+
+        # Concurrent request executor, see fan_out
+        self.fail_fast = True
+        # (errors, scoped) of the calling thread or task, see errors & errors_scope
+        self._errors_state = contextvars.ContextVar('errors', default=None)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._worker_state = threading.local()
+
+        # HTTP session, see set_transport
+        self.session = None
+        self.transport = None
+        self.shared_session = False
+        self.set_transport()
 
     def __del__(self):
-        self.session.close()
+        executor = getattr(self, '_executor', None)
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if getattr(self, 'session', None) is not None and not self.shared_session:
+            self.session.close()
 
+    def set_transport(self, transport: TransportConfig = None, shared: bool = False) -> None:
+        """Sets connection pooling, keep-alive, timeouts & HTTP/2 for requests
+
+        :param transport: TransportConfig
+            Transport settings, defaults to TransportConfig()
+        :param shared: bool
+            True uses the process-wide session for these settings, so loaders
+            share one connection pool. False gives this loader its own session
+        """
+        if transport is None:
+            transport = TransportConfig()
+        # Size the connection pool so every fan_out worker can hold a connection
+        pool_maxsize = transport.pool_maxsize or max(self.max_workers, 10)
+
+        if self.session is not None and not self.shared_session:
+            self.session.close()
+        if shared:
+            self.session = get_shared_session(transport, pool_maxsize)
+        else:
+            self.session = create_session(transport, pool_maxsize)
+        self.transport = transport
+        self.shared_session = shared
 
     def set_api_dict(self, api_dict: Dict) -> None:
         """Sets a new dictionary to be used as an API key pair
@@ -35,6 +138,117 @@ class DataLoader:
         """
         self.taxonomy_dict = taxonomy_dict
 
+    def set_max_workers(self, max_workers: int) -> None:
+        """Sets the number of requests fan_out runs concurrently for this data source
+
+        :param max_workers: int
+            Number of worker threads, 1 runs every request serially
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers should be at least 1')
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self.max_workers = max_workers
+        if self.transport.pool_maxsize is None:
+            self.set_transport(self.transport, shared=self.shared_session)
+
+    def set_fail_fast(self, fail_fast: bool) -> None:
+        """Sets the default error handling for fan_out
+
+        :param fail_fast: bool
+            True raises the first error, False logs errors to self.errors & keeps going.
+            self.errors is emptied at the start of every fan_out call, see errors_scope
+        """
+        self.fail_fast = fail_fast
+
+    def set_rate_limit(self, calls: float, period: float = 1.0, host_limits: Dict = None) -> None:
+        """Limits requests made to each host with a token bucket
+
+        :param calls: float
+            Number of requests allowed every period
+        :param period: float
+            Length of the period in seconds
+        :param host_limits: dict
+            Optional {host: (calls, period)} overrides for specific hosts
+        """
+        self.rate_limiter = RateLimiter(calls, period, host_limits=host_limits)
+
+    def set_cache(self, cache: Union[ResponseCache, None]) -> None:
+        """Sets an on-disk response cache, one cache can be shared by many data sources
+
+        :param cache: ResponseCache
+            Cache to read & store responses in, None turns caching off
+        """
+        self.cache = cache
+
+    def set_memo_lifetime(self, lifetime: float) -> None:
+        """Sets how long identical requests reuse a completed response
+
+        :param lifetime: float
+            Seconds a response is reused, 0 sends every request
+        """
+        self.memo.lifetime = lifetime
+
+    def set_json_backend(self, backend: Union[str, None]) -> None:
+        """Sets the decoder get_response parses JSON responses with
+
+        :param backend: str
+            'orjson', 'simdjson' or 'json', None uses the fastest installed
+        """
+        self.json_loads = get_json_loads(backend)
+        self.json_backend = backend
+
+    def set_stream_threshold(self, threshold: Union[int, None]) -> None:
+        """Sets the response size get_columns starts streaming at
+
+        :param threshold: int
+            Bytes, larger bodies & bodies of unknown size are parsed incrementally.
+            0 streams every body, None decodes every body whole
+        """
+        self.stream_threshold = threshold
+
+    def set_output_format(self, output_format: str) -> None:
+        """Sets how methods taking many entities (slugs, accounts, contracts...) shape their results
+
+        :param output_format: str
+            'wide' concats each entity's frame side by side under an entity column
+            level, reindexed to the union of every index. 'long' stacks each
+            entity's rows under a categorical entity column, nothing is padded
+        """
+        if output_format not in ('wide', 'long'):
+            raise ValueError("output_format should be 'wide' or 'long'")
+        self.output_format = output_format
+
+    def concat_entities(self, frames: List, keys: List, key_name: str = 'entity') -> pd.DataFrame:
+        """Combines the frame (or Series) of each entity according to output_format
+
+        :param frames: list
+            Frame or Series per entity, None for entities that failed
+        :param keys: list
+            Entity of each frame
+        :param key_name: str
+            Name of the entity column in long output
+        :return: pandas DataFrame
+        """
+        if self.output_format == 'long':
+            return stack_frames(frames, keys, key_name=key_name)
+        if all(frame is None for frame in frames):
+            # every entity failed, pd.concat raises when it has nothing to concat
+            return pd.DataFrame()
+        return pd.concat(frames, keys=keys, axis=1)
+
+    def set_max_retries(self, max_retries: int) -> None:
+        """Sets the number of times a 429 or 5xx response is retried
+
+        :param max_retries: int
+            Number of retries, 0 raises on the first failed response
+        """
+        if max_retries < 0:
+            raise ValueError('max_retries should be at least 0')
+        self.max_retries = max_retries
+
     def get_response(self, endpoint_url: str, params: Dict = None, headers: Dict = None) -> Dict:
         """Gets response from endpoint and checks for HTTP errors when requesting data.
 
@@ -47,13 +261,375 @@ class DataLoader:
         :return: JSON with requested data
         :raises SystemError if HTTP error occurs
         """
+        content = self.get_content(endpoint_url, params=params, headers=headers)
+        try:
+            return self.validate_response(self.json_loads(content))
+        except Exception:
+            # don't keep serving an error payload from the memo or cache
+            query, header_tuple = query_items(params), header_items(headers)
+            self.memo.forget(request_key(endpoint_url, query, header_tuple))
+            cache_key, _, _ = self._cache_lookup(endpoint_url, query, header_tuple)
+            if cache_key is not None:
+                self.cache.delete(cache_key)
+            raise
+
+    def validate_response(self, response: Any) -> Any:
+        """Hook to check a decoded response before it is parsed, data sources
+        whose APIs report errors inside successful responses override this.
+
+        :param response: Any
+            Decoded JSON response
+        :return: the response, possibly normalized
+        """
+        return response
+
+    def is_rate_limited(self, content: bytes) -> bool:  # pylint: disable=unused-argument
+        """Hook for APIs that report rate limiting in a 200 response body,
+        True retries the request like a 429.
+
+        :param content: bytes
+            Raw response body
+        :return: bool
+        """
+        return False
+
+    def get_content(self, endpoint_url: str, params: Dict = None, headers: Dict = None) -> bytes:
+        """Gets the raw response body from endpoint, used for non JSON endpoints (i.e. csv).
+        Every request a data source makes goes through here.
+
+        :param endpoint_url: str
+            URL API string.
+        :param params: dict
+            Dictionary of query parameters.
+        :param headers: str:
+            Dictionary of headers
+        :return: bytes of the response body
+        :raises SystemError if HTTP error occurs
+        """
+        query = query_items(params)
+        memo_key = request_key(endpoint_url, query, header_items(headers))
+        return self.memo.get_or_fetch(
+            memo_key, lambda: self._request_content(endpoint_url, params, headers),
+            reuse=self._memo_reuse(endpoint_url, query))
+
+    def _memo_reuse(self, endpoint_url: str, query: Tuple) -> bool:
+        """False for endpoints cache_ttls never caches (ttl 0, i.e. the latest block),
+        the memo only joins their requests in progress instead of reusing a response"""
+        return match_ttl(self.cache_ttls, endpoint_url, query, None) != 0
+
+    def _request_content(self, endpoint_url: str, params: Dict, headers: Dict) -> bytes:
+        """Makes the request for get_content, using the cache, rate limiter & retries"""
+        cache_key, entry, ttl = self._cache_lookup(endpoint_url, query_items(params),
+                                                   header_items(headers))
+        if entry is not None:
+            if entry.is_fresh:
+                return entry.content
+            headers = dict(headers or {}, **entry.conditional_headers)
+
+        response, retry_status = self._send(endpoint_url, params, headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(cache_key, ttl)
+            return entry.content
         try:
-            response = self.session.get(endpoint_url, params=params, headers=headers)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.HTTPError as e:
+        except HTTP_ERRORS as e:
             # NOTE if this doesn't work remove 'from e'
             raise SystemError(e) from e
+        if retry_status is None:
+            self._cache_store(cache_key, endpoint_url, ttl, response.content, response.headers)
+        return response.content
+
+    def post_content(self, endpoint_url: str, data: bytes, headers: Dict = None) -> bytes:
+        """POSTs data to endpoint & returns the raw response body, used for JSON-RPC.
+        POSTs use the rate limiter & retries but skip the request memo & cache.
+
+        :param endpoint_url: str
+            URL API string.
+        :param data: bytes
+            Request body
+        :param headers: str:
+            Dictionary of headers
+        :return: bytes of the response body
+        :raises SystemError if HTTP error occurs
+        """
+        response, _ = self._send(endpoint_url, None, headers, data=data)
+        try:
+            response.raise_for_status()
+        except HTTP_ERRORS as e:
+            raise SystemError(e) from e
+        return response.content
+
+    def get_columns(self, endpoint_url: str, patterns: List[str], params: Dict = None,
+                    headers: Dict = None, flatten: bool = False) -> Dict[str, ColumnBuffer]:
+        """Gets a JSON response & keeps the items found at patterns, column by column.
+        The body is decoded whole unless stream_threshold is set, then bodies over
+        it are parsed incrementally w/ stream_response.
+
+        :param endpoint_url: str
+            URL API string.
+        :param patterns: list
+            ijson style prefixes of the items to keep, i.e. 'chainTvls.*.tvl.item'
+        :param params: dict
+            Dictionary of query parameters.
+        :param headers: str:
+            Dictionary of headers
+        :param flatten: bool
+            Merge nested objects into their item, see messari.streaming.ColumnBuffer
+        :return: {prefix: ColumnBuffer}, see messari.streaming.select_columns
+        :raises SystemError if HTTP error occurs
+        """
+        if self.stream_threshold is None:
+            response = self.get_response(endpoint_url, params=params, headers=headers)
+            return select_columns(response, patterns, flatten=flatten)
+        return self.stream_response(endpoint_url, patterns, params=params, headers=headers,
+                                    flatten=flatten, min_size=self.stream_threshold)
+
+    def stream_response(self, endpoint_url: str, patterns: List[str], params: Dict = None,
+                        headers: Dict = None, flatten: bool = False,
+                        min_size: int = None) -> Dict[str, ColumnBuffer]:
+        """Gets a large JSON response through an incremental parser, only the items
+        found at patterns are kept, column by column, & the rest of the document
+        is dropped as it is read. Used by endpoints returning long timeseries.
+
+        The body is parsed straight off the socket unless the endpoint is cached,
+        then the cached body is parsed. Streamed responses skip validate_response
+        & the request memo.
+
+        :param endpoint_url: str
+            URL API string.
+        :param patterns: list
+            ijson style prefixes of the items to keep, i.e. 'chainTvls.*.tvl.item'
+        :param params: dict
+            Dictionary of query parameters.
+        :param headers: str:
+            Dictionary of headers
+        :param flatten: bool
+            Merge nested objects into their item, see messari.streaming.ColumnBuffer
+        :param min_size: int
+            Bodies w/ a known size under this many bytes are decoded whole instead
+        :return: {prefix: ColumnBuffer}, see messari.streaming.stream_columns
+        :raises SystemError if HTTP error occurs
+        """
+        cache_key, _, _ = self._cache_lookup(endpoint_url, query_items(params),
+                                             header_items(headers))
+        if cache_key is not None:
+            content = self.get_content(endpoint_url, params=params, headers=headers)
+            return self._parse_columns(content, patterns, flatten, min_size)
+
+        response, _ = self._send(endpoint_url, params, headers, stream=True)
+        try:
+            try:
+                response.raise_for_status()
+            except HTTP_ERRORS as e:
+                raise SystemError(e) from e
+            size = response.headers.get('Content-Length')
+            if min_size is not None and size is not None and int(size) < min_size:
+                return self._parse_columns(b''.join(iter_body(response)), patterns, flatten)
+            return stream_columns(ChunkReader(iter_body(response)), patterns, flatten=flatten)
+        finally:
+            response.close()
+
+    def _parse_columns(self, content: bytes, patterns: List[str], flatten: bool,
+                       min_size: int = None) -> Dict[str, ColumnBuffer]:
+        """Columns of a body already in memory, decoded whole if it's under min_size"""
+        if min_size is not None and len(content) < min_size:
+            return select_columns(self.json_loads(content), patterns, flatten=flatten)
+        return stream_columns(io.BytesIO(content), patterns, flatten=flatten)
+
+    def _send(self, endpoint_url: str, params: Dict, headers: Dict, stream: bool = False,
+              data: bytes = None) -> Tuple[Any, Union[int, None]]:
+        """GET, or POST data, w/ the rate limiter & retries, returns the last
+        response & the status it would be retried as (None when it succeeded)"""
+        attempt = 0
+        while True:
+            time.sleep(self._rate_limit_wait(endpoint_url))
+            if data is not None:
+                response = send_post(self.session, endpoint_url, data, dict(header_items(headers)))
+            else:
+                response = send_get(self.session, endpoint_url, list(query_items(params)),
+                                    dict(header_items(headers)), stream=stream)
+            # a streamed body isn't read yet, only the status can be checked
+            retry_status = self._retry_status(response.status_code,
+                                              None if stream else response.content)
+            if retry_status is None or attempt == self.max_retries:
+                return response, retry_status
+            if stream:
+                response.close()
+            time.sleep(self._retry_delay(endpoint_url, retry_status,
+                                         response.headers.get('Retry-After'), attempt))
+            attempt += 1
+
+    def _cache_lookup(self, endpoint_url: str, query: Tuple,
+                      headers: Tuple) -> Tuple[Union[str, None], Union[CacheEntry, None], Any]:
+        """Returns (cache key, cached entry, ttl) for a request,
+        the key is None when there is no cache or the endpoint isn't cached"""
+        if self.cache is None:
+            return None, None, None
+        ttl = match_ttl(self.cache_ttls, endpoint_url, query, self.cache.default_ttl)
+        if ttl == 0:
+            return None, None, None
+        cache_key = request_key(endpoint_url, query, headers)
+        return cache_key, self.cache.get(cache_key), ttl
+
+    def _cache_store(self, cache_key: Union[str, None], endpoint_url: str,
+                     ttl: Union[float, None], content: bytes, response_headers: Dict) -> None:
+        """Store a successful response w/ its validators for later revalidation"""
+        if cache_key is None:
+            return
+        self.cache.set(cache_key, endpoint_url, content, ttl,
+                       etag=response_headers.get('ETag'),
+                       last_modified=response_headers.get('Last-Modified'))
+
+    def _rate_limit_wait(self, endpoint_url: str) -> float:
+        """Seconds to wait before requesting endpoint_url to stay under the rate limit"""
+        if self.rate_limiter is None:
+            return 0.0
+        return self.rate_limiter.reserve(endpoint_url)
+
+    def _retry_status(self, status: int, content: Union[bytes, None]) -> Union[int, None]:
+        """Status to retry a response as, None if it shouldn't be retried.
+        Rate limits reported in the body of a 200 are retried as a 429"""
+        if status in RETRY_STATUSES:
+            return status
+        if status == 200 and content is not None and self.is_rate_limited(content):
+            return 429
+        return None
+
+    def _retry_delay(self, endpoint_url: str, status: int,
+                     retry_after: str, attempt: int) -> float:
+        """Seconds to wait before retrying a failed request, a 429 also holds
+        back every other request to the same host"""
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_max,
+                              parse_retry_after(retry_after))
+        if status == 429 and self.rate_limiter is not None:
+            self.rate_limiter.penalize(endpoint_url, delay)
+        logging.info('%s got %s from %s, retrying in %.2fs',
+                     type(self).__name__, status, endpoint_url, delay)
+        return delay
+
+    @property
+    def errors(self) -> List:
+        """(item, error) pairs collected w/ fail_fast off by the latest fan_out call,
+        or errors_scope block, made on the calling thread or asyncio task"""
+        state = self._errors_state.get()
+        if state is None:
+            state = ([], False)
+            self._errors_state.set(state)
+        return state[0]
+
+    @contextlib.contextmanager
+    def errors_scope(self) -> Iterator[List]:
+        """Collects the errors of every fan_out call inside the block into one fresh
+        self.errors, data source methods fanning out more than once wrap their
+        rounds in it. Inside a scope, or on a fan_out worker, errors are added to
+        the enclosing one.
+
+        :return: the list errors are collected in
+        """
+        state = self._errors_state.get()
+        if state is not None and state[1]:
+            yield state[0]
+            return
+        errors: List = []
+        self._errors_state.set((errors, True))
+        try:
+            yield errors
+        finally:
+            self._errors_state.set((errors, False))
+
+    def fan_out(self, func: Callable[[Any], Any], items: List,
+                fail_fast: bool = None) -> List:
+        """Runs func over every item concurrently on this loader's executor.
+
+        Results are returned in the same order as items, regardless of the
+        order requests complete in.
+
+        :param func: Callable
+            Function run once per item, usually wraps a get_response call
+        :param items: list
+            Inputs passed to func one at a time (slugs, addresses, blocks...)
+        :param fail_fast: bool
+            True raises the first error & cancels pending items. False logs the
+            error, appends (item, error) to self.errors & returns None for that
+            item. self.errors is emptied first unless fan_out is called inside an
+            errors_scope block. Defaults to self.fail_fast
+        :return: List of results ordered like items
+        """
+        if fail_fast is None:
+            fail_fast = self.fail_fast
+        items = list(items)
+
+        with self.errors_scope() as errors:
+            # Nested calls from a worker run inline so the pool can't deadlock on itself
+            if len(items) < 2 or self.max_workers < 2 or self.in_worker():
+                return [self._fan_out_call(func, item, fail_fast) for item in items]
+
+            executor = self._get_executor()
+            futures = [executor.submit(self._fan_out_worker, func, item, fail_fast, errors)
+                       for item in items]
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def in_worker(self) -> bool:
+        """True on the threads running fan_out items of this loader, work waiting on
+        the executor from there runs inline instead so the pool can't deadlock on itself
+        """
+        return getattr(self._worker_state, 'active', False)
+
+    def paginate(self, fetch_page: Callable[[int], List], page_size: int = None,
+                 start: int = 0, prefetch: int = 0, max_pages: int = None) -> Paginator:
+        """Wraps a function fetching one page in a lazy Paginator, the iter_
+        methods of data sources return these.
+
+        :param fetch_page: Callable
+            Returns the list of records on a page, given its page number
+        :param page_size: int
+            Records on a full page, a shorter page is the last one
+        :param start: int
+            Number of the first page
+        :param prefetch: int
+            Pages requested concurrently ahead of the one being consumed
+        :param max_pages: int
+            Stop after this many pages
+        :return: Paginator, iterating it yields records & iter_pages yields pages
+        """
+        return Paginator(self, fetch_page, page_size=page_size, start=start,
+                         prefetch=prefetch, max_pages=max_pages)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the executor shared by every fan_out call on this loader"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix=type(self).__name__)
+            return self._executor
+
+    def _fan_out_worker(self, func: Callable[[Any], Any], item: Any, fail_fast: bool,
+                        errors: List) -> Any:
+        """Executor entry point, flags the thread as a worker for nested fan_out calls
+        & collects its errors in the calling fan_out's list"""
+        self._worker_state.active = True
+        token = self._errors_state.set((errors, True))
+        try:
+            return self._fan_out_call(func, item, fail_fast)
+        finally:
+            self._errors_state.reset(token)
+            self._worker_state.active = False
+
+    def _fan_out_call(self, func: Callable[[Any], Any], item: Any, fail_fast: bool) -> Any:
+        """Run func for a single item, collecting the error if not failing fast"""
+        if fail_fast:
+            return func(item)
+        try:
+            return func(item)
+        except Exception as e:  # pylint: disable=broad-except
+            logging.warning('%s failed for %s: %s', type(self).__name__, item, e)
+            self.errors.append((item, e))
+            return None
 
     def translate(self, input_slugs: Union[str, List]) -> Union[List, None]:
         """Wrapper around messari.utils.validate_input,
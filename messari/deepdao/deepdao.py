@@ -1,6 +1,5 @@
 """This module is meant to contain the Deep DAO class"""
 
-import requests
 from string import Template
 from typing import Union, List
 import json
@@ -8,6 +7,7 @@ import pandas as pd
 import numpy as np
 
 from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
 from messari.utils import validate_input
 from .helpers import unpack_dataframe_of_lists, unpack_dataframe_of_dicts
 
@@ -32,11 +32,19 @@ USER_VOTES_URL = Template('https://backend.deepdao.io/user/$user/votes')
 class DeepDAO(DataLoader):
     """This class is a wrapper around the DeepDAO API
     """
+    # How long responses are cached when a cache is set
+    cache_ttls = [(r'deepdao\.io/people/top', 86400),
+                  (r'deepdao\.io/(dashboard|dao)/', 600)]
+    # The dashboard & DAO payloads back several methods each, reuse them for a minute
+    memo_lifetime = 60.0
 
     def __init__(self):
         # Need to init DataLoader first to have get_respone work in rest of __init__
         DataLoader.__init__(self, api_dict=None, taxonomy_dict=None)
+        self._load_taxonomies()
 
+    def _load_taxonomies(self) -> None:
+        """Builds the member name <-> address & DAO name <-> id lookups"""
         people = self.get_top_members(count=100000)
         people_dict={}
         address_dict={}
@@ -91,7 +99,7 @@ class DeepDAO(DataLoader):
            DataFrame
                pandas DataFrame of Deep DAO organizations info
         """
-        organizations = requests.get(ORGANIZATIONS_URL).json()
+        organizations = self.get_response(ORGANIZATIONS_URL)
         organizations_df = pd.DataFrame(organizations)
         return organizations_df
 
@@ -102,7 +110,7 @@ class DeepDAO(DataLoader):
            DataFrame
                pandas DataFrame of Deep DAO organizations summaries
         """
-        response = requests.get(DASHBOARD_URL).json()
+        response = self.get_response(DASHBOARD_URL)
         summary = response['daosSummary']
         summary_df = pd.DataFrame(summary)
         summary_df.drop('daosArr', axis=1, inplace=True)
@@ -115,7 +123,7 @@ class DeepDAO(DataLoader):
            DataFrame
                pandas DataFrame of DAO ecosystem overview
         """
-        response = requests.get(DASHBOARD_URL).json()
+        response = self.get_response(DASHBOARD_URL)
         overview = response['daoEcosystemOverview']
         dict_list = []
         count=0
@@ -151,7 +159,7 @@ class DeepDAO(DataLoader):
            DataFrame
                pandas DataFrame of Deep DAO organizations rankings
         """
-        response = requests.get(DASHBOARD_URL).json()
+        response = self.get_response(DASHBOARD_URL)
         rankings = response['daoEcosystemOverview']['daoRankings']
         rankings_df = pd.DataFrame(rankings)
         rankings_df.drop('date', axis=1, inplace=True)
@@ -164,13 +172,24 @@ class DeepDAO(DataLoader):
            DataFrame
                pandas DataFrame with token utilization
         """
-        response = requests.get(DASHBOARD_URL).json()
+        response = self.get_response(DASHBOARD_URL)
         tokens = response['daoTokens']
         tokens_df = pd.DataFrame(tokens)
         return tokens_df
 
 
     ####### Overview
+    def _get_dao_info_series(self, slug: str) -> pd.Series:
+        """Returns the raw DAO payload for a single DAO name or id as a Series"""
+        # TODO swap w/ validate
+        if slug in self.id_tax:
+            dao_id = self.id_tax[slug]
+        else:
+            dao_id = slug
+        endpoint_url = DAO_URL.substitute(dao_id=dao_id)
+        dao_info = self.get_response(endpoint_url)
+        return pd.Series(dao_info)
+
     def get_dao_info(self, dao_slugs: Union[str, List]) -> pd.DataFrame:
         """Returns basic information for given DAO(s)
         Parameters
@@ -186,21 +205,11 @@ class DeepDAO(DataLoader):
 
         slugs = validate_input(dao_slugs)
 
-        dao_info_list = []
-        for slug in slugs:
-            # TODO swap w/ validate
-            if slug in self.id_tax:
-                dao_id = self.id_tax[slug]
-            else:
-                dao_id = slug
-            endpoint_url = DAO_URL.substitute(dao_id=dao_id)
-            dao_info = self.get_response(endpoint_url)
-            dao_info_series = pd.Series(dao_info)
-            dao_info_list.append(dao_info_series)
-
-        dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
+        dao_info_list = self.fan_out(self._get_dao_info_series, slugs)
+        dao_info_df = self.concat_entities(dao_info_list, slugs, key_name='slug')
         dao_info_df.drop(['rankings', 'indices', 'proposals', 'members',
-                          'votersCoalition', 'financial'], inplace=True)
+                          'votersCoalition', 'financial'],
+                         axis=1 if self.output_format == 'long' else 0, inplace=True)
         return dao_info_df
 
 
@@ -221,18 +230,7 @@ class DeepDAO(DataLoader):
 
         slugs = validate_input(dao_slugs)
 
-        dao_info_list = []
-        for slug in slugs:
-            # TODO swap w/ validate
-            if slug in self.id_tax:
-                dao_id = self.id_tax[slug]
-            else:
-                dao_id = slug
-            endpoint_url = DAO_URL.substitute(dao_id=dao_id)
-            dao_info = self.get_response(endpoint_url)
-            dao_info_series = pd.Series(dao_info)
-            dao_info_list.append(dao_info_series)
-
+        dao_info_list = self.fan_out(self._get_dao_info_series, slugs)
         dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
         indices = dao_info_df.loc['indices']
 
@@ -250,7 +248,7 @@ class DeepDAO(DataLoader):
             data_series = pd.Series(new_data)
             indices_list.append(data_series)
 
-        indices_df = pd.concat(indices_list, keys=slugs, axis=1)
+        indices_df = pd.concat(indices_list, keys=indices.index, axis=1)
         # NOTE, somehow nan sneaks into the df despite all dicts being None?
         indices_df.replace({np.nan: None}, inplace=True)
         return indices_df
@@ -271,18 +269,7 @@ class DeepDAO(DataLoader):
 
         slugs = validate_input(dao_slugs)
 
-        dao_info_list = []
-        for slug in slugs:
-            # TODO swap w/ validate
-            if slug in self.id_tax:
-                dao_id = self.id_tax[slug]
-            else:
-                dao_id = slug
-            endpoint_url = DAO_URL.substitute(dao_id=dao_id)
-            dao_info = self.get_response(endpoint_url)
-            dao_info_series = pd.Series(dao_info)
-            dao_info_list.append(dao_info_series)
-
+        dao_info_list = self.fan_out(self._get_dao_info_series, slugs)
         dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
         proposals = dao_info_df.loc['proposals']
 
@@ -291,7 +278,7 @@ class DeepDAO(DataLoader):
             data = json.loads(proposal)
             data_series = pd.Series(data)
             proposals_list.append(data_series)
-        proposals_df = pd.concat(proposals_list, keys=slugs, axis=1)
+        proposals_df = pd.concat(proposals_list, keys=proposals.index, axis=1)
 
         proposals_df = unpack_dataframe_of_dicts(proposals_df)
 
@@ -314,18 +301,7 @@ class DeepDAO(DataLoader):
 
         slugs = validate_input(dao_slugs)
 
-        dao_info_list = []
-        for slug in slugs:
-            # TODO swap w/ validate
-            if slug in self.id_tax:
-                dao_id = self.id_tax[slug]
-            else:
-                dao_id = slug
-            endpoint_url = DAO_URL.substitute(dao_id=dao_id)
-            dao_info = self.get_response(endpoint_url)
-            dao_info_series = pd.Series(dao_info)
-            dao_info_list.append(dao_info_series)
-
+        dao_info_list = self.fan_out(self._get_dao_info_series, slugs)
         dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
         members = dao_info_df.loc['members']
 
@@ -335,7 +311,7 @@ class DeepDAO(DataLoader):
             data_series = pd.Series(data)
             members_list.append(data_series)
 
-        members_df = pd.concat(members_list, keys=slugs, axis=1)
+        members_df = pd.concat(members_list, keys=members.index, axis=1)
 
         members_df = unpack_dataframe_of_dicts(members_df)
 
@@ -357,18 +333,7 @@ class DeepDAO(DataLoader):
 
         slugs = validate_input(dao_slugs)
 
-        dao_info_list = []
-        for slug in slugs:
-            # TODO swap w/ validate
-            if slug in self.id_tax:
-                dao_id = self.id_tax[slug]
-            else:
-                dao_id = slug
-            endpoint_url = DAO_URL.substitute(dao_id=dao_id)
-            dao_info = self.get_response(endpoint_url)
-            dao_info_series = pd.Series(dao_info)
-            dao_info_list.append(dao_info_series)
-
+        dao_info_list = self.fan_out(self._get_dao_info_series, slugs)
         dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
         coalitions = dao_info_df.loc['votersCoalition']
 
@@ -378,7 +343,7 @@ class DeepDAO(DataLoader):
             data_series = pd.Series(data)
             coalitions_list.append(data_series)
 
-        coalitions_df = pd.concat(coalitions_list, keys=slugs, axis=1)
+        coalitions_df = pd.concat(coalitions_list, keys=coalitions.index, axis=1)
 
 
         coalitions_df = unpack_dataframe_of_lists(coalitions_df)
@@ -405,18 +370,7 @@ class DeepDAO(DataLoader):
 
         slugs = validate_input(dao_slugs)
 
-        dao_info_list = []
-        for slug in slugs:
-            # TODO swap w/ validate
-            if slug in self.id_tax:
-                dao_id = self.id_tax[slug]
-            else:
-                dao_id = slug
-            endpoint_url = DAO_URL.substitute(dao_id=dao_id)
-            dao_info = self.get_response(endpoint_url)
-            dao_info_series = pd.Series(dao_info)
-            dao_info_list.append(dao_info_series)
-
+        dao_info_list = self.fan_out(self._get_dao_info_series, slugs)
         dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
         financials = dao_info_df.loc['financial']
 
@@ -426,7 +380,7 @@ class DeepDAO(DataLoader):
             data_series = pd.Series(data)
             financials_list.append(data_series)
 
-        financials_df = pd.concat(financials_list, keys=slugs, axis=1)
+        financials_df = pd.concat(financials_list, keys=financials.index, axis=1)
         tokens = financials_df.loc['tokens']
         df_list=[]
         for token in tokens:
@@ -456,8 +410,9 @@ class DeepDAO(DataLoader):
         params = {'limit': count,
                   'offset': 0,
                   'sortBy': 'daoAmount'}
-        people = self.get_response(PEOPLE_URL, params=params)
-        people_df = pd.DataFrame(people)
+        # up to 100000 members, streamed so only the member rows are kept
+        people = self.stream_response(PEOPLE_URL, ['item'], params=params)
+        people_df = people['item'].to_frame()
         return people_df
 
     def get_member_info(self, pubkeys: Union[str, List]) -> pd.DataFrame:
@@ -473,17 +428,18 @@ class DeepDAO(DataLoader):
                pandas DataFrame with member information
         """
         users = validate_input(pubkeys)
-        user_info_list = []
-        for user in users:
+
+        def get_user_info_series(user):
             if user in self.address_tax:
                 user_address = self.address_tax[user]
             else:
                 user_address = user
             endpoint_url = USER_URL.substitute(user=user_address)
-            user_info = requests.get(endpoint_url).json()
-            user_info_series = pd.Series(user_info)
-            user_info_list.append(user_info_series)
-        users_info_df = pd.concat(user_info_list, keys=users, axis=1)
+            user_info = self.get_response(endpoint_url)
+            return pd.Series(user_info)
+
+        user_info_list = self.fan_out(get_user_info_series, users)
+        users_info_df = self.concat_entities(user_info_list, users, key_name='user')
         return users_info_df
 
     def get_member_proposals(self, pubkeys: Union[str, List]) -> pd.DataFrame:
@@ -500,16 +456,17 @@ class DeepDAO(DataLoader):
         """
         #TODO what even is this
         users = validate_input(pubkeys)
-        proposal_info_list = []
-        for user in users:
+
+        def get_proposal_info_series(user):
             if user in self.address_tax:
                 user_address = self.address_tax[user]
             else:
                 user_address = user
             endpoint_url = USER_PROPOSALS_URL.substitute(user=user_address)
             proposal_info = self.get_response(endpoint_url)
-            proposal_info_series = pd.Series(proposal_info)
-            proposal_info_list.append(proposal_info_series)
+            return pd.Series(proposal_info)
+
+        proposal_info_list = self.fan_out(get_proposal_info_series, users)
         proposals_info_df = pd.concat(proposal_info_list, keys=users, axis=1)
 
 
@@ -540,17 +497,17 @@ class DeepDAO(DataLoader):
                pandas DataFrame with member voting history
         """
         users = validate_input(pubkeys)
-        votes_info_list = []
-        for user in users:
+
+        def get_votes_info_series(user):
             if user in self.address_tax:
                 user_address = self.address_tax[user]
             else:
                 user_address = user
             endpoint_url = USER_VOTES_URL.substitute(user=user_address)
             votes_info = self.get_response(endpoint_url)
-            votes_info_series = pd.Series(votes_info)
-            votes_info_list.append(votes_info_series)
+            return pd.Series(votes_info)
 
+        votes_info_list = self.fan_out(get_votes_info_series, users)
         votes_info_df = pd.concat(votes_info_list, keys=users, axis=1)
 
         old_index = votes_info_df.index
@@ -574,3 +531,26 @@ class DeepDAO(DataLoader):
         votes_df = unpack_dataframe_of_lists(votes_info_df)
 
         return votes_df
+
+
+class AsyncDeepDAO(AsyncDataLoader, DeepDAO):
+    """This class is an asyncio wrapper around the DeepDAO API,
+    every public DeepDAO method is a coroutine.
+
+    DeepDAO loads its member & DAO lookups when it's created,
+    use ``await AsyncDeepDAO.create()`` instead of ``AsyncDeepDAO()``
+    """
+
+    def _load_taxonomies(self) -> None:
+        """Lookups are loaded by create, start empty so name translation still works"""
+        self.people_tax = {}
+        self.address_tax = {}
+        self.name_tax = {}
+        self.id_tax = {}
+
+    @classmethod
+    async def create(cls) -> 'AsyncDeepDAO':
+        """Returns an AsyncDeepDAO with its member & DAO lookups loaded"""
+        deepdao = cls()
+        await deepdao._replay(DeepDAO._load_taxonomies)
+        return deepdao
@@ -1,16 +1,23 @@
 """This module is meant to contain the DeFiLlama class"""
 
 # Global imports
+import asyncio
 import datetime
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from string import Template
-from typing import Union, List, Dict
+from typing import Any, Callable, Union, List, Dict
 
 import pandas as pd
 
 from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
 # Local imports
-from messari.utils import validate_input, get_taxonomy_dict, time_filter_df
-from .helpers import format_df
+from messari.utils import (validate_input, validate_datetime, get_taxonomy_dict, time_filter_df,
+                           stack_frames)
+from .helpers import (format_df, normalize_protocol, parse_protocol, balances_to_points,
+                      oldest_watermark, points_since, points_to_df)
+from .store import TVLStore, empty_points
 
 ##########################
 # URL Endpoints
@@ -21,18 +28,74 @@ DL_CURRENT_PROTOCOL_TVL_URL = Template("https://api.llama.fi/tvl/$slug")
 DL_CHAIN_TVL_URL = Template("https://api.llama.fi/charts/$chain")
 DL_GET_PROTOCOL_TVL_URL = Template("https://api.llama.fi/protocol/$slug")
 
+# Parts of the /protocol response kept, see DataLoader.get_columns
+PROTOCOL_TVL_PATTERNS = ["chains.item", "tvl.item", "tokens.item", "tokensInUsd.item",
+                         "chainTvls.*.tvl.item", "chainTvls.*.tokens.item",
+                         "chainTvls.*.tokensInUsd.item"]
+
 
 class DeFiLlama(DataLoader):
     """This class is a wrapper around the DeFi Llama API
     """
+    # How long responses are cached when a cache is set
+    cache_ttls = [(r"api\.llama\.fi/tvl/", 60),
+                  (r"api\.llama\.fi/protocols", 600),
+                  (r"api\.llama\.fi/(protocol|charts)/", 600)]
 
     def __init__(self):
         messari_to_dl_dict = get_taxonomy_dict("messari_to_dl.json")
         DataLoader.__init__(self, api_dict=None, taxonomy_dict=messari_to_dl_dict)
+        self.tvl_store: Union[TVLStore, None] = None
+
+    def set_tvl_store(self, store: Union[TVLStore, None]) -> None:
+        """Sets a local store protocol TVL is synced into, get_protocol_tvl_timeseries
+        then only parses points newer than the stored ones & answers from the store
+
+        Parameters
+        ----------
+           store: TVLStore
+               Store to sync into, None requests & parses whole histories again
+        """
+        self.tvl_store = store
+
+    def sync_protocol_tvl(self, asset_slugs: Union[str, List]) -> pd.Series:
+        """Appends the TVL points of protocols newer than the store's watermarks to the
+        TVL store. DeFiLlama has no way to request part of a history so the whole
+        response is still downloaded, days before the protocol's oldest watermark are
+        dropped before parsing & only points from each series' watermark on are stored
+
+        Parameters
+        ----------
+           asset_slugs: str, list
+               Single asset slug string or list of asset slugs (i.e. bitcoin)
+
+        Returns
+        -------
+           Series
+               pandas Series of the number of points written per protocol
+        """
+        return self._sync_protocol_tvl(self.translate(asset_slugs))
+
+    def _sync_protocol_tvl(self, slugs: List[str]) -> pd.Series:
+        """sync_protocol_tvl for already translated slugs"""
+        if self.tvl_store is None:
+            raise ValueError("No TVL store is set, see set_tvl_store")
+
+        def get_slug_points(slug):
+            watermarks = self.tvl_store.watermarks(slug)
+            balances_df = self._get_protocol_balances(slug, oldest_watermark(watermarks))
+            return points_since(balances_to_points(balances_df), watermarks)
+
+        # stored once every response is parsed, async loaders replay this method
+        points_list = self.fan_out(get_slug_points, slugs)
+        written = {slug: self.tvl_store.append(slug, points)
+                   for slug, points in zip(slugs, points_list) if points is not None}
+        return pd.Series(written, dtype="int64")
 
     def get_protocol_tvl_timeseries(self, asset_slugs: Union[str, List],
                                     start_date: Union[str, datetime.datetime] = None,
-                                    end_date: Union[str, datetime.datetime] = None) -> pd.DataFrame:
+                                    end_date: Union[str, datetime.datetime] = None,
+                                    refresh: bool = True) -> pd.DataFrame:
         """Returns times TVL of a protocol with token amounts as a pandas DataFrame.
         Returned DataFrame is indexed by df[protocol][chain][asset].
 
@@ -47,6 +110,10 @@ class DeFiLlama(DataLoader):
            end_date: str, datetime.datetime
                Optional end date to set filter for tvl timeseries ("YYYY-MM-DD")
 
+           refresh: bool
+               With a TVL store set, sync the protocols before reading them from
+               the store, False answers from the store w/o requesting DeFiLlama
+
         Returns
         -------
            DataFrame
@@ -57,101 +124,220 @@ class DeFiLlama(DataLoader):
         """
         slugs = self.translate(asset_slugs)
 
-        slug_df_list: List = []
-        for slug in slugs:
-            endpoint_url = DL_GET_PROTOCOL_TVL_URL.substitute(slug=slug)
-            protocol = self.get_response(endpoint_url)
-
-            ###########################
-            # This portion is basically grabbing tvl metrics on a per chain basis
-
-            # TODO this is gonna be difficult
-            chain_tvls = protocol["chainTvls"]
-            chains = protocol["chains"]
-            chain_list = []
-            chain_df_list = []
-            for chain in chains:
-                chain_list.append(chain)
-
-                # get timeseries
-                chain_tvl = chain_tvls[chain]["tvl"]
-                chain_tvl_tokens = chain_tvls[chain]["tokens"]
-                chain_tvl_tokens_usd = chain_tvls[chain]["tokensInUsd"]
-
-                # convert tokens & tokensInUsd
-                for token in chain_tvl_tokens:
-                    for key, value in token["tokens"].items():
-                        token[key] = value
-                    token.pop("tokens", None)
-
-                for token in chain_tvl_tokens_usd:
-                    for key, value in token["tokens"].items():
-                        token[key] = value
-                    token.pop("tokens", None)
-
-                # convert to df
-                chain_tvl_df = pd.DataFrame(chain_tvl)
-                chain_tvl_tokens_df = pd.DataFrame(chain_tvl_tokens)
-                chain_tvl_tokens_usd_df = pd.DataFrame(chain_tvl_tokens_usd)
-
-                # fix indexes
-                chain_tvl_df = format_df(chain_tvl_df)
-                chain_tvl_tokens_df = format_df(chain_tvl_tokens_df)
-                chain_tvl_tokens_usd_df = format_df(chain_tvl_tokens_usd_df)
-                chain_tvl_tokens_usd_df = chain_tvl_tokens_usd_df.add_suffix("_usd")
-
-                # concat tokens and tokensInUsd
-                joint_tokens_df = pd.concat([chain_tvl_tokens_df, chain_tvl_tokens_usd_df], axis=1)
-                # Join total chain TVL w/ token TVL
-                chain_df = chain_tvl_df.join(joint_tokens_df)
-                chain_df_list.append(chain_df)
-
-            ###########################
-            # This portion is basically grabbing tvl metrics for all chains combined
-
-            ######################################
-            # Get protocol token balances
-
-            ## tokens in native amount
-            tokens = protocol["tokens"]
-            for token in tokens:
-                for key, value in token["tokens"].items():
-                    token[key] = value
-                token.pop("tokens", None)
-            tokens_df = pd.DataFrame(tokens)
-            tokens_df = format_df(tokens_df)
-
-            ## tokens in USD
-            tokens_usd = protocol["tokensInUsd"]
-            for token in tokens_usd:
-                for key, value in token["tokens"].items():
-                    token[key] = value
-                token.pop("tokens", None)
-            tokens_usd_df = pd.DataFrame(tokens_usd)
-            tokens_usd_df = format_df(tokens_usd_df)
-            tokens_usd_df = tokens_usd_df.add_suffix("_usd")
-
-            # Get total tvl across chains
-            tvl = protocol["tvl"]
-            total_tvl_df = pd.DataFrame(tvl)
-            total_tvl_df = format_df(total_tvl_df)
-
-            # Working
-            joint_tokens_df = pd.concat([tokens_df, tokens_usd_df], axis=1)
-            total_df = total_tvl_df.join(joint_tokens_df)
-
-            # Now create multi index
-            chain_list.append("all")
-            chain_df_list.append(total_df)
-
-            slug_df = pd.concat(chain_df_list, keys=chain_list, axis=1)
-            slug_df_list.append(slug_df)
-
-        total_slugs_df = pd.concat(slug_df_list, keys=slugs, axis=1)
-        total_slugs_df.sort_index(inplace=True)
-
-        total_slugs_df = time_filter_df(total_slugs_df, start_date=start_date, end_date=end_date)
-        return total_slugs_df
+        if self.tvl_store is not None:
+            if refresh:
+                self._sync_protocol_tvl(slugs)
+            points = self.tvl_store.read(
+                slugs, start_date=validate_datetime(start_date) if start_date else None,
+                end_date=validate_datetime(end_date) if end_date else None)
+            return points_to_df(points, long=self.output_format == "long")
+
+        def get_slug_points(slug):
+            points = balances_to_points(self._get_protocol_balances(slug))
+            points.insert(0, "slug", slug)
+            return points
+
+        points_list = [points for points in self.fan_out(get_slug_points, slugs)
+                       if points is not None]
+        points = pd.concat(points_list, ignore_index=True) if points_list \
+            else empty_points().assign(slug=pd.Series(dtype=object))
+        if start_date:
+            points = points[points["date"] >= pd.Timestamp(validate_datetime(start_date))]
+        if end_date:
+            points = points[points["date"] <= pd.Timestamp(validate_datetime(end_date))]
+        return points_to_df(points, long=self.output_format == "long")
+
+    def get_protocol_tvl_balances(self, asset_slugs: Union[str, List],
+                                  start_date: Union[str, datetime.datetime] = None,
+                                  end_date: Union[str, datetime.datetime] = None) -> pd.DataFrame:
+        """Returns the token balances behind get_protocol_tvl_timeseries as one table,
+        a row per protocol, date, chain & token
+
+        Parameters
+        ----------
+           asset_slugs: str, list
+               Single asset slug string or list of asset slugs (i.e. bitcoin)
+
+           start_date: str, datetime.datetime
+               Optional start date to set filter for tvl timeseries ("YYYY-MM-DD")
+
+           end_date: str, datetime.datetime
+               Optional end date to set filter for tvl timeseries ("YYYY-MM-DD")
+
+        Returns
+        -------
+           DataFrame
+               pandas DataFrame w/ slug, date, chain, token, amount & amount_usd columns,
+               chain='all' holds the totals across chains & token='totalLiquidityUSD'
+               the total TVL of a chain
+        """
+        slugs = self.translate(asset_slugs)
+        balances_list = self.fan_out(self._get_protocol_balances, slugs)
+        balances_df = stack_frames(balances_list, slugs, key_name="slug")
+        if start_date:
+            start = pd.Timestamp(validate_datetime(start_date))
+            balances_df = balances_df[balances_df["date"] >= start]
+        if end_date:
+            end = pd.Timestamp(validate_datetime(end_date))
+            balances_df = balances_df[balances_df["date"] <= end]
+        return balances_df
+
+    def get_protocol_tvl_bulk(self, asset_slugs: Union[str, List] = None, processes: int = None,
+                              progress: Callable[[int, int, str], None] = None) -> pd.DataFrame:
+        """Returns the get_protocol_tvl_balances table of many protocols at once, by
+        default of every protocol listed by get_protocols. Responses are fetched
+        concurrently & parsed in a process pool as they arrive, so a full pull
+        uses every core
+
+        Parameters
+        ----------
+           asset_slugs: str, list
+               Single asset slug string or list of asset slugs, None pulls every protocol
+
+           processes: int
+               Worker processes parsing responses, defaults to the number of cores
+
+           progress: Callable
+               Called w/ (protocols done, protocols total, slug) as each protocol completes
+
+        Returns
+        -------
+           DataFrame
+               pandas DataFrame w/ slug, date, chain, token, amount & amount_usd columns
+        """
+        return self._get_protocol_tvl_bulk(self._bulk_slugs(asset_slugs), processes, progress)
+
+    def sync_protocol_tvl_bulk(self, asset_slugs: Union[str, List] = None, processes: int = None,
+                               progress: Callable[[int, int, str], None] = None) -> pd.Series:
+        """sync_protocol_tvl for many protocols at once, by default every protocol
+        listed by get_protocols. Responses are fetched concurrently, parsed in a
+        process pool & written to the TVL store as each protocol completes
+
+        Parameters
+        ----------
+           asset_slugs: str, list
+               Single asset slug string or list of asset slugs, None syncs every protocol
+
+           processes: int
+               Worker processes parsing responses, defaults to the number of cores
+
+           progress: Callable
+               Called w/ (protocols done, protocols total, slug) as each protocol completes
+
+        Returns
+        -------
+           Series
+               pandas Series of the number of points written per protocol
+        """
+        return self._sync_protocol_tvl_bulk(self._bulk_slugs(asset_slugs), processes, progress)
+
+    def _bulk_slugs(self, asset_slugs: Union[str, List, None]) -> List[str]:
+        """Translated slugs of a bulk pull, every listed protocol for None"""
+        if asset_slugs is None:
+            return list(self.get_protocols().columns)
+        return self.translate(asset_slugs)
+
+    def _get_protocol_tvl_bulk(self, slugs: List[str], processes: Union[int, None],
+                               progress: Union[Callable, None]) -> pd.DataFrame:
+        """get_protocol_tvl_bulk for already resolved slugs"""
+        balances: Dict[str, pd.DataFrame] = {}
+
+        def add_balances(slug, balances_df):
+            balances[slug] = balances_df
+
+        with self.errors_scope():
+            self._bulk_balances(slugs, add_balances, processes, progress)
+        return stack_frames([balances.get(slug) for slug in slugs], slugs, key_name="slug")
+
+    def _sync_protocol_tvl_bulk(self, slugs: List[str], processes: Union[int, None],
+                                progress: Union[Callable, None]) -> pd.Series:
+        """sync_protocol_tvl_bulk for already resolved slugs"""
+        if self.tvl_store is None:
+            raise ValueError("No TVL store is set, see set_tvl_store")
+        written: Dict[str, int] = {}
+        # read before a protocol is parsed, the worker drops the days already stored
+        watermarks: Dict[str, Dict] = {}
+
+        def start_date(slug):
+            watermarks[slug] = self.tvl_store.watermarks(slug)
+            return oldest_watermark(watermarks[slug])
+
+        def store_balances(slug, balances_df):
+            points = points_since(balances_to_points(balances_df), watermarks.pop(slug))
+            written[slug] = self.tvl_store.append(slug, points)
+
+        with self.errors_scope():
+            self._bulk_balances(slugs, store_balances, processes, progress, start_date)
+        return pd.Series({slug: written[slug] for slug in slugs if slug in written}, dtype="int64")
+
+    def _bulk_balances(self, slugs: List[str], sink: Callable[[str, pd.DataFrame], None],
+                       processes: Union[int, None], progress: Union[Callable, None],
+                       start_date: Callable[[str], Union[pd.Timestamp, None]] = None) -> None:
+        """Fetches protocols on the executor & parses them in a process pool, sink is
+        called from this thread w/ each protocol's balances in order of completion.
+        Fetches are only started while fewer than max_workers + 2 * processes
+        protocols are in flight, so bodies waiting to be parsed don't pile up.
+        start_date, called as a protocol's parse is submitted, returns the first
+        day to parse. Errors are raised or collected like fan_out's
+        """
+        processes = processes or os.cpu_count() or 1
+        max_in_flight = self.max_workers + 2 * processes
+        pending_slugs = iter(slugs)
+        fetches: Dict[Future, str] = {}
+        parses: Dict[Future, str] = {}
+        done_count = 0
+
+        with ProcessPoolExecutor(processes) as pool:
+            try:
+                while True:
+                    while len(fetches) + len(parses) < max_in_flight:
+                        slug = next(pending_slugs, None)
+                        if slug is None:
+                            break
+                        endpoint_url = DL_GET_PROTOCOL_TVL_URL.substitute(slug=slug)
+                        fetches[self._submit_content(endpoint_url)] = slug
+                    if not fetches and not parses:
+                        return
+
+                    finished, _ = wait(list(fetches) + list(parses), return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        if future in fetches:
+                            slug = fetches.pop(future)
+                            content = self._bulk_result(future, slug)
+                            if content is not None:
+                                since = None if start_date is None else start_date(slug)
+                                parses[pool.submit(parse_protocol, content,
+                                                   PROTOCOL_TVL_PATTERNS, since)] = slug
+                                continue
+                        else:
+                            slug = parses.pop(future)
+                            balances_df = self._bulk_result(future, slug)
+                            if balances_df is not None:
+                                sink(slug, balances_df)
+                        done_count += 1
+                        if progress is not None:
+                            progress(done_count, len(slugs), slug)
+            except BaseException:
+                for future in fetches:
+                    future.cancel()
+                pool.shutdown(cancel_futures=True)
+                raise
+
+    def _submit_content(self, endpoint_url: str) -> Future:
+        """Starts fetching a response body on the executor"""
+        return self._get_executor().submit(self.get_content, endpoint_url)
+
+    def _bulk_result(self, future: Future, slug: str) -> Any:
+        """Result of a bulk fetch or parse, None if it failed & fail_fast is off"""
+        return self._fan_out_call(lambda _: future.result(), slug, self.fail_fast)
+
+    def _get_protocol_balances(self, slug: str,
+                               start_date: pd.Timestamp = None) -> pd.DataFrame:
+        """A protocol's TVL history as one table, see helpers.normalize_protocol"""
+        endpoint_url = DL_GET_PROTOCOL_TVL_URL.substitute(slug=slug)
+        # Only the timeseries are kept, large responses can be streamed w/ set_stream_threshold
+        return normalize_protocol(self.get_columns(endpoint_url, PROTOCOL_TVL_PATTERNS),
+                                  start_date)
 
     def get_global_tvl_timeseries(self, start_date: Union[str, datetime.datetime] = None,
                                   end_date: Union[str, datetime.datetime] = None) -> pd.DataFrame:
@@ -170,8 +356,8 @@ class DeFiLlama(DataLoader):
            DataFrame
                DataFrame containing timeseries tvl data for every protocol
         """
-        global_tvl = self.get_response(DL_GLOBAL_TVL_URL)
-        global_tvl_df = pd.DataFrame(global_tvl)
+        global_tvl = self.get_columns(DL_GLOBAL_TVL_URL, ["item"])
+        global_tvl_df = global_tvl["item"].to_frame()
         global_tvl_df = format_df(global_tvl_df)
         global_tvl_df = time_filter_df(global_tvl_df, start_date=start_date, end_date=end_date)
         return global_tvl_df
@@ -199,17 +385,18 @@ class DeFiLlama(DataLoader):
         """
         chains = validate_input(chains_in)
 
-        chain_df_list = []
-        for chain in chains:
+        def get_chain_df(chain):
             endpoint_url = DL_CHAIN_TVL_URL.substitute(chain=chain)
-            response = self.get_response(endpoint_url)
-            chain_df = pd.DataFrame(response)
-            chain_df = format_df(chain_df)
-            chain_df_list.append(chain_df)
+            response = self.get_columns(endpoint_url, ["item"])
+            chain_df = response["item"].to_frame()
+            return format_df(chain_df)
+
+        chain_df_list = self.fan_out(get_chain_df, chains)
 
         # Join DataFrames from each chain & return
         chains_df = pd.concat(chain_df_list, axis=1)
-        chains_df.columns = chains
+        chains_df.columns = [chain for chain, chain_df in zip(chains, chain_df_list)
+                             if chain_df is not None]
         chains_df = time_filter_df(chains_df, start_date=start_date, end_date=end_date)
         return chains_df
 
@@ -228,13 +415,15 @@ class DeFiLlama(DataLoader):
         """
         slugs = validate_input(asset_slugs)
 
-        tvl_dict = {}
-        for slug in slugs:
+        def get_tvl(slug):
             endpoint_url = DL_CURRENT_PROTOCOL_TVL_URL.substitute(slug=slug)
-            tvl = self.get_response(endpoint_url)
+            return self.get_response(endpoint_url)
+
+        tvl_dict = {}
+        for slug, tvl in zip(slugs, self.fan_out(get_tvl, slugs)):
             if isinstance(tvl, float):
                 tvl_dict[slug] = tvl
-            else:
+            elif tvl is not None:
                 print(f"ERROR: slug={slug}, MESSAGE: {tvl['message']}")
 
         tvl_series = pd.Series(tvl_dict)
@@ -258,3 +447,52 @@ class DeFiLlama(DataLoader):
 
         protocols_df = pd.DataFrame(protocol_dict)
         return protocols_df
+
+
+class AsyncDeFiLlama(AsyncDataLoader, DeFiLlama):
+    """This class is an asyncio wrapper around the DeFi Llama API,
+    every public DeFiLlama method is a coroutine
+    """
+    _bulk_loop = None
+
+    # coroutine override of the sync method, see AsyncDataLoader
+    async def get_protocol_tvl_bulk(  # pylint: disable=invalid-overridden-method
+            self, asset_slugs: Union[str, List] = None, processes: int = None,
+            progress: Callable[[int, int, str], None] = None) -> pd.DataFrame:
+        """DeFiLlama.get_protocol_tvl_bulk, fetches are made on this loader's connector
+        while the pipeline waits on them in a thread"""
+        slugs = await self._async_bulk_slugs(asset_slugs)
+        # the thread runs in a copy of this context, it collects errors in this scope
+        with self.errors_scope():
+            return await asyncio.to_thread(self._get_protocol_tvl_bulk, slugs, processes,
+                                           progress)
+
+    # coroutine override of the sync method, see AsyncDataLoader
+    async def sync_protocol_tvl_bulk(  # pylint: disable=invalid-overridden-method
+            self, asset_slugs: Union[str, List] = None, processes: int = None,
+            progress: Callable[[int, int, str], None] = None) -> pd.Series:
+        """DeFiLlama.sync_protocol_tvl_bulk, fetches are made on this loader's connector
+        while the pipeline waits on them in a thread"""
+        slugs = await self._async_bulk_slugs(asset_slugs)
+        with self.errors_scope():
+            return await asyncio.to_thread(self._sync_protocol_tvl_bulk, slugs, processes,
+                                           progress)
+
+    async def _async_bulk_slugs(self, asset_slugs: Union[str, List, None]) -> List[str]:
+        """_bulk_slugs w/ get_protocols awaited, remembers the loop fetches are sent on"""
+        self._bulk_loop = asyncio.get_running_loop()
+        if asset_slugs is None:
+            return list((await self.get_protocols()).columns)
+        return self.translate(asset_slugs)
+
+    def _submit_content(self, endpoint_url: str) -> Future:
+        """Starts fetching a response body on the event loop, from the pipeline's thread"""
+        return asyncio.run_coroutine_threadsafe(self._fetch_or_raise(endpoint_url),
+                                                self._bulk_loop)
+
+    async def _fetch_or_raise(self, endpoint_url: str) -> bytes:
+        """_fetch raising the errors it returns"""
+        content = await self._fetch(endpoint_url, (), ())
+        if isinstance(content, Exception):
+            raise content
+        return content
@@ -1,8 +1,18 @@
 """This module is dedicated to helpers for the DeFiLlama class"""
 
 
+import itertools
+from typing import Dict, List, Union
+
+import numpy as np
 import pandas as pd
 
+from messari.jsonbackend import get_json_loads
+from messari.streaming import ColumnBuffer, select_columns
+
+# Token of the rows holding a chain's total TVL
+TVL_ASSET = 'totalLiquidityUSD'
+
 
 def format_df(df_in: pd.DataFrame) -> pd.DataFrame:
     """format a typical DF from DL, replace date & drop duplicates
@@ -31,3 +41,280 @@ def format_df(df_in: pd.DataFrame) -> pd.DataFrame:
     # TODO: Investigate which data should be kept (currently assuming last is more recent
     df_new = df_new[~df_new.index.duplicated(keep='last')]
     return df_new
+
+
+def normalize_protocol(protocol: Dict[str, ColumnBuffer],
+                       start_date: pd.Timestamp = None) -> pd.DataFrame:
+    """Flattens the columns of a /protocol response into one table of token balances,
+    every chain & token in one pass w/o building a frame per chain
+
+    The chain's total TVL is the row of token 'totalLiquidityUSD' w/ only
+    amount_usd set, chain 'all' holds the protocol totals across chains
+
+    Parameters
+    ----------
+       protocol: dict
+           ColumnBuffer per prefix of PROTOCOL_TVL_PATTERNS, items not flattened
+       start_date: pd.Timestamp
+           Optional first day to keep, items of earlier days are dropped before
+           their tokens are flattened
+
+    Returns
+    -------
+       DataFrame
+           pandas DataFrame w/ date, chain, token, amount & amount_usd columns,
+           sorted by chain, token (in order of appearance) & date
+    """
+    chains = protocol['chains.item'].to_list() if 'chains.item' in protocol else []
+    prefixes = [f'chainTvls.{chain}.' for chain in chains] + ['']
+    chains = chains + ['all']
+
+    # (chain code, token, date, amount, amount_usd) parts, tokens are factorized at the end
+    chain_parts, token_parts, date_parts, amount_parts, usd_parts = [], [], [], [], []
+
+    start_day = None if start_date is None else int(pd.Timestamp(start_date).timestamp()) // 86400
+
+    def item_rows(buffer):
+        """Dates of a buffer's items & the rows to keep, None keeps every row"""
+        dates = np.asarray(buffer.columns['date'], dtype='int64')
+        if start_day is None:
+            return dates, None
+        rows = np.flatnonzero(dates // 86400 >= start_day)
+        return dates[rows], rows
+
+    def add_part(chain_code, tokens, dates, amounts, usd_amounts):
+        if len(dates) == 0:
+            return
+        chain_parts.append(np.full(len(dates), chain_code, dtype='int64'))
+        token_parts.append(tokens)
+        date_parts.append(dates)
+        amount_parts.append(amounts)
+        usd_parts.append(usd_amounts)
+
+    for chain_code, prefix in enumerate(prefixes):
+        tvl = protocol.get(prefix + 'tvl.item')
+        if tvl is not None and 'date' in tvl.columns and TVL_ASSET in tvl.columns:
+            dates, rows = item_rows(tvl)
+            usd_amounts = np.asarray(tvl.columns[TVL_ASSET], dtype='float64')
+            add_part(chain_code, np.full(len(dates), TVL_ASSET, dtype=object), dates,
+                     np.full(len(dates), np.nan),
+                     usd_amounts if rows is None else usd_amounts[rows])
+
+        for kind in ('tokens', 'tokensInUsd'):
+            buffer = protocol.get(f'{prefix}{kind}.item')
+            if buffer is None or 'tokens' not in buffer.columns:
+                continue
+            item_dates, rows = item_rows(buffer)
+            items = buffer.columns['tokens']
+            if rows is not None:
+                items = [items[row] for row in rows]
+            balances = [item or {} for item in items]
+            counts = np.fromiter(map(len, balances), dtype='int64', count=len(balances))
+            tokens = np.fromiter(itertools.chain.from_iterable(map(dict.keys, balances)),
+                                 dtype=object, count=counts.sum())
+            values = np.fromiter(itertools.chain.from_iterable(map(dict.values, balances)),
+                                 dtype='float64', count=counts.sum())
+            dates = np.repeat(item_dates, counts)
+            nans = np.full(len(values), np.nan)
+            if kind == 'tokens':
+                add_part(chain_code, tokens, dates, values, nans)
+            else:
+                add_part(chain_code, tokens, dates, nans, values)
+
+    if not date_parts:
+        return pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'),
+                             'chain': pd.Categorical([], categories=chains),
+                             'token': pd.Categorical([]),
+                             'amount': pd.Series(dtype='float64'),
+                             'amount_usd': pd.Series(dtype='float64')})
+
+    token_codes, token_names = pd.factorize(np.concatenate(token_parts))
+    # NOTE: like format_df, timestamps are truncated to their day
+    days = np.concatenate(date_parts) // 86400
+    first_day = days.min()
+    day_count = days.max() - first_day + 1
+    # one int key per (chain, token, date), sorting keys sorts by all three
+    keys = (np.concatenate(chain_parts) * len(token_names) + token_codes) * day_count \
+        + (days - first_day)
+    amounts, usd_amounts = np.concatenate(amount_parts), np.concatenate(usd_parts)
+    has_amount, has_usd = ~np.isnan(amounts), ~np.isnan(usd_amounts)
+    # sorting beats np.unique's hash table on keys this spread out
+    unique_keys = np.sort(keys)
+    unique_keys = unique_keys[np.r_[True, unique_keys[1:] != unique_keys[:-1]]]
+
+    def align(rows):
+        """Values of rows at their key's position, the last of duplicate dates is kept"""
+        order = rows[np.argsort(keys[rows], kind='stable')]
+        sorted_keys = keys[order]
+        last = order[np.r_[sorted_keys[1:] != sorted_keys[:-1], True]]
+        aligned = np.full(len(unique_keys), np.nan)
+        aligned[np.searchsorted(unique_keys, keys[last])] = \
+            np.where(has_amount[last], amounts[last], usd_amounts[last])
+        return aligned
+
+    series_keys, day_offsets = np.divmod(unique_keys, day_count)
+    chain_codes, token_codes = np.divmod(series_keys, len(token_names))
+    dates = ((day_offsets + first_day) * 86400).astype('datetime64[s]')
+    return pd.DataFrame({
+        'date': dates.astype('datetime64[ns]'),
+        'chain': pd.Categorical.from_codes(chain_codes, categories=chains),
+        'token': pd.Categorical.from_codes(token_codes, categories=token_names),
+        'amount': align(np.flatnonzero(has_amount)),
+        'amount_usd': align(np.flatnonzero(has_usd))})
+
+
+def parse_protocol(content: bytes, patterns: List[str],
+                   start_date: pd.Timestamp = None) -> pd.DataFrame:
+    """normalize_protocol for a whole /protocol response body, run in the worker
+    processes of bulk pulls. The body is already in memory so it's decoded
+    whole, which is faster than streaming it
+
+    Parameters
+    ----------
+       content: bytes
+           Response body
+       patterns: list
+           Prefixes of the timeseries, see PROTOCOL_TVL_PATTERNS
+       start_date: pd.Timestamp
+           Optional first day to keep, see normalize_protocol
+
+    Returns
+    -------
+       DataFrame
+           pandas DataFrame w/ date, chain, token, amount & amount_usd columns
+    """
+    return normalize_protocol(select_columns(get_json_loads()(content), patterns), start_date)
+
+
+def balances_to_points(balances_df: pd.DataFrame) -> pd.DataFrame:
+    """One row per (chain, asset, date) point of a table sorted like normalize_protocol's, assets
+    are named like the columns of get_protocol_tvl_timeseries (totalLiquidityUSD,
+    DAI, DAI_usd) & ordered like them: TVL, token amounts then USD amounts
+
+    Parameters
+    ----------
+       balances_df: pd.DataFrame
+           date, chain, token, amount & amount_usd columns, see normalize_protocol
+
+    Returns
+    -------
+       DataFrame
+           pandas DataFrame w/ chain, asset, date & value columns
+    """
+    chain_codes = balances_df['chain'].cat.codes.to_numpy()
+    token_codes = balances_df['token'].cat.codes.to_numpy()
+    token_names = np.asarray(balances_df['token'].cat.categories, dtype=object)
+    usd_names = np.asarray([name if name == TVL_ASSET else f'{name}_usd' for name in token_names],
+                           dtype=object)
+    amounts = balances_df['amount'].to_numpy()
+    usd_amounts = balances_df['amount_usd'].to_numpy()
+    has_amount, has_usd = ~np.isnan(amounts), ~np.isnan(usd_amounts)
+    is_tvl = token_names[token_codes] == TVL_ASSET
+
+    # kind 0 is the TVL, 1 token amounts & 2 USD amounts
+    rows = np.concatenate([np.flatnonzero(has_amount), np.flatnonzero(has_usd)])
+    kinds = np.concatenate([np.ones(has_amount.sum(), dtype='int64'),
+                            np.where(is_tvl[has_usd], 0, 2)])
+    # balances are sorted by chain, token & date so a stable sort by chain & kind is enough
+    order = np.argsort(chain_codes[rows] * 3 + kinds, kind='stable')
+    rows, kinds = rows[order], kinds[order]
+
+    names = np.where(kinds == 1, token_names[token_codes[rows]], usd_names[token_codes[rows]])
+    return pd.DataFrame({'chain': np.asarray(balances_df['chain'].cat.categories,
+                                             dtype=object)[chain_codes[rows]],
+                         'asset': names, 'date': balances_df['date'].to_numpy()[rows],
+                         'value': np.where(kinds == 1, amounts[rows], usd_amounts[rows])})
+
+
+def points_since(points: pd.DataFrame, watermarks: Dict) -> pd.DataFrame:
+    """Points from the watermark of their (chain, asset) series on,
+    every point of a series w/o a watermark is kept
+
+    Parameters
+    ----------
+       points: pd.DataFrame
+           chain, asset, date & value columns
+       watermarks: dict
+           Last stored date per (chain, asset), see TVLStore.watermarks
+
+    Returns
+    -------
+       DataFrame
+           pandas DataFrame of the points to store
+    """
+    if not watermarks or points.empty:
+        return points
+    marks = pd.Series(list(watermarks.values()),
+                      index=pd.MultiIndex.from_tuples(list(watermarks.keys())),
+                      dtype='datetime64[ns]')
+    point_marks = marks.reindex(pd.MultiIndex.from_arrays([points['chain'], points['asset']]))
+    point_marks = point_marks.to_numpy()
+    keep = np.isnat(point_marks) | (points['date'].to_numpy() >= point_marks)
+    return points[keep]
+
+
+def oldest_watermark(watermarks: Dict) -> Union[pd.Timestamp, None]:
+    """First day a refresh has to parse, every series is stored up to its watermark.
+    Series w/o a watermark, i.e. tokens first seen after the last sync, are only
+    parsed from this day on as well
+
+    Parameters
+    ----------
+       watermarks: dict
+           Last stored date per (chain, asset), see TVLStore.watermarks
+
+    Returns
+    -------
+       Timestamp
+           Oldest watermark, None if nothing is stored yet
+    """
+    return min(watermarks.values()) if watermarks else None
+
+
+def points_to_df(points: pd.DataFrame, long: bool = False) -> pd.DataFrame:
+    """Shapes points like get_protocol_tvl_timeseries, columns are ordered like the points
+
+    Parameters
+    ----------
+       points: pd.DataFrame
+           slug, chain, asset, date & value columns, see TVLStore.read
+       long: bool
+           One row per slug, chain & date w/ a column per asset instead of
+           a column per (slug, chain, asset)
+
+    Returns
+    -------
+       DataFrame
+           pandas DataFrame indexed by date
+    """
+    # series & dates are numbered w/ int codes, pivoting the object columns is much slower
+    slug_codes, slugs = pd.factorize(points['slug'])
+    chain_codes, chains = pd.factorize(points['chain'])
+    asset_codes, assets = pd.factorize(points['asset'])
+    date_codes, dates = pd.factorize(points['date'], sort=True)
+    values = points['value'].to_numpy(dtype='float64')
+
+    if long:
+        row_codes, row_keys = pd.factorize((slug_codes * len(chains) + chain_codes) * len(dates)
+                                           + date_codes)
+        points_array = np.full((len(row_keys), len(assets)), np.nan)
+        points_array[row_codes, asset_codes] = values
+        row_series, row_dates = np.divmod(row_keys, len(dates))
+        row_slugs, row_chains = np.divmod(row_series, len(chains))
+        points_df = pd.DataFrame(points_array, columns=list(assets))
+        points_df.insert(0, 'chain', pd.Categorical.from_codes(row_chains, categories=chains))
+        points_df.insert(0, 'slug', pd.Categorical.from_codes(row_slugs, categories=slugs))
+        points_df.index = dates[row_dates].date
+        # by date like time_filter_df, then in slug & chain order
+        order = np.lexsort((row_chains, row_slugs, row_dates))
+        return points_df.iloc[order]
+
+    column_codes, column_keys = pd.factorize((slug_codes * len(chains) + chain_codes)
+                                             * len(assets) + asset_codes)
+    points_array = np.full((len(dates), len(column_keys)), np.nan)
+    points_array[date_codes, column_codes] = values
+    column_series, column_assets = np.divmod(column_keys, len(assets))
+    column_slugs, column_chains = np.divmod(column_series, len(chains))
+    columns = pd.MultiIndex.from_arrays([slugs[column_slugs], chains[column_chains],
+                                         assets[column_assets]])
+    return pd.DataFrame(points_array, index=dates.date, columns=columns)
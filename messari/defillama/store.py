@@ -0,0 +1,177 @@
+"""This module is meant to contain the TVLStore class, a local Parquet store
+of DeFiLlama protocol TVL series that DeFiLlama syncs incrementally"""
+
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Tuple, Union
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 pylint: disable=unused-import
+except ImportError:  # the store is optional, pandas writes Parquet through pyarrow
+    pyarrow = None
+
+DEFAULT_TVL_STORE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'messari', 'defillama_tvl')
+# Columns of the points kept per protocol, a series is one (chain, asset)
+POINT_COLUMNS = ['chain', 'asset', 'date', 'value']
+WATERMARKS_FILE = 'watermarks.json'
+
+
+def empty_points() -> pd.DataFrame:
+    """Points frame w/o rows, typed like the stored ones"""
+    return pd.DataFrame({'chain': pd.Series(dtype=object), 'asset': pd.Series(dtype=object),
+                         'date': pd.Series(dtype='datetime64[ns]'),
+                         'value': pd.Series(dtype='float64')})
+
+
+class TVLStore:
+    """Parquet backed store of protocol TVL series, one directory per protocol.
+
+    Each sync appends the points it parsed as a new Parquet part & moves the
+    watermark, the last date seen, of every (chain, asset) series it touched.
+    Watermarks are kept in a small JSON file per protocol so a refresh never
+    reads the stored history. Points are daily & the latest day keeps changing
+    until it's over, so the watermark day is synced again & the last written
+    point of a (chain, asset, date) wins. Parts are merged into one once a
+    protocol has more than max_parts.
+    """
+
+    def __init__(self, path: str = DEFAULT_TVL_STORE_PATH, max_parts: int = 24):
+        """
+        Parameters
+        ----------
+            path: str
+                Directory holding the store
+            max_parts: int
+                Parts a protocol can have before they're compacted
+        """
+        if pyarrow is None:
+            raise ImportError('TVLStore writes Parquet files, pip install pyarrow')
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.max_parts = max_parts
+        self._lock = threading.Lock()
+
+    def slugs(self) -> List[str]:
+        """Protocols w/ stored points"""
+        return sorted(unquote(name) for name in os.listdir(self.path)
+                      if os.path.isdir(os.path.join(self.path, name)))
+
+    def watermarks(self, slug: str) -> Dict[Tuple[str, str], pd.Timestamp]:
+        """Last stored date of each (chain, asset) series of a protocol"""
+        watermarks_path = os.path.join(self._slug_path(slug), WATERMARKS_FILE)
+        if not os.path.exists(watermarks_path):
+            return {}
+        with open(watermarks_path, 'r', encoding='utf-8') as file:
+            stored = json.load(file)
+        return {(chain, asset): pd.Timestamp(date) for chain, asset, date in stored}
+
+    def append(self, slug: str, points: pd.DataFrame) -> int:
+        """Stores new points of a protocol & moves its watermarks
+
+        :param slug: str
+            DeFiLlama protocol slug
+        :param points: pandas DataFrame
+            chain, asset, date & value columns
+        :return: number of points written
+        """
+        if points.empty:
+            return 0
+        points = points[POINT_COLUMNS].reset_index(drop=True)
+        slug_path = self._slug_path(slug)
+        with self._lock:
+            os.makedirs(slug_path, exist_ok=True)
+            points.to_parquet(os.path.join(slug_path, f'{time.time_ns():020d}.parquet'),
+                              index=False)
+
+            # the part is written first, a crash in between only means a day is synced twice
+            watermarks = self.watermarks(slug)
+            latest = points.groupby(['chain', 'asset'], sort=False)['date'].max()
+            for series, date in latest.items():
+                if series not in watermarks or date > watermarks[series]:
+                    watermarks[series] = date
+            stored = [[chain, asset, date.isoformat()]
+                      for (chain, asset), date in watermarks.items()]
+            watermarks_path = os.path.join(slug_path, WATERMARKS_FILE)
+            with open(watermarks_path + '.tmp', 'w', encoding='utf-8') as file:
+                json.dump(stored, file)
+            os.replace(watermarks_path + '.tmp', watermarks_path)
+
+            if len(self._part_paths(slug)) > self.max_parts:
+                self._compact(slug)
+        return len(points)
+
+    def read(self, slugs: Union[str, List[str]] = None, start_date: pd.Timestamp = None,
+             end_date: pd.Timestamp = None) -> pd.DataFrame:
+        """Stored points of protocols, the latest written point of each series & day
+
+        :param slugs: str, list
+            Protocols to read, None reads every stored protocol
+        :param start_date: datetime
+            Optional first date to return
+        :param end_date: datetime
+            Optional last date to return
+        :return: pandas DataFrame w/ slug, chain, asset, date & value columns
+        """
+        if slugs is None:
+            slugs = self.slugs()
+        elif isinstance(slugs, str):
+            slugs = [slugs]
+        filters = []
+        if start_date is not None:
+            filters.append(('date', '>=', pd.Timestamp(start_date)))
+        if end_date is not None:
+            filters.append(('date', '<=', pd.Timestamp(end_date)))
+
+        slug_points = []
+        for slug in slugs:
+            with self._lock:
+                points = self._read_parts(slug, filters or None)
+            points.insert(0, 'slug', slug)
+            slug_points.append(points)
+        if not slug_points:
+            return empty_points().assign(slug=pd.Series(dtype=object))[['slug'] + POINT_COLUMNS]
+        return pd.concat(slug_points, ignore_index=True)
+
+    def compact(self, slug: str) -> None:
+        """Merges the parts of a protocol into one, dropping points written over since"""
+        with self._lock:
+            self._compact(slug)
+
+    def _compact(self, slug: str) -> None:
+        """compact w/o taking the lock, caller holds it"""
+        part_paths = self._part_paths(slug)
+        if len(part_paths) < 2:
+            return
+        points = self._read_parts(slug)
+        points.to_parquet(os.path.join(self._slug_path(slug), f'{time.time_ns():020d}.parquet'),
+                          index=False)
+        for part_path in part_paths:
+            os.remove(part_path)
+
+    def _read_parts(self, slug: str, filters: List = None) -> pd.DataFrame:
+        """Points of every part of a protocol, later parts overwrite earlier ones"""
+        parts = [pd.read_parquet(part_path, filters=filters)
+                 for part_path in self._part_paths(slug)]
+        if not parts:
+            return empty_points()
+        points = pd.concat(parts, ignore_index=True)
+        points = points[~points.duplicated(['chain', 'asset', 'date'], keep='last')]
+        return points.sort_values(['chain', 'asset', 'date'], kind='mergesort', ignore_index=True)
+
+    def _part_paths(self, slug: str) -> List[str]:
+        """Parquet parts of a protocol, oldest first"""
+        slug_path = self._slug_path(slug)
+        if not os.path.isdir(slug_path):
+            return []
+        return [os.path.join(slug_path, name) for name in sorted(os.listdir(slug_path))
+                if name.endswith('.parquet')]
+
+    def _slug_path(self, slug: str) -> str:
+        """Directory of a protocol, slugs are quoted to stay single path components"""
+        return os.path.join(self.path, quote(slug, safe=''))
@@ -2,3 +2,6 @@
 
 
 from .eventmonitor import *
+from .dedup import SeenEvents, RollingBloomFilter
+from .store import SyncStore
+from .subscription import HeadSubscription
@@ -0,0 +1,140 @@
+"""This module is meant to contain the EventDecoder class, decoding logs straight
+from their topics & data w/o fetching transaction receipts"""
+
+
+import json
+from typing import Dict, List, Tuple, Union
+
+from eth_utils import keccak, to_checksum_address
+
+try:
+    from eth_abi import decode as abi_decode
+except ImportError:  # eth-abi renamed decode_abi to decode
+    from eth_abi import decode_abi as abi_decode
+
+# indexed values of these types are logged as the keccak of their encoding
+DYNAMIC_TYPES = ('string', 'bytes')
+
+
+def abi_type(abi_input: Dict) -> str:
+    """Canonical type of an ABI input, tuples are expanded into their components"""
+    input_type = abi_input['type']
+    if input_type.startswith('tuple'):
+        components = ','.join(abi_type(component) for component in abi_input['components'])
+        return f'({components}){input_type[len("tuple"):]}'
+    return input_type
+
+
+def to_bytes(value: Union[bytes, str]) -> bytes:
+    """Bytes of a topic or log data, older web3 returns data as a hex str"""
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+    return bytes(value)
+
+
+def normalize_value(abi_input: Dict, value):
+    """Decoded value as web3 returns it, addresses are checksummed"""
+    input_type = abi_input['type']
+    if input_type.endswith(']'):
+        item_input = dict(abi_input, type=input_type[:input_type.rindex('[')])
+        return [normalize_value(item_input, item) for item in value]
+    if input_type == 'address':
+        return to_checksum_address(value)
+    if input_type == 'tuple':
+        return tuple(normalize_value(component, item)
+                     for component, item in zip(abi_input['components'], value))
+    return value
+
+
+class EventDecoder:
+    """Decoder of one event of a contract ABI, built once & reused for every log.
+
+    Indexed arguments are decoded from topics[1:], the rest from data. Indexed
+    strings, bytes, arrays & tuples are only logged as their keccak hash, which
+    is returned as is.
+    """
+
+    def __init__(self, event_abi: Dict):
+        """
+        Parameters
+        ----------
+            event_abi: dict
+                ABI entry of the event
+        """
+        self.name = event_abi['name']
+        self.inputs = event_abi['inputs']
+        self.signature = f'{self.name}({",".join(abi_type(item) for item in self.inputs)})'
+        self.topic = keccak(text=self.signature)
+
+        self.indexed = [item for item in self.inputs if item.get('indexed')]
+        self.indexed_types = [abi_type(item) for item in self.indexed]
+        self.hashed = [item_type in DYNAMIC_TYPES or item_type.endswith(']')
+                       or item_type.startswith('(') for item_type in self.indexed_types]
+        self.data_inputs = [item for item in self.inputs if not item.get('indexed')]
+        self.data_types = [abi_type(item) for item in self.data_inputs]
+
+    def decode_args(self, topics: List, data: Union[bytes, str]) -> Dict:
+        """Event arguments in ABI order
+
+        :param topics: list
+            Log topics, the event topic first
+        :param data: bytes, str
+            Log data
+        :return: dict of argument name to value
+        :raises ValueError if the log has a different number of indexed arguments
+        """
+        if len(topics) != len(self.indexed) + 1:
+            raise ValueError(f'{self.signature} has {len(self.indexed)} indexed arguments, '
+                             f'log has {len(topics) - 1}')
+        values = {}
+        for item, item_type, hashed, topic in zip(self.indexed, self.indexed_types,
+                                                  self.hashed, topics[1:]):
+            topic = to_bytes(topic)
+            values[item['name']] = topic if hashed else \
+                normalize_value(item, abi_decode([item_type], topic)[0])
+        decoded = abi_decode(self.data_types, to_bytes(data)) if self.data_types else ()
+        for item, value in zip(self.data_inputs, decoded):
+            values[item['name']] = normalize_value(item, value)
+        return {item['name']: values[item['name']] for item in self.inputs}
+
+    def decode(self, log) -> Dict:
+        """Event dict of a log, as EventMonitor keeps them
+
+        :param log: AttributeDict
+            Log entry as returned by an eth filter or eth_getLogs
+        :return: dict w/ args, event, transaction, log_index, transaction_index,
+            address, block_number & block
+        """
+        return {'args': self.decode_args(log['topics'], log['data']),
+                'event': self.name,
+                'transaction': '0x' + to_bytes(log['transactionHash']).hex(),
+                'log_index': log['logIndex'],
+                'transaction_index': log['transactionIndex'],
+                'address': log['address'],
+                'block_number': log['blockNumber'],
+                'block': '0x' + to_bytes(log['blockHash']).hex()}
+
+
+def build_event_decoders(abis_dict: Dict,
+                         event_names: List[str] = None) -> Dict[Tuple[str, bytes], EventDecoder]:
+    """Decoders of every (contract, event topic) to monitor
+
+    :param abis_dict: dict
+        Contract address to ABI, as a JSON str or a list
+    :param event_names: list
+        Only build decoders for these events, None builds every event
+    :return: dict of (address, topic bytes) to EventDecoder
+    """
+    decoders = {}
+    for address, contract_abi in abis_dict.items():
+        if isinstance(contract_abi, str):
+            contract_abi = json.loads(contract_abi)
+        for entry in contract_abi:
+            # anonymous events don't log their topic & can't be told apart
+            if entry['type'] != 'event' or entry.get('anonymous'):
+                continue
+            if event_names is not None and entry['name'] not in event_names:
+                continue
+            decoder = EventDecoder(entry)
+            decoders[(address, decoder.topic)] = decoder
+    return decoders
@@ -0,0 +1,153 @@
+"""This module is meant to contain the seen-event indexes EventMonitor dedups events with"""
+
+
+import hashlib
+import heapq
+import math
+import sys
+from typing import Dict, List, Union
+
+
+def event_key(event) -> bytes:
+    """Key uniquely identifying an event, its transaction hash & log index
+
+    :param event: AttributeDict
+        Log entry as returned by an eth filter
+    :return: bytes key
+    """
+    return bytes(event['transactionHash']) + int(event['logIndex']).to_bytes(4, 'big')
+
+
+class SeenEvents:
+    """Hash set of handled events, lookups & inserts are O(1).
+
+    With max_blocks set, keys of events more than max_blocks below the highest
+    block seen are pruned, keeping the set bounded while monitoring. Reorgs &
+    re-delivered filter entries land near the chain head, so a window of a few
+    hundred blocks catches them. Without max_blocks every key is kept, which a
+    full historical sync needs to never handle an event twice.
+    """
+
+    def __init__(self, max_blocks: Union[int, None] = None):
+        """
+        Parameters
+        ----------
+            max_blocks: int
+                Blocks below the highest one seen to keep keys for, None keeps all
+        """
+        self.max_blocks = max_blocks
+        self.keys = set()
+        self.lookups = 0
+        self.hits = 0
+        self.highest_block = -1
+        # (block_number, key) of kept keys, only filled when pruning
+        self._blocks: List = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def contains(self, key: bytes) -> bool:
+        """True if the event was seen, counted in the hit rate"""
+        self.lookups += 1
+        if key in self.keys:
+            self.hits += 1
+            return True
+        return False
+
+    def add(self, key: bytes, block_number: int) -> None:
+        """Marks an event as seen & prunes keys that fell out of the window"""
+        self.keys.add(key)
+        if self.max_blocks is None:
+            return
+        heapq.heappush(self._blocks, (block_number, key))
+        self.highest_block = max(self.highest_block, block_number)
+        horizon = self.highest_block - self.max_blocks
+        while self._blocks[0][0] < horizon:
+            self.keys.discard(heapq.heappop(self._blocks)[1])
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the keys & the set itself"""
+        size = sys.getsizeof(self.keys) + sum(sys.getsizeof(key) for key in self.keys)
+        if self._blocks:
+            # the heap's tuples & ints, the keys are shared w/ the set
+            size += sys.getsizeof(self._blocks) + len(self._blocks) * (
+                sys.getsizeof((0, b'')) + sys.getsizeof(self.highest_block))
+        return size
+
+    def stats(self) -> Dict:
+        """Size, memory footprint & hit rate of the index"""
+        return {'index': type(self).__name__,
+                'size': len(self),
+                'memory_bytes': self.memory_bytes(),
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'hit_rate': self.hits / self.lookups if self.lookups else 0.0}
+
+
+class RollingBloomFilter(SeenEvents):
+    """Fixed size probabilistic index of handled events.
+
+    Two Bloom filters are kept, each sized for capacity keys at error_rate.
+    Keys are added to the newer one & looked up in both. Once the newer one
+    holds capacity keys the older one is dropped, so at least the last
+    capacity keys are always remembered in 2 * bits of memory. A false
+    positive drops a new event as a repeat, at most error_rate of the time.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-6):
+        """
+        Parameters
+        ----------
+            capacity: int
+                Keys remembered per generation
+            error_rate: float
+                False positive rate of a full generation
+        """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError('capacity should be positive & error_rate between 0 & 1')
+        SeenEvents.__init__(self)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._current = bytearray((self.bits + 7) // 8)
+        self._previous = bytearray(len(self._current))
+        self._current_count = 0
+        self._previous_count = 0
+
+    def __len__(self) -> int:
+        return self._current_count + self._previous_count
+
+    def _positions(self, key: bytes) -> List[int]:
+        """Bit positions of a key, double hashing one 128 bit digest"""
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    @staticmethod
+    def _test(bits: bytearray, positions: List[int]) -> bool:
+        """True if every position is set"""
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def contains(self, key: bytes) -> bool:
+        """True if the event was probably seen, counted in the hit rate"""
+        self.lookups += 1
+        positions = self._positions(key)
+        if self._test(self._current, positions) or self._test(self._previous, positions):
+            self.hits += 1
+            return True
+        return False
+
+    def add(self, key: bytes, block_number: int = None) -> None:
+        """Marks an event as seen, rolling generations once the newer one is full"""
+        if self._current_count >= self.capacity:
+            self._previous, self._current = self._current, bytearray(len(self._current))
+            self._previous_count, self._current_count = self._current_count, 0
+        for position in self._positions(key):
+            self._current[position >> 3] |= 1 << (position & 7)
+        self._current_count += 1
+
+    def memory_bytes(self) -> int:
+        """Bytes held by both generations"""
+        return sys.getsizeof(self._current) + sys.getsizeof(self._previous)
@@ -4,15 +4,29 @@ import time
 import logging
 import queue
 import threading
-from typing import Union, List
+from typing import Dict, NamedTuple, Union, List
 import pandas as pd
 
 from web3 import Web3
-from web3.logs import DISCARD
 
 from messari.blockexplorers import Scanner
 from messari.utils import validate_input
 from .helpers import validate_checksum, build_contract_events
+from .dedup import SeenEvents, event_key
+from .decoding import build_event_decoders, to_bytes
+from .sync import LogSyncer, group_contracts
+from .store import SyncStore, synced_until
+from .subscription import HeadSubscription
+
+# queued to wake the handler up when it's stopped
+_WAKE = object()
+
+
+class _DecodedLog(NamedTuple):
+    """Log queued by a checkpointed sync w/ the event dict it already decoded"""
+    log: Dict
+    event_dict: Union[Dict, None]
+
 
 #################
 class EventMonitor:
@@ -22,7 +36,9 @@ class EventMonitor:
     def __init__(self, contracts_in: Union[str, List],
                  explorer: Scanner,
                  rpc_url: str,
-                 event_names: Union[str, List]=None):
+                 event_names: Union[str, List]=None,
+                 seen_events: SeenEvents=None,
+                 ws_url: str=None):
 
 
         # More web3 setup
@@ -66,13 +82,16 @@ class EventMonitor:
         else:
             self.event_filters = [self.w3.eth.filter({'address': contract}) for contract in self.contracts] # pylint: disable=line-too-long
 
+        # decoders of every monitored (contract, event topic), built once for all logs
+        self.decoders = build_event_decoders(self.abis_dict, getattr(self, 'event_names', None))
+
 
 
 
         # internal list of handled events
         self.events_list = []
-        # list of tuples for uniquely identifiying events that have been processed or not
-        self.event_tuples = []
+        # index of (txn hash, log index) keys uniquely identifiying handled events
+        self.seen_events = seen_events if seen_events is not None else SeenEvents()
 
 
         ###################
@@ -81,6 +100,15 @@ class EventMonitor:
         # For sharing data across threads
         self.event_queue = queue.Queue()
 
+        # handler takes up to handler_batch_size events per wake up, the monitor polls
+        # filters every poll_interval seconds & right away on new heads if ws_url is set
+        self.handler_batch_size = 256
+        self.poll_interval = 2.0
+        self.monitor_wake = threading.Event()
+        self.head_subscription = None
+        if ws_url:
+            self.head_subscription = HeadSubscription(ws_url, lambda _: self.monitor_wake.set())
+
         # Unset flags to kill threads
         self.monitor_flag = False
         self.sync_flag = False
@@ -88,9 +116,18 @@ class EventMonitor:
 
         # threads
         self.monitor_thread = threading.Thread(target=self.monitor, args=())
-        self.sync_thread = threading.Thread(target=self.sync, args=())
+        self.sync_thread = threading.Thread(target=self.sync_top, args=())
         self.handler_thread = threading.Thread(target=self.event_handler, args=())
 
+        # sync engine, see set_sync_workers & set_sync_window
+        self.sync_workers = 4
+        self.sync_requests = None
+        self.sync_window = 2000
+        self.sync_max_window = None
+        self.sync_addresses = 25
+        # optional checkpoints syncs resume from, see set_sync_store
+        self.sync_store = None
+
     ##########################
     # HELPERS
     ##########################
@@ -124,6 +161,17 @@ class EventMonitor:
         """
         return self.contracts_df
 
+    def set_seen_events(self, seen_events: SeenEvents):
+        """Replace the index of handled events, i.e. w/ a bounded SeenEvents(max_blocks)
+        or a RollingBloomFilter when monitoring for a long time
+        """
+        self.seen_events = seen_events
+
+    def get_dedup_stats(self) -> Dict:
+        """Return size, memory footprint & hit rate of the handled events index
+        """
+        return self.seen_events.stats()
+
     ##########################
     # HANDLING
     ##########################
@@ -141,6 +189,15 @@ class EventMonitor:
         """Send flag to handler to end loop & thread
         """
         self.handler_flag = False
+        if self.handler_thread.is_alive():
+            self.event_queue.put(_WAKE)
+
+    def set_handler_batch_size(self, batch_size: int):
+        """Set the most events the handler takes off the queue per wake up
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size should be at least 1')
+        self.handler_batch_size = batch_size
 
     def get_event_handler_status(self) -> str:
         """Return status of event handler thread
@@ -159,78 +216,57 @@ class EventMonitor:
     def event_handler(self):
         """Grab events from queue and pass to handler
         """
-        # while monitoring, syncing, or queue not empty
         while self.handler_flag:
-            while not self.event_queue.empty():
-                event = self.event_queue.get()
-                self.handle_event(event)
-            time.sleep(2)
+            # block until an event arrives, then drain a batch w/o waiting again
+            events = [self.event_queue.get()]
+            while len(events) < self.handler_batch_size:
+                try:
+                    events.append(self.event_queue.get_nowait())
+                except queue.Empty:
+                    break
+            for event in events:
+                if event is not _WAKE:
+                    self.handle_event(event)
 
     def handle_event(self, event):
         """Process event when it happens
         """
+        # checkpointed syncs decode logs for the store, they're not decoded again
+        decoded = isinstance(event, _DecodedLog)
+        log = event.log if decoded else event
+
         # Look for repeats, txn hash & log index uniquely identify any event
-        event_tuple = (event['transactionHash'], event['logIndex'])
-        if event_tuple in self.event_tuples:
-            # TODO, indicate this is working
-            # TODO, its not working
+        key = event_key(log)
+        if self.seen_events.contains(key):
             return
 
 
-        # TODO, shouldn't need try-except error catching
-        try:
-            event_address = event['address']
-            event_topics = [topic.hex() for topic in event['topics']]
-            event_keccak = event_topics[0]
-
-            sub_event_df = self.contracts_df[event_address]
-            entry = sub_event_df.loc[sub_event_df['keccak'] == event_keccak]
-            event_name = entry['name'].item()
-
-            contract_abi = self.abis_dict[event_address]
-            contract = self.w3.eth.contract(address=event_address, abi=contract_abi)
-
-            txn = event['transactionHash']
-            txn_rec = self.w3.eth.get_transaction_receipt(txn)
-
-            # event_name is a member function of the contract contrusted w/ the
-            # contract abi when initializing the contract. the weird __dict__ syntax
-            # is the way to access this function
-            logs = contract.events.__dict__[event_name]().processReceipt(txn_rec, errors=DISCARD)
-
-            # logs is a tuple
-            for log in logs:
-                #### filter by topic
-                if hasattr(self, 'event_names'):
-                    if log['event'] in self.event_names:
-                        event_dict = {'args': dict(log['args']),
-                                      'event': log['event'],
-                                      'transaction': log['transactionHash'].hex(),
-                                      'log_index': log['logIndex'],
-                                      'transaction_index': log['transactionIndex'],
-                                      'address': log['address'],
-                                      'block_number': log['blockNumber'],
-                                      'block': log['blockHash'].hex()}
-                        self.events_list.append(event_dict)
-                        self.event_tuples.append(event_tuple)
-                else:
-                    event_dict = {'args': dict(log['args']),
-                                  'event': log['event'],
-                                  'transaction': log['transactionHash'].hex(),
-                                  'log_index': log['logIndex'],
-                                  'transaction_index': log['transactionIndex'],
-                                  'address': log['address'],
-                                  'block_number': log['blockNumber'],
-                                  'block': log['blockHash'].hex()}
-                    self.events_list.append(event_dict)
-                    self.event_tuples.append(event_tuple)
-
-        # TODO get type for this except clause
-        except: # pylint: disable=bare-except
-            logging.error('event handler error')
+        event_dict = event.event_dict if decoded else self.decode_log(log)
+        if event_dict is not None:
+            self.events_list.append(event_dict)
+
+        # decoding is deterministic, logs that didn't decode are marked as handled too
+        self.seen_events.add(key, log['blockNumber'])
 
         return
 
+    def decode_log(self, log) -> Union[Dict, None]:
+        """Decode a log from its topics & data, no receipt needed. Return None for logs
+        that aren't monitored, i.e. filtered out by event_names, or don't decode
+        """
+        if not log['topics']:
+            return None
+        decoder = self.decoders.get((log['address'], to_bytes(log['topics'][0])))
+        if decoder is None:
+            return None
+        try:
+            return decoder.decode(log)
+        except Exception as error:  # pylint: disable=broad-except
+            # i.e. ERC-721 & ERC-20 Transfer share a topic but not indexed arguments,
+            # one malformed log must not kill the handler thread
+            logging.error('event handler error, %s', error)
+            return None
+
 
     ##########################
     # MONITORING
@@ -239,17 +275,25 @@ class EventMonitor:
         """Monitor for events & add to queue
         """
         while self.monitor_flag:
+            # cleared before polling, a head arriving mid-poll triggers another poll
+            self.monitor_wake.clear()
             for event_filter in self.event_filters:
                 for event in event_filter.get_new_entries():
                     self.event_queue.put(event)
-                    #self.handle_event(event)
-            time.sleep(2)
+            self.monitor_wake.wait(self.poll_interval)
+
+    def set_poll_interval(self, poll_interval: float):
+        """Set seconds between filter polls, w/ a ws_url new heads poll right away too
+        """
+        self.poll_interval = poll_interval
 
     def start_monitor(self):
         """Start monitor thread, do nothing if already started
         """
         self.monitor_flag = True
         self.start_event_handler()
+        if self.head_subscription is not None:
+            self.head_subscription.start()
         if self.monitor_thread.is_alive():
             return
 
@@ -261,6 +305,9 @@ class EventMonitor:
         """Send flag to monitor to end loop & thread
         """
         self.monitor_flag = False
+        if self.head_subscription is not None:
+            self.head_subscription.stop()
+        self.monitor_wake.set()
 
     def get_monitor_status(self) -> str:
         """Return status of event monitor thread
@@ -321,85 +368,90 @@ class EventMonitor:
             else:
                 return 'DEAD'
 
-    def sync_top(self, start_block: int, end_block: int):
+    def set_sync_workers(self, max_workers: int, max_requests: int = None):
+        """Set threads syncing windows & the most concurrent eth_getLogs requests
+        against the RPC, defaults to max_workers
+        """
+        self.sync_workers = max_workers
+        self.sync_requests = max_requests
+
+    def set_sync_window(self, window_size: int, max_addresses: int = None,
+                        max_window_size: int = None):
+        """Set blocks of the first eth_getLogs request of each filter, the most contracts
+        sharing one request & optionally the most blocks per request. Later requests
+        grow after sparse responses & shrink after dense or refused ones
+        """
+        self.sync_window = window_size
+        if max_addresses is not None:
+            self.sync_addresses = max_addresses
+        self.sync_max_window = max_window_size
+
+    def set_sync_store(self, sync_store: SyncStore):
+        """Checkpoint syncs to a SyncStore, syncs then skip windows it completed & decoded
+        events are written to it as each window completes. None turns checkpoints off
+        """
+        self.sync_store = sync_store
 
-        for contract in self.contracts:
-            if self.contracts_dict[contract]:
-                topics = self.contracts_dict[contract]
-                for topic in topics:
-                    self.sync(start_block, end_block, contract, topic=topic)
-            else:
-                self.sync(start_block, end_block, contract)
+    def get_sync_watermarks(self, start_block: int = 0) -> Dict:
+        """Return last block of each (contract, topic) synced w/o gaps from start_block
+        """
+        if self.sync_store is None:
+            return {}
+        return self.sync_store.watermarks(start_block)
+
+    def get_stored_events(self, start_block: int = None, end_block: int = None) -> List:
+        """Return events syncs wrote to the sync store, in (block_number, log_index) order
+        """
+        if self.sync_store is None:
+            return []
+        return self.sync_store.read_events(start_block, end_block, addresses=self.contracts)
+
+    def sync_top(self, start_block: int, end_block: int):
+        """Sync every monitored contract & topic from start_block to end_block
+        """
+        groups = group_contracts(self.contracts_dict, self.sync_addresses)
+        self.run_sync(groups, start_block, end_block)
 
         # self-stop sync w/ flag
         self.sync_flag = False
 
-
     def sync(self, start_block: int, end_block: int, contract: str, topic: str=None):
+        """Sync one contract, optionally one topic, from start_block to end_block
+        """
+        topics = (topic,) if topic else None
+        self.run_sync([((contract,), topics)], start_block, end_block)
 
-        from_block = start_block
-        # start w/ increments of 1% bc early eth blocks are pretty empty
-        increment = (end_block - from_block) // 100
-        to_block = from_block + increment
-
-        if topic:
-            run_filter = self.w3.eth.filter({'address': contract,
-                                             'fromBlock': from_block,
-                                             'toBlock': to_block,
-                                             'topics': [topic]})
-        else:
-            run_filter = self.w3.eth.filter({'address': contract,
-                                             'fromBlock': from_block,
-                                             'toBlock': to_block})
-        all_events = []
-        events_caught = []
-        while from_block < end_block and self.sync_flag:
-            self.sync_status = f'Contract: {contract}, Topic: {topic}, Range: ({from_block} - {to_block}), Goal: {end_block}, Increment: {increment}' # pylint: disable=line-too-long
-
-            try:
-                events = run_filter.get_all_entries()
-                all_events.append(events)
-                for event in events:
-                    # Add to queue
-                    self.event_queue.put(event)
-
-                # Optimize increasing the increment
-                if len(events_caught) >= 10:
-                    # pop new len(events) into list
-                    events_caught.pop(0)
-                    events_caught.append(len(events))
-
-                    # get average
-                    avg_caught = sum(events_caught)//10
-
-                    diff = 5000 - avg_caught
-                    diff_percent = diff/5000
-
-                    # should work for +/- optimizing for 5000?
-                    increment = int(increment * (1 + diff_percent))
-                else:
-                    events_caught.append(len(events))
-
-                from_block = to_block + 1
-                to_block = from_block + increment
-                run_filter = self.w3.eth.filter({'address': contract,
-                                            'fromBlock': from_block,
-                                            'toBlock': to_block})
-
-            except ValueError as error: # pylint: disable=unused-variable
-                # TODO parse this error to confirm it is the right one
-                # really just assuming this error has to do w/ too much data being in return
-                #logging.error(error)
-                increment = increment // 2
-                to_block = from_block + increment
-
-                if topic:
-                    run_filter = self.w3.eth.filter({'address': contract,
-                                                     'fromBlock': from_block,
-                                                     'toBlock': to_block,
-                                                     'topics': [topic]})
-                else:
-                    run_filter = self.w3.eth.filter({'address': contract,
-                                                     'fromBlock': from_block,
-                                                     'toBlock': to_block})
-
+    def run_sync(self, groups: List, start_block: int, end_block: int) -> int:
+        """Fetch the logs of (addresses, topics) groups over a block range concurrently
+        & queue them in (block_number, log_index) order
+        """
+        # w/ a sync store, windows completed by earlier syncs are skipped & logs are
+        # decoded once, stored, then queued w/ their event dicts
+        stored = self.sync_store is not None
+        intervals = self.sync_store.intervals() if stored else {}
+
+        def _synced(window) -> int:
+            return min(synced_until(intervals.get(pair, []), window.from_block)
+                       for pair in window.pairs())
+
+        def _checkpoint(windows: List, logs: List):
+            decoded = [_DecodedLog(log, self.decode_log(log)) for log in logs]
+            self.sync_store.complete([pair + (window.from_block, window.to_block)
+                                      for window in windows for pair in window.pairs()],
+                                     [item.event_dict for item in decoded
+                                      if item.event_dict is not None])
+            for item in decoded:
+                self.event_queue.put(item)
+
+        syncer = LogSyncer(self.w3.eth.get_logs, max_workers=self.sync_workers,
+                           max_requests=self.sync_requests, window_size=self.sync_window,
+                           max_window_size=self.sync_max_window)
+
+        def progress(done: int, block_number: int):
+            self.sync_status = f'Requests: {len(groups)}, Range: ({start_block} - {block_number}), Goal: {end_block}, Windows: {done}' # pylint: disable=line-too-long
+
+        return syncer.run(groups, start_block, end_block,
+                          None if stored else self.event_queue.put,
+                          should_stop=lambda: not self.sync_flag, progress=progress,
+                          checkpoint=_checkpoint if stored else None,
+                          synced=_synced if stored else None)
@@ -0,0 +1,173 @@
+"""This module is meant to contain the SyncStore class, the on-disk checkpoints
+& decoded events EventMonitor syncs resume from"""
+
+
+import json
+import os
+import sqlite3
+import threading
+from bisect import bisect_right
+from typing import Dict, List, Tuple, Union
+
+DEFAULT_SYNC_STORE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'messari',
+                                       'eventmonitor.sqlite')
+EVENT_COLUMNS = ['transaction', 'log_index', 'block_number', 'transaction_index',
+                 'address', 'event', 'block', 'args']
+
+
+def covers(intervals: List[Tuple[int, int]], from_block: int, to_block: int) -> bool:
+    """True if from_block..to_block lies in one of sorted, disjoint intervals"""
+    return synced_until(intervals, from_block) >= to_block
+
+
+def synced_until(intervals: List[Tuple[int, int]], from_block: int) -> int:
+    """Last block of sorted, disjoint intervals covering from_block on w/o gaps,
+    from_block - 1 if no interval holds from_block"""
+    index = bisect_right(intervals, (from_block, float('inf'))) - 1
+    if index >= 0 and intervals[index][1] >= from_block:
+        return intervals[index][1]
+    return from_block - 1
+
+
+def _json_default(value):
+    """Bytes args are stored as hex str"""
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+class SyncStore:
+    """SQLite backed checkpoints of EventMonitor syncs.
+
+    Completed windows are kept per (contract, topic) as merged block
+    intervals, so a restarted sync only plans the blocks that are missing.
+    Decoded events are written in the same transaction as their window, a
+    window is either done w/ all of its events stored or not done at all.
+    Contract addresses don't tell chains apart, use one store per chain.
+    """
+
+    def __init__(self, path: str = DEFAULT_SYNC_STORE_PATH):
+        """
+        Parameters
+        ----------
+            path: str
+                SQLite file, use ':memory:' for checkpoints that live w/ the process
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute('''CREATE TABLE IF NOT EXISTS synced (
+                                            address TEXT,
+                                            topic TEXT,
+                                            from_block INTEGER,
+                                            to_block INTEGER,
+                                            PRIMARY KEY (address, topic, from_block))''')
+            self._connection.execute('''CREATE TABLE IF NOT EXISTS events (
+                                            transaction_hash TEXT,
+                                            log_index INTEGER,
+                                            block_number INTEGER,
+                                            transaction_index INTEGER,
+                                            address TEXT,
+                                            event TEXT,
+                                            block TEXT,
+                                            args TEXT,
+                                            PRIMARY KEY (transaction_hash, log_index))''')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS chain_order '
+                                     'ON events (block_number, log_index)')
+
+    def complete(self, windows: List[Tuple[str, str, int, int]], events: List[Dict]) -> None:
+        """Stores the decoded events of completed windows & marks the windows synced
+
+        :param windows: list
+            (address, topic, from_block, to_block) of each completed window,
+            topic is ALL_TOPICS for windows syncing every event
+        :param events: list
+            Event dicts as EventMonitor decodes them
+        """
+        rows = [(event['transaction'], event['log_index'], event['block_number'],
+                 event['transaction_index'], event['address'], event['event'], event['block'],
+                 json.dumps(event['args'], default=_json_default)) for event in events]
+        with self._lock, self._connection:
+            # windows overlap when a resumed sync redoes one, events are only kept once
+            self._connection.executemany(
+                'INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            for address, topic, from_block, to_block in windows:
+                self._merge(address, topic, from_block, to_block)
+
+    def intervals(self) -> Dict[Tuple[str, str], List[Tuple[int, int]]]:
+        """Synced block intervals of each (address, topic), sorted & disjoint"""
+        with self._lock:
+            rows = self._connection.execute('''SELECT address, topic, from_block, to_block
+                                               FROM synced ORDER BY from_block''').fetchall()
+        intervals: Dict = {}
+        for address, topic, from_block, to_block in rows:
+            intervals.setdefault((address, topic), []).append((from_block, to_block))
+        return intervals
+
+    def watermarks(self, start_block: int = 0) -> Dict[Tuple[str, str], int]:
+        """Last block of each (address, topic) synced w/o gaps from start_block"""
+        watermarks = {}
+        for pair, intervals in self.intervals().items():
+            index = bisect_right(intervals, (start_block, float('inf'))) - 1
+            if index >= 0 and intervals[index][1] >= start_block:
+                watermarks[pair] = intervals[index][1]
+        return watermarks
+
+    def read_events(self, start_block: int = None, end_block: int = None,
+                    addresses: Union[str, List[str]] = None) -> List[Dict]:
+        """Stored events in (block_number, log_index) order
+
+        :param start_block: int
+            Optional first block to return
+        :param end_block: int
+            Optional last block to return
+        :param addresses: str, list
+            Optional contracts to return events of
+        :return: list of event dicts, bytes args are hex str
+        """
+        clauses, params = [], []
+        if start_block is not None:
+            clauses.append('block_number >= ?')
+            params.append(start_block)
+        if end_block is not None:
+            clauses.append('block_number <= ?')
+            params.append(end_block)
+        if addresses is not None:
+            addresses = [addresses] if isinstance(addresses, str) else list(addresses)
+            clauses.append(f'address IN ({", ".join("?" * len(addresses))})')
+            params.extend(addresses)
+        where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+        with self._lock:
+            rows = self._connection.execute(
+                f'''SELECT transaction_hash, log_index, block_number, transaction_index,
+                           address, event, block, args
+                    FROM events {where} ORDER BY block_number, log_index''', params).fetchall()
+        events = []
+        for row in rows:
+            event = dict(zip(EVENT_COLUMNS, row))
+            event['args'] = json.loads(event['args'])
+            events.append(event)
+        return events
+
+    def clear(self) -> None:
+        """Deletes every checkpoint & stored event"""
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM synced')
+            self._connection.execute('DELETE FROM events')
+
+    def _merge(self, address: str, topic: str, from_block: int, to_block: int) -> None:
+        """Adds a window to the synced intervals it touches, caller holds the lock"""
+        touching = self._connection.execute(
+            '''SELECT from_block, to_block FROM synced
+               WHERE address = ? AND topic = ? AND from_block <= ? AND to_block >= ?''',
+            (address, topic, to_block + 1, from_block - 1)).fetchall()
+        for interval_from, interval_to in touching:
+            from_block, to_block = min(from_block, interval_from), max(to_block, interval_to)
+        self._connection.execute('''DELETE FROM synced WHERE address = ? AND topic = ?
+                                    AND from_block <= ? AND to_block >= ?''',
+                                 (address, topic, to_block + 1, from_block - 1))
+        self._connection.execute('INSERT INTO synced VALUES (?, ?, ?, ?)',
+                                 (address, topic, from_block, to_block))
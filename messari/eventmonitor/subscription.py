@@ -0,0 +1,109 @@
+"""This module is meant to contain the HeadSubscription class, waking EventMonitor
+up on new blocks instead of waiting for its next poll"""
+
+
+import asyncio
+import logging
+import threading
+from typing import Callable, Union
+
+import aiohttp
+
+
+class HeadSubscription:
+    """eth_subscribe newHeads over a websocket, calling on_head w/ each new block number.
+
+    Runs its own event loop on a daemon thread & reconnects after
+    reconnect_delay seconds if the connection drops. If the node answers the
+    subscription w/ an error, i.e. it has no websocket subscriptions, the
+    subscription stops & the monitor keeps polling at its poll interval.
+    """
+
+    def __init__(self, ws_url: str, on_head: Callable[[int], None],
+                 reconnect_delay: float = 1.0):
+        """
+        Parameters
+        ----------
+            ws_url: str
+                Websocket RPC url, i.e. wss://...
+            on_head: Callable
+                Called w/ the number of each new block, from the subscription thread
+            reconnect_delay: float
+                Seconds to wait before reconnecting a dropped websocket
+        """
+        self.ws_url = ws_url
+        self.on_head = on_head
+        self.reconnect_delay = reconnect_delay
+        self.running = False
+        self.last_head: Union[int, None] = None
+        self._loop: Union[asyncio.AbstractEventLoop, None] = None
+        self._task: Union[asyncio.Task, None] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        """Start the subscription thread, do nothing if already started"""
+        if self._thread.is_alive():
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Close the websocket & end the thread"""
+        self.running = False
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:  # loop already closed
+                pass
+
+    def is_alive(self) -> bool:
+        """True while the subscription thread runs"""
+        return self._thread.is_alive()
+
+    def _run(self) -> None:
+        """Thread target, runs _listen on a loop of its own"""
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            self._task = loop.create_task(self._listen())
+            if not self.running:  # stopped before the task existed
+                self._task.cancel()
+            loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop = self._task = None
+            loop.close()
+
+    async def _listen(self) -> None:
+        """Subscribe & forward new heads, reconnecting until stopped"""
+        async with aiohttp.ClientSession() as session:
+            while self.running:
+                try:
+                    async with session.ws_connect(self.ws_url, heartbeat=30) as websocket:
+                        await websocket.send_json({'jsonrpc': '2.0', 'id': 1,
+                                                   'method': 'eth_subscribe',
+                                                   'params': ['newHeads']})
+                        async for message in websocket:
+                            if message.type != aiohttp.WSMsgType.TEXT:
+                                break
+                            if not self._handle_message(message.json()):
+                                self.running = False
+                                return
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as error:
+                    # ValueError for text frames that aren't JSON, the node is reconnected
+                    logging.error('newHeads subscription error, %s', error)
+                if self.running:
+                    await asyncio.sleep(self.reconnect_delay)
+
+    def _handle_message(self, message: dict) -> bool:
+        """Forward a new head, False if the node refused the subscription"""
+        if message.get('method') == 'eth_subscription':
+            self.last_head = int(message['params']['result']['number'], 16)
+            self.on_head(self.last_head)
+        elif 'error' in message:
+            logging.error('newHeads subscription refused, %s', message['error'])
+            return False
+        return True
@@ -0,0 +1,308 @@
+"""This module is meant to contain the LogSyncer class, fetching historical logs
+of many contracts & topics concurrently for EventMonitor"""
+
+
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, NamedTuple, Tuple, Union
+
+# topic of windows syncing every event of a contract
+ALL_TOPICS = ''
+
+
+class SyncWindow(NamedTuple):
+    """One eth_getLogs request, contracts sharing topics over a block range"""
+    addresses: Tuple[str, ...]
+    topics: Union[Tuple[str, ...], None]
+    from_block: int
+    to_block: int
+
+    def filter_params(self) -> Dict:
+        """eth_getLogs filter, topics are OR-ed in the topic0 position"""
+        params = {'address': list(self.addresses), 'fromBlock': self.from_block,
+                  'toBlock': self.to_block}
+        if self.topics:
+            params['topics'] = [list(self.topics)]
+        return params
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        """(address, topic) pairs the window syncs, ALL_TOPICS for every event"""
+        return [(address, topic) for address in self.addresses
+                for topic in self.topics or (ALL_TOPICS,)]
+
+    def split(self) -> Tuple['SyncWindow', 'SyncWindow']:
+        """Halves of the block range"""
+        middle = (self.from_block + self.to_block) // 2
+        return (self._replace(to_block=middle), self._replace(from_block=middle + 1))
+
+
+def log_order(log) -> Tuple[int, int]:
+    """Sort key of logs, chain order"""
+    return (log['blockNumber'], log['logIndex'])
+
+
+def group_contracts(contracts_dict: Dict[str, List[str]],
+                    max_addresses: int = 25) -> List[Tuple[Tuple[str, ...], Union[Tuple, None]]]:
+    """Contracts grouped into eth_getLogs filters. Contracts monitoring the same
+    topics share a filter, so no request returns logs nobody asked for.
+
+    :param contracts_dict: dict
+        Contract address to the topics monitored, an empty list monitors every event
+    :param max_addresses: int
+        Most addresses in one filter
+    :return: list of (addresses, topics) tuples, topics is None for every event
+    """
+    by_topics: Dict = {}
+    for contract, topics in contracts_dict.items():
+        key = tuple(sorted(set(topics))) or None
+        by_topics.setdefault(key, []).append(contract)
+
+    groups = []
+    for topics, contracts in by_topics.items():
+        for start in range(0, len(contracts), max_addresses):
+            groups.append((tuple(contracts[start:start + max_addresses]), topics))
+    return groups
+
+
+class GroupWindows:
+    """Windows of one (addresses, topics) group, planned as the sync goes.
+
+    Windows start at window_size blocks. Responses w/ fewer than half of
+    target_logs double the size of the group's next windows, responses w/
+    more than twice target_logs halve it. A window the RPC refuses caps the
+    group's size at half of it for the rest of the sync, so the halved size
+    carries forward instead of every later window being refused again.
+    """
+
+    def __init__(self, addresses: Tuple[str, ...], topics: Union[Tuple[str, ...], None],
+                 start_block: int, end_block: int, window_size: int,
+                 max_window_size: Union[int, None] = None, target_logs: int = 5000):
+        """
+        Parameters
+        ----------
+            addresses: tuple
+                Contracts of the group's filter
+            topics: tuple
+                Topics OR-ed in the topic0 position, None for every event
+            start_block: int
+                First block to sync
+            end_block: int
+                Last block to sync, inclusive
+            window_size: int
+                Blocks of the first window
+            max_window_size: int
+                Most blocks per window, None doesn't cap sizes
+            target_logs: int
+                Logs per response window sizes are adjusted towards
+        """
+        if window_size < 1:
+            raise ValueError('window_size should be at least 1')
+        self.addresses = addresses
+        self.topics = topics
+        self.end_block = end_block
+        self.max_window_size = max_window_size
+        self.window_size = min(window_size, max_window_size or window_size)
+        self.target_logs = target_logs
+        # first block not planned yet & last block of the windows done in order
+        self.cursor = start_block
+        self.frontier = start_block - 1
+        # planned windows in block order, [window, logs, skipped] w/ logs None until
+        # fetched, skipped windows were completed by a previous sync
+        self.windows: Deque[List] = deque()
+
+    def planned(self) -> bool:
+        """True once every window up to end_block is planned"""
+        return self.cursor > self.end_block
+
+    def next_window(self, synced: Callable[[SyncWindow], int] = None) -> Tuple[SyncWindow, bool]:
+        """Plans the group's next window
+
+        :param synced: Callable
+            Returns the last block from the window's from_block on a previous sync
+            completed, from_block - 1 if none
+        :return: (window, True if a previous sync completed it)
+        """
+        window = SyncWindow(self.addresses, self.topics, self.cursor,
+                            min(self.cursor + self.window_size - 1, self.end_block))
+        done = False
+        if synced is not None:
+            synced_to = min(synced(window), self.end_block)
+            if synced_to >= window.from_block:
+                window, done = window._replace(to_block=synced_to), True
+        self.windows.append([window, [] if done else None, done])
+        self.cursor = window.to_block + 1
+        return window, done
+
+    def fitted(self, window: SyncWindow, log_count: int) -> None:
+        """Sizes the next windows after a response w/ log_count logs"""
+        size = window.to_block - window.from_block + 1
+        if log_count < self.target_logs // 2:
+            size = max(self.window_size, 2 * size)
+        elif log_count > 2 * self.target_logs:
+            size = max(1, min(self.window_size, size // 2))
+        else:
+            return
+        self.window_size = min(size, self.max_window_size or size)
+
+    def refused(self, window: SyncWindow) -> None:
+        """Caps the next windows at half of a window the RPC refused"""
+        self.max_window_size = max(1, (window.to_block - window.from_block + 1) // 2)
+        self.window_size = min(self.window_size, self.max_window_size)
+
+    def pop_done(self) -> List[List]:
+        """[window, logs, skipped] of the windows done in order, moves the frontier past them"""
+        done = []
+        while self.windows and self.windows[0][1] is not None:
+            done.append(self.windows.popleft())
+            self.frontier = done[-1][0].to_block
+        return done
+
+
+class LogSyncer:
+    """Runs the windows of a sync on a thread pool & emits their logs in order.
+
+    Every group plans its own windows, sized by its earlier responses, see
+    GroupWindows. The group furthest behind plans next & at most
+    2 * max_workers windows are in flight, max_requests at a time against
+    the RPC. Logs are emitted sorted by (block_number, log_index) once
+    every group fetched up to their block, so consumers see events in chain
+    order. Windows the RPC refuses, i.e. too many results, are halved until
+    they fit.
+    """
+
+    def __init__(self, get_logs: Callable[[Dict], List], max_workers: int = 4,
+                 max_requests: Union[int, None] = None, window_size: int = 2000,
+                 max_window_size: Union[int, None] = None, target_logs: int = 5000):
+        """
+        Parameters
+        ----------
+            get_logs: Callable
+                eth_getLogs, takes a filter dict & returns the list of logs
+            max_workers: int
+                Threads fetching windows
+            max_requests: int
+                Most concurrent requests against the RPC, defaults to max_workers
+            window_size: int
+                Blocks of each group's first window
+            max_window_size: int
+                Most blocks per window, None doesn't cap sizes
+            target_logs: int
+                Logs per response window sizes are adjusted towards, see GroupWindows
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers should be at least 1')
+        if window_size < 1:
+            raise ValueError('window_size should be at least 1')
+        self.get_logs = get_logs
+        self.max_workers = max_workers
+        self.max_requests = max_requests or max_workers
+        self.window_size = window_size
+        self.max_window_size = max_window_size
+        self.target_logs = target_logs
+        self._requests = threading.BoundedSemaphore(self.max_requests)
+
+    def fetch(self, window: SyncWindow, group: GroupWindows = None) -> List:
+        """Logs of a window, halving it while the RPC refuses the range. The
+        responses size group's next windows"""
+        try:
+            with self._requests:
+                logs = list(self.get_logs(window.filter_params()))
+        except ValueError:
+            # really just assuming this error has to do w/ too much data being in return
+            if window.from_block >= window.to_block:
+                raise
+        else:
+            if group is not None:
+                group.fitted(window, len(logs))
+            return logs
+        if group is not None:
+            group.refused(window)
+        first, second = window.split()
+        return self.fetch(first, group) + self.fetch(second, group)
+
+    def run(self, groups: List[Tuple], start_block: int, end_block: int,
+            emit: Union[Callable, None], should_stop: Callable[[], bool] = None,
+            progress: Callable[[int, int], None] = None,
+            checkpoint: Callable[[List[SyncWindow], List], None] = None,
+            synced: Callable[[SyncWindow], int] = None) -> int:
+        """Fetch every group from start_block to end_block & emit the logs in chain order
+
+        :param groups: list
+            (addresses, topics) tuples as returned by group_contracts
+        :param start_block: int
+            First block to sync
+        :param end_block: int
+            Last block to sync, inclusive
+        :param emit: Callable
+            Called w/ each log, in (block_number, log_index) order, None leaves the
+            logs to checkpoint
+        :param should_stop: Callable
+            Checked between windows, returning True stops the sync
+        :param progress: Callable
+            Called w/ (windows fetched, last block emitted) as logs are emitted
+        :param checkpoint: Callable
+            Called w/ the fetched windows that end at or before the last block
+            emitted & the sorted logs emitted along w/ them. Logs of a window
+            reaching past that block may be checkpointed before the window is
+        :param synced: Callable
+            Returns the last block from a window's from_block on a previous
+            sync completed, from_block - 1 if none. These blocks are skipped
+        :return: number of logs emitted
+        """
+        plans = [GroupWindows(addresses, topics, start_block, end_block, self.window_size,
+                              self.max_window_size, self.target_logs)
+                 for addresses, topics in groups]
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending: Dict = {}
+        held_logs: List = []
+        held_windows: List[SyncWindow] = []
+        emitted_to = start_block - 1
+        fetched = count = 0
+        try:
+            while should_stop is None or not should_stop():
+                # the group furthest behind plans first, bounding logs held in memory
+                while len(pending) < 2 * self.max_workers:
+                    open_plans = [plan for plan in plans if not plan.planned()]
+                    if not open_plans:
+                        break
+                    plan = min(open_plans, key=lambda plan: plan.cursor)
+                    window, skipped = plan.next_window(synced)
+                    if not skipped:
+                        pending[executor.submit(self.fetch, window, plan)] = plan.windows[-1]
+                for plan in plans:
+                    for window, logs, skipped in plan.pop_done():
+                        held_logs.extend(logs)
+                        # windows a previous sync completed are already checkpointed
+                        if not skipped:
+                            held_windows.append(window)
+                frontier = min((plan.frontier for plan in plans), default=end_block)
+
+                if frontier > emitted_to:
+                    logs = sorted((log for log in held_logs if log['blockNumber'] <= frontier),
+                                  key=log_order)
+                    held_logs = [log for log in held_logs if log['blockNumber'] > frontier]
+                    windows = [window for window in held_windows if window.to_block <= frontier]
+                    held_windows = [window for window in held_windows
+                                    if window.to_block > frontier]
+                    if emit is not None:
+                        for log in logs:
+                            emit(log)
+                    if checkpoint is not None:
+                        checkpoint(windows, logs)
+                    count += len(logs)
+                    emitted_to = frontier
+                    if progress is not None:
+                        progress(fetched, frontier)
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.pop(future)[1] = future.result()
+                    fetched += 1
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+        return count
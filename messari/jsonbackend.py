@@ -0,0 +1,80 @@
+"""This module is meant to contain the JSON decoders DataLoader parses responses with.
+
+orjson & simdjson are optional, the fastest one installed is used by default
+& stdlib json is always available. simdjson documents are fully converted to
+Python objects rather than used through its lazy proxies, data sources
+modify the decoded responses while parsing them.
+
+NOTE: orjson decodes integers past 64 bits as floats, the APIs wrapped here
+send token amounts as strings or floats. Use the 'json' backend where exact
+big integers matter.
+"""
+
+
+import json
+import threading
+from typing import Any, Callable, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # faster decoders are optional
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# Decoders in order of preference
+JSON_BACKEND_ORDER = ('orjson', 'simdjson', 'json')
+
+
+def _orjson_loads(content: Union[bytes, str]) -> Any:
+    """Decode w/ orjson, documents it rejects (i.e. NaN) fall back to json"""
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return json.loads(content)
+
+
+_simdjson_state = threading.local()
+
+
+def _simdjson_loads(content: Union[bytes, str]) -> Any:
+    """Decode w/ simdjson, parsers aren't thread safe so each thread keeps its own"""
+    parser = getattr(_simdjson_state, 'parser', None)
+    if parser is None:
+        parser = _simdjson_state.parser = simdjson.Parser()
+    try:
+        return parser.parse(content, recursive=True)
+    except ValueError:
+        return json.loads(content)
+
+
+def available_json_backends() -> Dict[str, Callable[[Union[bytes, str]], Any]]:
+    """Installed decoders by name, fastest first"""
+    backends = {}
+    if orjson is not None:
+        backends['orjson'] = _orjson_loads
+    if simdjson is not None:
+        backends['simdjson'] = _simdjson_loads
+    backends['json'] = json.loads
+    return backends
+
+
+def get_json_loads(backend: str = None) -> Callable[[Union[bytes, str]], Any]:
+    """Returns the decode function of a JSON backend
+
+    :param backend: str
+        'orjson', 'simdjson' or 'json', None picks the fastest installed
+    :return: function decoding bytes or str to Python objects
+    :raises ValueError if backend isn't supported, ImportError if it isn't installed
+    """
+    backends = available_json_backends()
+    if backend is None:
+        return next(iter(backends.values()))
+    if backend not in JSON_BACKEND_ORDER:
+        raise ValueError(f'Unsupported JSON backend {backend}, options are {JSON_BACKEND_ORDER}')
+    if backend not in backends:
+        raise ImportError(f'JSON backend {backend} is not installed, pip install {backend}')
+    return backends[backend]
@@ -5,6 +5,8 @@ from typing import Union, List, Dict
 import pandas as pd
 
 from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
+from messari.pagination import Paginator
 from messari.utils import validate_input, convert_flatten, unpack_list_of_dicts
 from .helpers import fields_payload, timeseries_to_dataframe
 
@@ -17,11 +19,22 @@ BASE_URL_MARKETS = 'https://data.messari.io/api/v1/markets'
 class Messari(DataLoader):
     """This class is a wrapper around the Messari API
     """
+    max_workers = 4
+    # How long responses are cached when a cache is set
+    cache_ttls = [(r'/metrics\?', 60),
+                  (r'/api/v1/markets', 60)]
+
     def __init__(self, api_key=None):
         messari_api_key = {'x-messari-api-key': api_key}
         DataLoader.__init__(self, api_dict=messari_api_key, taxonomy_dict=None)
         # TODO, look into super() for __init__
 
+        # Reference: https://messari.io/api/docs#section/Rate-Limiting
+        if api_key:
+            self.set_rate_limit(30, period=60)
+        else:
+            self.set_rate_limit(20, period=60)
+
     #######################
     # markets
     #######################
@@ -161,6 +174,44 @@ class Messari(DataLoader):
         response_data = self.get_response(BASE_URL_V2, params=payload, headers=self.api_dict)
         return unpack_list_of_dicts(response_data['data'])
 
+    def iter_all_assets(self, limit: int = 500, asset_fields: Union[str, List] = None,
+                        asset_metric: str = None, asset_profile_metric: str = None,
+                        prefetch: int = 0) -> Paginator:
+        """Lazily pages through the list of all assets including metrics and profile.
+
+        Parameters
+        ----------
+            limit: int
+                Assets per request. Default is 500, the max value.
+            asset_fields: str, list
+                Single filter string or list of fields to filter data,
+                see get_all_assets for the available fields.
+            asset_metric: str
+                Single metric string to filter metric data,
+                see get_all_assets for the available metrics.
+            asset_profile_metric: str
+                Single profile metric string to filter profile data,
+                see get_all_assets for the available metrics.
+            prefetch: int
+                Pages requested concurrently ahead of the one being read.
+
+        Returns
+        -------
+            Paginator
+                Yields asset dicts, iter_pages() yields lists of them.
+        """
+        payload = {'limit': limit}
+        if asset_fields:
+            payload['fields'] = fields_payload(asset_fields=asset_fields, asset_metric=asset_metric,
+                                               asset_profile_metric=asset_profile_metric)
+
+        def get_page(page):
+            response_data = self.get_response(BASE_URL_V2, params=dict(payload, page=page),
+                                              headers=self.api_dict)
+            return response_data['data'] or []
+
+        return self.paginate(get_page, page_size=limit, start=1, prefetch=prefetch)
+
     def get_asset(self, asset_slugs: Union[str, List], asset_fields: Union[str, List] = None,
                   to_dataframe: bool = True) -> \
             Union[Dict, pd.DataFrame]:
@@ -191,12 +242,14 @@ class Messari(DataLoader):
             payload['fields'] = fields_payload(asset_fields=asset_fields)
         base_url_template = Template(f'{BASE_URL_V1}/$asset_key')
 
-        response_data = {}
-        for asset in asset_slugs:
+        def get_asset_data(asset):
             url = base_url_template.substitute(asset_key=asset)
             response = self.get_response(url, params=payload, headers=self.api_dict)
-            response_flat = convert_flatten(response['data'])
-            response_data[asset] = response_flat
+            return convert_flatten(response['data'])
+
+        responses = self.fan_out(get_asset_data, asset_slugs)
+        response_data = {asset: response_flat for asset, response_flat
+                         in zip(asset_slugs, responses) if response_flat is not None}
 
         if to_dataframe:
             return pd.DataFrame.from_dict(response_data, orient='index')
@@ -237,12 +290,15 @@ class Messari(DataLoader):
             payload['fields'] = fields_payload(asset_fields='id',
                                                asset_profile_metric=asset_profile_metric)
         base_url_template = Template(f'{BASE_URL_V2}/$asset_key/profile')
-        response_data = {}
-        for asset in asset_slugs:
+
+        def get_asset_data(asset):
             url = base_url_template.substitute(asset_key=asset)
             response = self.get_response(url, params=payload, headers=self.api_dict)
-            response_flat = convert_flatten(response['data'])
-            response_data[asset] = response_flat
+            return convert_flatten(response['data'])
+
+        responses = self.fan_out(get_asset_data, asset_slugs)
+        response_data = {asset: response_flat for asset, response_flat
+                         in zip(asset_slugs, responses) if response_flat is not None}
         return response_data
 
     def get_asset_metrics(self, asset_slugs: Union[str, List],
@@ -295,12 +351,15 @@ class Messari(DataLoader):
             # payload['fields'] = fields_payload(asset_fields='id', asset_metric=asset_metric)
             payload['fields'] = f'id,symbol,{asset_metric}'
         base_url_template = Template(f'{BASE_URL_V1}/$asset_key/metrics')
-        response_data = {}
-        for asset in asset_slugs:
+
+        def get_asset_data(asset):
             url = base_url_template.substitute(asset_key=asset)
             response = self.get_response(url, params=payload, headers=self.api_dict)
-            response_flat = convert_flatten(response['data'])
-            response_data[asset] = response_flat
+            return convert_flatten(response['data'])
+
+        responses = self.fan_out(get_asset_data, asset_slugs)
+        response_data = {asset: response_flat for asset, response_flat
+                         in zip(asset_slugs, responses) if response_flat is not None}
         if to_dataframe:
             return pd.DataFrame.from_dict(response_data, orient='index')
         return response_data
@@ -536,12 +595,15 @@ class Messari(DataLoader):
             payload['start'] = start
             payload['end'] = end
         base_url_template = Template(f'{BASE_URL}/$asset_key/metrics/{asset_metric}/time-series')
-        response_data = {}
-        for asset in asset_slugs:
+
+        def get_asset_data(asset):
             url = base_url_template.substitute(asset_key=asset)
             response = self.get_response(url, params=payload, headers=self.api_dict)
-            response_flat = convert_flatten(response['data'])
-            response_data[asset] = response_flat
+            return convert_flatten(response['data'])
+
+        responses = self.fan_out(get_asset_data, asset_slugs)
+        response_data = {asset: response_flat for asset, response_flat
+                         in zip(asset_slugs, responses) if response_flat is not None}
         if to_dataframe:
             timeseries_df = timeseries_to_dataframe(response_data)
             if asset_metric != 'price':
@@ -549,3 +611,9 @@ class Messari(DataLoader):
                 timeseries_df = timeseries_df.xs(col_name, axis=1, level=1)
             return timeseries_df
         return response_data
+
+
+class AsyncMessari(AsyncDataLoader, Messari):
+    """This class is an asyncio wrapper around the Messari API,
+    every public Messari method is a coroutine
+    """
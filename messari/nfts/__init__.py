@@ -1,7 +1,7 @@
 """Module to handle initialization, imports, for nft classes"""
 
 # Localize imports of nft apis
-from .upshot import Upshot
-from .nftpricefloor import NFTPriceFloor
-from .nonfungible import NonFungible
-from .opensea import OpenSea
+from .upshot import Upshot, AsyncUpshot
+from .nftpricefloor import NFTPriceFloor, AsyncNFTPriceFloor
+from .nonfungible import NonFungible, AsyncNonFungible
+from .opensea import OpenSea, AsyncOpenSea
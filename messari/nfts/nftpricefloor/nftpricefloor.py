@@ -1,6 +1,7 @@
 """This module is meant to contain the NFTPriceFloor class"""
 
 from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
 from messari.utils import validate_input
 import pandas as pd
 from string import Template
@@ -42,12 +43,20 @@ class NFTPriceFloor(DataLoader):
                 DataFrame with timeseries price floor
         """
         collections = validate_input(collection_in)
-        df_list = []
-        for collection in collections:
+
+        def get_floor_df(collection):
             endpoint_url = COLLECTION_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url, params=COLLECTION_PARAMS)
             tmp_df = pd.DataFrame(response)
             tmp_df.set_index('dates', inplace=True)
-            df_list.append(tmp_df)
-        floor_df = pd.concat(df_list, keys=collections, axis=1)
+            return tmp_df
+
+        df_list = self.fan_out(get_floor_df, collections)
+        floor_df = self.concat_entities(df_list, collections, key_name='collection')
         return floor_df
+
+
+class AsyncNFTPriceFloor(AsyncDataLoader, NFTPriceFloor):
+    """This class is an asyncio wrapper around the NFTPriceFloor API,
+    every public NFTPriceFloor method is a coroutine
+    """
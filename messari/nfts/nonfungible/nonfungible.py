@@ -1,6 +1,7 @@
 """This module is meant to contain the NonFungible class"""
 
 from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
 from messari.utils import validate_input, validate_int
 from typing import Union, List
 from string import Template
@@ -38,13 +39,13 @@ class NonFungible(DataLoader):
 
         collections = validate_input(collections_in)
 
-        df_list=[]
-        for collection in collections:
+        def get_history_df(collection):
             endpoint_url = COLLECTION_HISTORY_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url, params=params)
-            tmp_df = pd.DataFrame(response['data']['sales'][0]['sales'])
-            df_list.append(tmp_df)
-        collections_df = pd.concat(df_list, keys=collections, axis=1)
+            return pd.DataFrame(response['data']['sales'][0]['sales'])
+
+        df_list = self.fan_out(get_history_df, collections)
+        collections_df = self.concat_entities(df_list, collections, key_name='collection')
         return collections_df
 
     def get_collection_stats(self, collections_in: Union[str, List], length: int=30) -> pd.DataFrame:
@@ -67,17 +68,17 @@ class NonFungible(DataLoader):
 
         collections = validate_input(collections_in)
 
-        series_list=[]
-        for collection in collections:
+        def get_stats_series(collection):
             endpoint_url = COLLECTION_STATS_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url, params=params)
             tmp_df = pd.DataFrame(response['data'])
             keys = tmp_df['key'].tolist()
             data = tmp_df['data'].tolist()
             series_dict = dict(zip(keys,data))
-            tmp_series = pd.Series(series_dict)
-            series_list.append(tmp_series)
-        collections_df = pd.concat(series_list, keys=collections, axis=1)
+            return pd.Series(series_dict)
+
+        series_list = self.fan_out(get_stats_series, collections)
+        collections_df = self.concat_entities(series_list, collections, key_name='collection')
         return collections_df
 
     def get_collection_summary(self, collections_in: Union[str, List]) -> pd.DataFrame:
@@ -95,16 +96,21 @@ class NonFungible(DataLoader):
         """
 
         collections = validate_input(collections_in)
-        series_list=[]
-        for collection in collections:
+
+        def get_summary_series(collection):
             endpoint_url = COLLECTION_SUMMARY_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url)
             response_dict = response['data']['totals'][0]
             response_dict.update(response_dict['totals']['alltime']) #upack
             response_dict.pop('totals')
-            tmp_series = pd.Series(response_dict)
+            return pd.Series(response_dict)
 
-            series_list.append(tmp_series)
-        collections_df = pd.concat(series_list, keys=collections, axis=1)
+        series_list = self.fan_out(get_summary_series, collections)
+        collections_df = self.concat_entities(series_list, collections, key_name='collection')
         return collections_df
 
+
+class AsyncNonFungible(AsyncDataLoader, NonFungible):
+    """This class is an asyncio wrapper around the NonFungible API,
+    every public NonFungible method is a coroutine
+    """
@@ -2,6 +2,7 @@
 """This module is meant to contain the OpenSea class"""
 
 from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
 from messari.utils import validate_input
 
 from string import Template
@@ -54,18 +55,22 @@ class OpenSea(DataLoader):
 
         contracts = validate_input(contracts_in)
         assets = validate_input(assets_in)
+
+        def get_asset_series(pair):
+            contract, asset = pair
+            endpoint_url = ASSET_URL.substitute(contract=contract, id=asset)
+            response = self.get_response(endpoint_url, params=params, headers=headers)
+            return pd.Series(response)
+
+        pairs = [(contract, asset) for contract in contracts for asset in assets]
+        responses = self.fan_out(get_asset_series, pairs)
+
         df_list=[]
-        for contract in contracts:
-            series_list=[]
-            for asset in assets:
-                endpoint_url = ASSET_URL.substitute(contract=contract, id=asset)
-                response = self.get_response(endpoint_url, params=params, headers=headers)
-
-                tmp_series=pd.Series(response)
-                series_list.append(tmp_series)
-            tmp_df=pd.concat(series_list, keys=assets, axis=1)
+        for index in range(len(contracts)):
+            series_list = responses[index * len(assets):(index + 1) * len(assets)]
+            tmp_df=self.concat_entities(series_list, assets, key_name='asset')
             df_list.append(tmp_df)
-        assets_df=pd.concat(df_list, keys=contracts, axis=1)
+        assets_df=self.concat_entities(df_list, contracts, key_name='contract')
         return assets_df
 
     def get_contract(self, contracts_in: Union[str, List]) -> pd.DataFrame:
@@ -89,14 +94,13 @@ class OpenSea(DataLoader):
 
         contracts = validate_input(contracts_in)
 
-        df_list=[]
-        for contract in contracts:
+        def get_contract_df(contract):
             endpoint_url = CONTRACT_URL.substitute(contract=contract)
             response = self.get_response(endpoint_url, headers=headers)
-            tmp_df = pd.DataFrame(response)
+            return pd.DataFrame(response)
 
-            df_list.append(tmp_df)
-        contracts_df = pd.concat(df_list, keys=contracts, axis=1)
+        df_list = self.fan_out(get_contract_df, contracts)
+        contracts_df = self.concat_entities(df_list, contracts, key_name='contract')
         return contracts_df
 
     def get_collection(self, collections_in: Union[str, List]) -> pd.DataFrame:
@@ -121,14 +125,13 @@ class OpenSea(DataLoader):
 
         collections = validate_input(collections_in)
 
-        df_list=[]
-        for collection in collections:
+        def get_collection_df(collection):
             endpoint_url = COLLECTION_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url, headers=headers)
-            tmp_df = pd.DataFrame(response)
+            return pd.DataFrame(response)
 
-            df_list.append(tmp_df)
-        collections_df = pd.concat(df_list, keys=collections, axis=1)
+        df_list = self.fan_out(get_collection_df, collections)
+        collections_df = self.concat_entities(df_list, collections, key_name='collection')
         return collections_df
 
     # NOTE requires api-key
@@ -187,13 +190,12 @@ class OpenSea(DataLoader):
 
         collections = validate_input(collections_in)
 
-        df_list=[]
-        for collection in collections:
+        def get_stats_df(collection):
             endpoint_url = STATS_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url, headers=headers)
-            tmp_df = pd.DataFrame(response)
+            return pd.DataFrame(response)
 
-            df_list.append(tmp_df)
+        df_list = self.fan_out(get_stats_df, collections)
         collections_df = pd.concat(df_list, keys=collections, axis=1)
         fin_df = collections_df.xs('stats', axis=1, level=1)
         return fin_df
@@ -207,3 +209,9 @@ class OpenSea(DataLoader):
     #    else:
     #        headers = HEADERS
     #    return
+
+
+class AsyncOpenSea(AsyncDataLoader, OpenSea):
+    """This class is an asyncio wrapper around the OpenSea API,
+    every public OpenSea method is a coroutine
+    """
@@ -1,6 +1,8 @@
 """This module is meant to contain the Upshot class"""
 
 from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
+from messari.pagination import Paginator
 from messari.utils import validate_input, validate_int
 from typing import Union, List
 
@@ -40,7 +42,7 @@ class Upshot(DataLoader):
             limit: int
                 if no asset_id is given, set number of assets to get from contracts
             offset: int
-                for pagination
+                for pagination, see iter_assets to page through a contract's assets
 
         Returns
         -------
@@ -58,30 +60,61 @@ class Upshot(DataLoader):
         if asset_id:
             assets = validate_int(asset_id)
 
-        df_list = []
-        for contract in contracts:
-            # need to use either contract or asset id, upshot api is weird
-            if asset_id:
-                responses = []
-                # NOTE: you can do a request w/ repeated values for 'assetId' but making
-                # this work within python is not easy, just looping for now but this can
-                # be made better
-                for asset in assets:
-                    parameters['assetId'] = f'{contract}/{asset}'
-                    response = self.get_response(ASSET_URL, params=parameters)['data']
-                    responses.append(response['assets'][0])
-                asset_df = pd.DataFrame(responses)
-
-
-            else:
-                parameters['contractAddress'] = contract
-                response = self.get_response(ASSET_URL, params=parameters)['data']
-                asset_df = pd.DataFrame(response['assets'])
-
-            df_list.append(asset_df)
-        assets_df = pd.concat(df_list, keys=contracts, axis=1)
+        # need to use either contract or asset id, upshot api is weird
+        if asset_id:
+            # NOTE: you can do a request w/ repeated values for 'assetId' but making
+            # this work within python is not easy, fanning out one request per asset
+            def get_asset_data(pair):
+                contract, asset = pair
+                asset_params = dict(parameters, assetId=f'{contract}/{asset}')
+                response = self.get_response(ASSET_URL, params=asset_params)['data']
+                return response['assets'][0]
+
+            pairs = [(contract, asset) for contract in contracts for asset in assets]
+            responses = self.fan_out(get_asset_data, pairs)
+
+            df_list = []
+            for index in range(len(contracts)):
+                contract_responses = responses[index * len(assets):(index + 1) * len(assets)]
+                asset_df = pd.DataFrame([x for x in contract_responses if x is not None])
+                df_list.append(asset_df)
+
+        else:
+            def get_contract_df(contract):
+                contract_params = dict(parameters, contractAddress=contract)
+                response = self.get_response(ASSET_URL, params=contract_params)['data']
+                return pd.DataFrame(response['assets'])
+
+            df_list = self.fan_out(get_contract_df, contracts)
+        assets_df = self.concat_entities(df_list, contracts, key_name='contract')
         return assets_df
 
+    def iter_assets(self, contract_address: str, page_size: int=100,
+                    prefetch: int=0) -> Paginator:
+        """lazily page through the assets of a contract
+
+        Parameters
+        ----------
+            contract_address: str
+                single address in
+            page_size: int
+                assets per request
+            prefetch: int
+                pages requested concurrently ahead of the one being read
+
+        Returns
+        -------
+            Paginator
+                yields asset dicts, iter_pages() yields lists of them
+        """
+        def get_page(page):
+            params = {'contractAddress': contract_address,
+                      'limit': page_size,
+                      'offset': page * page_size}
+            return self.get_response(ASSET_URL, params=params)['data']['assets']
+
+        return self.paginate(get_page, page_size=page_size, prefetch=prefetch)
+
     def get_asset_events(self,
                          contract_address: Union[str, List],
                          asset_id: Union[int, List],
@@ -120,19 +153,22 @@ class Upshot(DataLoader):
         contracts = validate_input(contract_address)
         assets = validate_int(asset_id)
 
-        df_list_top = []
-        for contract in contracts:
-            df_list = []
-            for asset in assets:
-                parameters['assetId'] = f'{contract}/{asset}'
-                response = self.get_response(ASSET_EVENTS_URL, params=parameters)['data'][0]
-                tmp_df = pd.DataFrame(response['events'])
-                df_list.append(tmp_df)
+        def get_events_df(pair):
+            contract, asset = pair
+            asset_params = dict(parameters, assetId=f'{contract}/{asset}')
+            response = self.get_response(ASSET_EVENTS_URL, params=asset_params)['data'][0]
+            return pd.DataFrame(response['events'])
+
+        pairs = [(contract, asset) for contract in contracts for asset in assets]
+        responses = self.fan_out(get_events_df, pairs)
 
-            assets_df = pd.concat(df_list, keys=assets, axis=1)
+        df_list_top = []
+        for index in range(len(contracts)):
+            df_list = responses[index * len(assets):(index + 1) * len(assets)]
+            assets_df = self.concat_entities(df_list, assets, key_name='asset')
             df_list_top.append(assets_df)
 
-        events_df = pd.concat(df_list_top, keys=contracts, axis=1)
+        events_df = self.concat_entities(df_list_top, contracts, key_name='contract')
         return events_df
 
 
@@ -181,19 +217,22 @@ class Upshot(DataLoader):
         contracts = validate_input(contract_address)
         assets = validate_int(asset_id)
 
-        df_list_top = []
-        for contract in contracts:
-            df_list = []
-            for asset in assets:
-                parameters['assetId'] = f'{contract}/{asset}'
-                response = self.get_response(PRICING_URL, params=parameters)['data']
-                tmp_df = format_df(pd.DataFrame(response['pricings']))
-                df_list.append(tmp_df)
+        def get_pricing_df(pair):
+            contract, asset = pair
+            asset_params = dict(parameters, assetId=f'{contract}/{asset}')
+            response = self.get_response(PRICING_URL, params=asset_params)['data']
+            return format_df(pd.DataFrame(response['pricings']))
+
+        pairs = [(contract, asset) for contract in contracts for asset in assets]
+        responses = self.fan_out(get_pricing_df, pairs)
 
-            assets_df = pd.concat(df_list, keys=assets, axis=1)
+        df_list_top = []
+        for index in range(len(contracts)):
+            df_list = responses[index * len(assets):(index + 1) * len(assets)]
+            assets_df = self.concat_entities(df_list, assets, key_name='asset')
             df_list_top.append(assets_df)
 
-        prices_df = pd.concat(df_list_top, keys=contracts, axis=1)
+        prices_df = self.concat_entities(df_list_top, contracts, key_name='contract')
         return prices_df
 
 
@@ -232,18 +271,26 @@ class Upshot(DataLoader):
         contracts = validate_input(contract_address)
         assets = validate_int(asset_id)
 
-        df_list_top = []
-        for contract in contracts:
-            df_list = []
-            for asset in assets:
-                parameters['assetId'] = f'{contract}/{asset}'
-                response = self.get_response(PRICING_CURRENT_URL, params=parameters)['data']
-                tmp_df = format_df(pd.DataFrame(response['pricings']))
-                df_list.append(tmp_df)
+        def get_pricing_df(pair):
+            contract, asset = pair
+            asset_params = dict(parameters, assetId=f'{contract}/{asset}')
+            response = self.get_response(PRICING_CURRENT_URL, params=asset_params)['data']
+            return format_df(pd.DataFrame(response['pricings']))
+
+        pairs = [(contract, asset) for contract in contracts for asset in assets]
+        responses = self.fan_out(get_pricing_df, pairs)
 
-            assets_df = pd.concat(df_list, keys=assets, axis=1)
+        df_list_top = []
+        for index in range(len(contracts)):
+            df_list = responses[index * len(assets):(index + 1) * len(assets)]
+            assets_df = self.concat_entities(df_list, assets, key_name='asset')
             df_list_top.append(assets_df)
 
-        prices_df = pd.concat(df_list_top, keys=contracts, axis=1)
+        prices_df = self.concat_entities(df_list_top, contracts, key_name='contract')
         return prices_df
 
+
+class AsyncUpshot(AsyncDataLoader, Upshot):
+    """This class is an asyncio wrapper around the Upshot API,
+    every public Upshot method is a coroutine
+    """
@@ -0,0 +1,152 @@
+"""This module is meant to contain the Paginator classes returned by the iter_ methods
+of data sources"""
+
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Iterator, List, Union
+
+
+class Paginator:
+    """Lazy iterator over the pages of a paginated endpoint.
+
+    Pages are fetched only as they are consumed, optionally with the next
+    prefetch pages requested concurrently on the loader's executor. Iteration
+    stops at the first empty page or the first page shorter than page_size.
+
+    Iterating a Paginator yields records, use iter_pages for whole pages.
+    """
+
+    def __init__(self, loader: Any, fetch_page: Callable[[int], List],
+                 page_size: Union[int, None] = None, start: int = 0,
+                 prefetch: int = 0, max_pages: Union[int, None] = None):
+        """
+        Parameters
+        ----------
+            loader: DataLoader
+                Data source making the requests
+            fetch_page: Callable
+                Returns the list of records on a page, given its page number
+            page_size: int
+                Records on a full page, a shorter page is the last one. None only
+                stops on an empty page
+            start: int
+                Number of the first page, i.e. 1 for APIs counting pages from 1
+            prefetch: int
+                Pages requested ahead of the one being consumed
+            max_pages: int
+                Stop after this many pages, for APIs w/ a result window
+        """
+        if prefetch < 0:
+            raise ValueError('prefetch should be at least 0')
+        self.loader = loader
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.start = start
+        self.prefetch = prefetch
+        self.max_pages = max_pages
+
+    def __iter__(self) -> Iterator:
+        return self.iter_records()
+
+    def is_last_page(self, records: List, page_count: int) -> bool:
+        """True if no page should be requested after this one"""
+        if self.page_size is not None and len(records) < self.page_size:
+            return True
+        return self.max_pages is not None and page_count >= self.max_pages
+
+    def page_numbers(self) -> Iterator[int]:
+        """Page numbers in request order, bounded by max_pages"""
+        page = self.start
+        while self.max_pages is None or page < self.start + self.max_pages:
+            yield page
+            page += 1
+
+    def iter_pages(self) -> Iterator[List]:
+        """Yields the list of records on each page, in page order"""
+        # workers waiting on the executor they run on could deadlock, fetch inline
+        inline = self.prefetch == 0 or self.loader.max_workers < 2 or self.loader.in_worker()
+        numbers = self.page_numbers()
+        pending: deque = deque()
+        page_count = 0
+        try:
+            while True:
+                if inline:
+                    number = next(numbers, None)
+                    if number is None:
+                        return
+                    records = self.fetch_page(number)
+                else:
+                    executor = self.loader._get_executor()  # pylint: disable=protected-access
+                    while len(pending) <= self.prefetch:
+                        number = next(numbers, None)
+                        if number is None:
+                            break
+                        pending.append(executor.submit(self.fetch_page, number))
+                    if not pending:
+                        return
+                    records = pending.popleft().result()
+
+                page_count += 1
+                if not records:
+                    return
+                yield records
+                if self.is_last_page(records, page_count):
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def iter_records(self) -> Iterator:
+        """Yields every record, one page in memory at a time"""
+        for records in self.iter_pages():
+            yield from records
+
+
+class AsyncPaginator(Paginator):
+    """Paginator for async data sources, iterate it w/ async for.
+    Prefetched pages are fetched concurrently on the loader's connector.
+    """
+
+    def __iter__(self):
+        raise TypeError(f'{type(self).__name__} is iterated w/ async for')
+
+    def __aiter__(self) -> AsyncIterator:
+        return self.iter_records()
+
+    async def iter_pages(self) -> AsyncIterator[List]:  # pylint: disable=invalid-overridden-method
+        """Yields the list of records on each page, in page order"""
+        numbers = self.page_numbers()
+        pending: deque = deque()
+        page_count = 0
+        try:
+            while True:
+                while len(pending) <= self.prefetch:
+                    number = next(numbers, None)
+                    if number is None:
+                        break
+                    pending.append(asyncio.ensure_future(self._fetch_page(number)))
+                if not pending:
+                    return
+
+                records = await pending.popleft()
+                page_count += 1
+                if not records:
+                    return
+                yield records
+                if self.is_last_page(records, page_count):
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter_records(self) -> AsyncIterator:  # pylint: disable=invalid-overridden-method
+        """Yields every record, one page in memory at a time"""
+        async for records in self.iter_pages():
+            for record in records:
+                yield record
+
+    async def _fetch_page(self, number: int) -> List:
+        """Replay fetch_page until its requests are fetched"""
+        return await self.loader._replay(  # pylint: disable=protected-access
+            lambda _, page: self.fetch_page(page), number)
@@ -0,0 +1,128 @@
+"""This module is meant to contain the RateLimiter class & retry helpers used by DataLoader"""
+
+
+import datetime
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# HTTP statuses worth retrying, everything else is raised right away
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """Token bucket allowing `calls` requests every `period` seconds.
+
+    reserve() hands out a token & returns how long the caller has to wait
+    before using it, so the bucket works for both threads (time.sleep)
+    and coroutines (asyncio.sleep). calls None doesn't limit requests, the
+    bucket only holds them after penalize.
+    """
+
+    def __init__(self, calls: Optional[float], period: float = 1.0):
+        if calls is not None and (calls <= 0 or period <= 0):
+            raise ValueError('calls and period should be positive')
+        self.rate = None if calls is None else calls / period
+        self.capacity = None if calls is None else max(float(calls), 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token, returns the seconds to wait before making the request"""
+        with self._lock:
+            now = time.monotonic()
+            if self.rate is None:
+                return max(0.0, self._blocked_until - now)
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._blocked_until - now)
+
+    def penalize(self, delay: float) -> None:
+        """Hold every request for delay seconds, i.e. after a 429 w/ Retry-After"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+
+class RateLimiter:
+    """Per-host token buckets. Every host a data source talks to gets its own
+    bucket with the default limit, unless a limit is set for that host.
+    """
+
+    def __init__(self, calls: float, period: float = 1.0, host_limits: Dict = None):
+        self.calls = calls
+        self.period = period
+        self.host_limits = host_limits or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, url: str) -> TokenBucket:
+        """Returns the bucket for the host of url"""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                calls, period = self.host_limits.get(host, (self.calls, self.period))
+                self._buckets[host] = TokenBucket(calls, period)
+            return self._buckets[host]
+
+    def set_host_limit(self, host: str, calls: Optional[float], period: float = 1.0) -> None:
+        """Gives host a limit of its own, calls None doesn't limit it"""
+        with self._lock:
+            self.host_limits[host] = (calls, period)
+            self._buckets.pop(host, None)
+
+    def reserve(self, url: str) -> float:
+        """Takes a token for the host of url, returns the seconds to wait"""
+        return self.get_bucket(url).reserve()
+
+    def penalize(self, url: str, delay: float) -> None:
+        """Hold every request to the host of url for delay seconds"""
+        self.get_bucket(url).penalize(delay)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header, either delay seconds or an HTTP date
+
+    :param value: str
+        Retry-After header value
+    :return: seconds to wait or None if missing/malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max((retry_at - now).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, base: float, maximum: float,
+                  retry_after: Optional[float] = None) -> float:
+    """Seconds to wait before a retry, exponential backoff w/ full jitter.
+    A Retry-After from the server takes priority over the backoff.
+
+    :param attempt: int
+        Number of retries already made, starting at 0
+    :param base: float
+        Backoff for the first retry
+    :param maximum: float
+        Upper bound of the backoff
+    :param retry_after: float
+        Parsed Retry-After header if the server sent one
+    :return: seconds to wait
+    """
+    if retry_after is not None:
+        # small jitter so workers that got the same header don't retry in lockstep
+        return retry_after + random.uniform(0, base)
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
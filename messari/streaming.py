@@ -0,0 +1,207 @@
+"""This module is meant to contain the incremental JSON parsing behind
+DataLoader.stream_response & the ColumnBuffer class it fills"""
+
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Pattern, Tuple, Union
+
+import pandas as pd
+
+from messari.jsonbackend import get_json_loads
+
+try:
+    import ijson
+except ImportError:  # streaming is optional, responses are parsed whole w/o it
+    ijson = None
+
+# ijson events for values that aren't containers
+_SCALAR_EVENTS = ('null', 'boolean', 'integer', 'double', 'number', 'string')
+
+
+class ColumnBuffer:
+    """Columns of JSON items, filled one item at a time.
+
+    Object items add a value to each of their keys' columns, keys missing from
+    an item are filled with None. Scalar items go to the 'value' column.
+    """
+
+    def __init__(self, flatten: bool = False):
+        """
+        Parameters
+        ----------
+            flatten: bool
+                Merge the keys of nested objects into the item,
+                i.e. {'date': 1, 'tokens': {'DAI': 2}} becomes {'date': 1, 'DAI': 2}
+        """
+        self.flatten = flatten
+        self.columns: Dict[str, List] = {}
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def append(self, item: Any) -> None:
+        """Adds an item as the next row"""
+        if not isinstance(item, dict):
+            item = {'value': item}
+        elif self.flatten:
+            item = flatten_item(item)
+
+        for key, value in item.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * self.length
+            column.append(value)
+        self.length += 1
+        if len(item) < len(self.columns):
+            for column in self.columns.values():
+                if len(column) < self.length:
+                    column.append(None)
+
+    def to_list(self) -> List:
+        """Scalar items in order"""
+        return self.columns.get('value', [])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Items as a DataFrame, one row per item"""
+        return pd.DataFrame(self.columns)
+
+
+def flatten_item(item: Dict) -> Dict:
+    """Merge the keys of nested objects into item, the nested object's key is dropped"""
+    flat = {}
+    for key, value in item.items():
+        if isinstance(value, dict):
+            flat.update(value)
+        else:
+            flat[key] = value
+    return flat
+
+
+def compile_patterns(patterns: Iterable[str]) -> List[Tuple[str, Pattern]]:
+    """Compiles ijson style prefixes, i.e. 'chainTvls.*.tvl.item',
+    '*' matches any single key & 'item' matches every array element"""
+    compiled = []
+    for pattern in patterns:
+        parts = ['[^.]+' if part == '*' else re.escape(part) for part in pattern.split('.')]
+        compiled.append((pattern, re.compile(r'\.'.join(parts) + '$')))
+    return compiled
+
+
+class ChunkReader:
+    """Minimal file object over an iterator of byte chunks, lets ijson read
+    a response body as it comes off the socket"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks: Iterator[bytes] = iter(chunks)
+
+    def read(self, size: int = -1) -> bytes:
+        """Next non-empty chunk, b'' once the body is exhausted"""
+        # ijson reads 0 bytes to check the file is binary
+        if size == 0:
+            return b''
+        for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b''
+
+
+def stream_columns(source: Any, patterns: Iterable[str],
+                   flatten: bool = False) -> Dict[str, ColumnBuffer]:
+    """Parses JSON from source incrementally, keeping only the items found at patterns.
+
+    :param source: file object
+        Anything w/ a read method returning bytes, see ChunkReader
+    :param patterns: list
+        ijson style prefixes of the items to keep, see compile_patterns
+    :param flatten: bool
+        Merge nested objects into their item, see ColumnBuffer
+    :return: {prefix: ColumnBuffer}, patterns w/o wildcards are always present
+        & wildcard patterns have one buffer per matching prefix
+    """
+    compiled = compile_patterns(patterns)
+    buffers = {pattern: ColumnBuffer(flatten) for pattern, _ in compiled if '*' not in pattern}
+
+    def get_buffer(prefix):
+        buffer = buffers.get(prefix)
+        if buffer is None:
+            buffer = buffers[prefix] = ColumnBuffer(flatten)
+        return buffer
+
+    if ijson is None:
+        return select_columns(get_json_loads()(_read_all(source)), patterns, flatten=flatten)
+
+    # prefix -> matches a pattern, prefixes repeat for every item so match each once
+    matches: Dict[str, bool] = {}
+    builder, depth, target = None, 0, None
+    for prefix, event, value in ijson.parse(source, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+                if depth == 0:
+                    target.append(builder.value)
+                    builder = None
+            continue
+
+        matched = matches.get(prefix)
+        if matched is None:
+            matched = matches[prefix] = any(regex.match(prefix) for _, regex in compiled)
+        if not matched:
+            continue
+        if event in ('start_map', 'start_array'):
+            builder, depth, target = ijson.ObjectBuilder(), 1, get_buffer(prefix)
+            builder.event(event, value)
+        elif event in _SCALAR_EVENTS:
+            get_buffer(prefix).append(value)
+    return buffers
+
+
+def select_columns(document: Any, patterns: Iterable[str],
+                   flatten: bool = False) -> Dict[str, ColumnBuffer]:
+    """stream_columns for an already decoded document, faster than streaming
+    when the whole body is in memory anyway
+
+    :param document: dict, list
+        Decoded JSON document
+    :param patterns: list
+        ijson style prefixes of the items to keep, see compile_patterns
+    :param flatten: bool
+        Merge nested objects into their item, see ColumnBuffer
+    :return: {prefix: ColumnBuffer} like stream_columns
+    """
+    compiled = compile_patterns(patterns)
+    buffers = {pattern: ColumnBuffer(flatten) for pattern, _ in compiled if '*' not in pattern}
+    for prefix, item in _walk_document(document, compiled):
+        buffer = buffers.get(prefix)
+        if buffer is None:
+            buffer = buffers[prefix] = ColumnBuffer(flatten)
+        buffer.append(item)
+    return buffers
+
+
+def _read_all(source: Any) -> bytes:
+    """Whole body of a file object, used when ijson isn't installed"""
+    chunks = []
+    while True:
+        chunk = source.read(65536)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+
+def _walk_document(node: Any, compiled: List[Tuple[str, Pattern]],
+                   path: Union[str, None] = None) -> Iterator[Tuple[str, Any]]:
+    """Yields (prefix, item) for items of a decoded document matching a pattern,
+    prefixes are built the way ijson builds them"""
+    if path is not None and any(regex.match(path) for _, regex in compiled):
+        yield path, node
+        return
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from _walk_document(value, compiled, key if path is None else f'{path}.{key}')
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk_document(value, compiled, 'item' if path is None else f'{path}.item')
@@ -6,6 +6,7 @@ from typing import List, Union
 import pandas as pd
 
 from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
 from messari.utils import get_taxonomy_dict, time_filter_df
 from .helpers import response_to_df
 
@@ -86,16 +87,17 @@ class TokenTerminal(DataLoader):
         """
         protocols = self.translate(protocol_ids)
 
-        df_list = []
-        for protocol in protocols:
+        def get_protocol_df(protocol):
             url = f'{BASE_URL}/{protocol}/metrics'
             data = self.get_response(url, headers=self.api_dict)
             df = pd.DataFrame(data)
             df.set_index('datetime', inplace=True)
             df.index = pd.to_datetime(df.index, format='%Y-%m-%dT%H:%M:%S').date  # noqa
-            df_list.append(df)
+            return df
 
-        final_df = pd.concat(df_list, keys=protocols, axis=1)
+        df_list = self.fan_out(get_protocol_df, protocols)
+
+        final_df = self.concat_entities(df_list, protocols, key_name='protocol')
         final_df = time_filter_df(final_df, start_date=start_date, end_date=end_date)
         return final_df
 
@@ -140,13 +142,21 @@ class TokenTerminal(DataLoader):
         metric_df = pd.DataFrame()
         ids = self.translate(protocol_ids)
 
-        for protocol_id in ids:
+        def get_metric_df(protocol_id):
             url = url_temp.substitute(asset_key=protocol_id)
             data = self.get_response(url, headers=self.api_dict)
             data_df = response_to_df(data)
             single_metric_df = data_df[metric].to_frame()
             single_metric_df.columns = [protocol_id]
-            single_metric_df = time_filter_df(single_metric_df,
-                                              start_date=start_date, end_date=end_date)
-            metric_df = metric_df.join(single_metric_df, how='outer')
+            return time_filter_df(single_metric_df, start_date=start_date, end_date=end_date)
+
+        for single_metric_df in self.fan_out(get_metric_df, ids):
+            if single_metric_df is not None:
+                metric_df = metric_df.join(single_metric_df, how='outer')
         return metric_df
+
+
+class AsyncTokenTerminal(AsyncDataLoader, TokenTerminal):
+    """This class is an asyncio wrapper around the Token Terminal API,
+    every public TokenTerminal method is a coroutine
+    """
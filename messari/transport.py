@@ -0,0 +1,157 @@
+"""This module is meant to contain the TransportConfig class & the HTTP sessions built from it"""
+
+
+import threading
+from typing import Dict, Iterator, List, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 is optional
+    httpx = None
+
+# Errors raised by raise_for_status for every supported session type
+HTTP_ERRORS = (requests.exceptions.HTTPError,) + \
+    ((httpx.HTTPStatusError,) if httpx is not None else ())
+
+
+class TransportConfig:
+    """HTTP transport settings for DataLoaders
+
+    Parameters
+    ----------
+        pool_maxsize: int
+            Connections kept open per host, None sizes the pool to the loader's max_workers
+        pool_connections: int
+            Number of hosts to keep connection pools for
+        keep_alive: bool
+            Reuse connections between requests, False closes them after every response
+        connect_timeout: float
+            Seconds to wait for a connection, None waits forever
+        read_timeout: float
+            Seconds to wait between bytes of the response, None waits forever
+        http2: bool
+            Use HTTP/2 where servers support it, requires httpx[http2]
+    """
+
+    def __init__(self, pool_maxsize: int = None, pool_connections: int = 10,
+                 keep_alive: bool = True, connect_timeout: Union[float, None] = 10,
+                 read_timeout: Union[float, None] = 60, http2: bool = False):
+        if http2 and httpx is None:
+            raise ImportError('HTTP/2 requires httpx, pip install "httpx[http2]"')
+        self.pool_maxsize = pool_maxsize
+        self.pool_connections = pool_connections
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.http2 = http2
+
+    def key(self, pool_maxsize: int) -> Tuple:
+        """Settings identifying a shared session, pool_maxsize is the resolved pool size"""
+        return (pool_maxsize, self.pool_connections, self.keep_alive,
+                self.connect_timeout, self.read_timeout, self.http2)
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies default timeouts to every request"""
+
+    def __init__(self, timeout: Tuple):
+        requests.Session.__init__(self)
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):  # pylint: disable=arguments-differ
+        kwargs.setdefault('timeout', self.timeout)
+        return requests.Session.request(self, method, url, **kwargs)
+
+
+def create_session(config: TransportConfig, pool_maxsize: int):
+    """Builds an HTTP session from config
+
+    :param config: TransportConfig
+        Transport settings
+    :param pool_maxsize: int
+        Connections kept open per host
+    :return: requests.Session or httpx.Client w/ HTTP/2
+    """
+    if config.http2:
+        limits = httpx.Limits(max_connections=None,
+                              max_keepalive_connections=pool_maxsize if config.keep_alive else 0)
+        timeout = httpx.Timeout(config.read_timeout, connect=config.connect_timeout)
+        return httpx.Client(http2=True, limits=limits, timeout=timeout)
+
+    session = TimeoutSession(timeout=(config.connect_timeout, config.read_timeout))
+    adapter = HTTPAdapter(pool_connections=config.pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not config.keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+def send_get(session, url: str, params: List, headers: Dict, stream: bool = False):
+    """GET w/ either session type, a streamed response's body is read by the caller
+
+    :param session: requests.Session or httpx.Client
+        Session from create_session
+    :param url: str
+        URL API string.
+    :param params: list
+        Flattened (key, value) query parameters
+    :param headers: dict
+        Request headers
+    :param stream: bool
+        True returns as soon as the headers arrive, the caller closes the response
+    :return: requests.Response or httpx.Response
+    """
+    if httpx is not None and isinstance(session, httpx.Client):
+        request = session.build_request('GET', url, params=params, headers=headers)
+        return session.send(request, stream=stream)
+    return session.get(url, params=params, headers=headers, stream=stream)
+
+
+def send_post(session, url: str, data: bytes, headers: Dict):
+    """POST a raw body w/ either session type, used for JSON-RPC requests
+
+    :param session: requests.Session or httpx.Client
+        Session from create_session
+    :param url: str
+        URL API string.
+    :param data: bytes
+        Request body
+    :param headers: dict
+        Request headers
+    :return: requests.Response or httpx.Response
+    """
+    if httpx is not None and isinstance(session, httpx.Client):
+        return session.post(url, content=data, headers=headers)
+    return session.post(url, data=data, headers=headers)
+
+
+def iter_body(response, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Body of a streamed response in chunks as they arrive, decompressed"""
+    if httpx is not None and isinstance(response, httpx.Response):
+        return response.iter_bytes(chunk_size)
+    return response.iter_content(chunk_size)
+
+
+_SHARED_SESSIONS: Dict[Tuple, object] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_session(config: TransportConfig, pool_maxsize: int):
+    """Returns the process-wide session for these settings, creating it on first use.
+    Every DataLoader that opts in w/ the same settings shares its connection pool.
+
+    :param config: TransportConfig
+        Transport settings
+    :param pool_maxsize: int
+        Connections kept open per host
+    :return: requests.Session or httpx.Client w/ HTTP/2
+    """
+    key = config.key(pool_maxsize)
+    with _SHARED_LOCK:
+        if key not in _SHARED_SESSIONS:
+            _SHARED_SESSIONS[key] = create_session(config, pool_maxsize)
+        return _SHARED_SESSIONS[key]
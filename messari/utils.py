@@ -149,7 +149,8 @@ def time_filter_df(df_in: pd.DataFrame, start_date: Union[str, datetime.datetime
     """
 
     filtered_df = df_in
-    filtered_df.sort_index(inplace=True)  # Must sort ascending for this to work
+    # Must sort ascending for this to work, stable so long frames keep their entity order
+    filtered_df.sort_index(inplace=True, kind="mergesort")
 
     if start_date:
         start = validate_datetime(start_date)
@@ -164,6 +165,40 @@ def time_filter_df(df_in: pd.DataFrame, start_date: Union[str, datetime.datetime
     return filtered_df
 
 
+def stack_frames(frames: List[Union[pd.DataFrame, pd.Series, None]], keys: List,
+                 key_name: str = "entity") -> pd.DataFrame:
+    """Long (tidy) alternative to pd.concat(frames, keys=keys, axis=1), each entity's
+    rows are stacked under a categorical key_name column instead of being
+    reindexed side by side to the union of every index
+
+    :param frames: list
+        Frame per entity, a Series is one row w/ its index as columns, None is skipped
+    :param keys: list
+        Entity of each frame (slug, account, contract...)
+    :param key_name: str
+        Name of the entity column
+    :return: pandas DataFrame w/ the entity column first, each frame's index is kept
+    """
+    categories = list(dict.fromkeys(keys))
+    codes = {key: code for code, key in enumerate(categories)}
+    rows, row_codes = [], []
+    for key, frame in zip(keys, frames):
+        if frame is None:
+            continue
+        if isinstance(frame, pd.Series):
+            frame = frame.to_frame(name=key).T
+        rows.append(frame)
+        row_codes += [codes[key]] * len(frame)
+    if not rows:
+        return pd.DataFrame({key_name: pd.Categorical([], categories=categories)})
+
+    # frames w/ the default index are numbered per entity, renumber them
+    ignore_index = all(isinstance(frame.index, pd.RangeIndex) for frame in rows)
+    long_df = pd.concat(rows, axis=0, ignore_index=ignore_index)
+    long_df.insert(0, key_name, pd.Categorical.from_codes(row_codes, categories))
+    return long_df
+
+
 def get_taxonomy_dict(filename: str) -> Dict:
     current_path = os.path.dirname(__file__)
     # this file is being called from an install
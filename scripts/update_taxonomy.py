@@ -28,18 +28,10 @@ DL_SLUGS = slugs_series.tolist()
 ########################
 m = Messari()
 
-limit = 500
-page = 1
-messari_assets = m.get_all_assets(page=page, limit=limit)
-current_len = len(messari_assets)
-
-# NOTE: this will probably crash if one page len == limit and the next page len == 0
-while current_len == limit:
-    page += 1
-    # NOTE: pushing up against messari rate limiting here, not sure how to handle user experience
-    new_assets = m.get_all_assets(page=page, limit=limit)
-    messari_assets.update(new_assets)
-    current_len = len(new_assets)
+# NOTE: pages are fetched as they're read & paging stops on the first short page
+messari_assets = {}
+for asset in m.iter_all_assets(limit=500, prefetch=2):
+    messari_assets[asset['slug']] = asset
 
 #########################################
 # Create Messari to DeFi Llama dictionary
@@ -0,0 +1,137 @@
+"""Unit Tests for the AsyncDataLoader class"""
+
+from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import asyncio
+import json
+import threading
+import unittest
+import pandas as pd
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Echo the 'value' query parameter back as JSON, 404 on /missing"""
+    count = 0
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET request"""
+        StubHandler.count += 1
+        url = urlparse(self.path)
+        if url.path == '/missing':
+            self.send_response(404)
+            self.end_headers()
+            return
+        query = parse_qs(url.query)
+        body = json.dumps({'value': int(query['value'][0])}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep test output quiet"""
+
+
+class Stub(DataLoader):
+    """Minimal synchronous data source used to test the async replay"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.parsed = []
+        DataLoader.__init__(self, api_dict=None, taxonomy_dict=None)
+
+    def get_values(self, values):
+        """Fetch every value concurrently"""
+        def get_value(value):
+            return self.get_response(self.base_url, params={'value': value})['value']
+        return pd.Series(self.fan_out(get_value, values), index=values)
+
+    def get_chained(self, value):
+        """Request depending on a previous response"""
+        first = self.get_response(self.base_url, params={'value': value})['value']
+        return self.get_response(self.base_url, params={'value': first + 1})['value']
+
+    def get_rounds(self, values, rounds):
+        """fan_out rounds, each requesting the values after the previous round's"""
+        def get_next(value):
+            next_value = self.get_response(self.base_url, params={'value': value + 1})['value']
+            self.parsed.append(next_value)
+            return next_value
+        for _ in range(rounds):
+            values = self.fan_out(get_next, values)
+        return values
+
+    def get_missing(self):
+        """Request that fails with a 404"""
+        return self.get_response(self.base_url.replace('/values', '/missing'))
+
+
+class AsyncStub(AsyncDataLoader, Stub):
+    """Async version of Stub"""
+
+
+class TestAsyncDataLoader(unittest.TestCase):
+    """This is a unit testing class for testing the AsyncDataLoader class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}/values'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def run_async(self, func, *args):
+        """Run a coroutine method on a fresh AsyncStub"""
+        async def main():
+            async with AsyncStub(self.base_url) as stub:
+                return await func(stub, *args)
+        return asyncio.run(main())
+
+    def test_methods_are_coroutines(self):
+        """Test public methods become coroutine functions"""
+        stub = AsyncStub(self.base_url)
+        coroutine = stub.get_chained(1)
+        self.assertTrue(asyncio.iscoroutine(coroutine))
+        coroutine.close()
+
+    def test_matches_sync(self):
+        """Test the async class returns the same data as the sync class"""
+        values = list(range(10))
+        sync_series = Stub(self.base_url).get_values(values)
+        async_series = self.run_async(AsyncStub.get_values, values)
+        pd.testing.assert_series_equal(sync_series, async_series)
+
+    def test_fan_out_single_round(self):
+        """Test fan_out items are fetched in one round"""
+        StubHandler.count = 0
+        self.run_async(AsyncStub.get_values, list(range(20)))
+        self.assertEqual(StubHandler.count, 20)
+
+    def test_chained_requests(self):
+        """Test requests that depend on earlier responses"""
+        self.assertEqual(self.run_async(AsyncStub.get_chained, 1), 2)
+
+    def test_rounds_parsed_once(self):
+        """Test replays reuse the items earlier rounds completed"""
+        async def main():
+            async with AsyncStub(self.base_url) as stub:
+                return await stub.get_rounds([0, 100], 3), stub.parsed
+        StubHandler.count = 0
+        values, parsed = asyncio.run(main())
+        self.assertEqual(values, [3, 103])
+        self.assertEqual(sorted(parsed), [1, 2, 3, 101, 102, 103])
+        self.assertEqual(StubHandler.count, 6)
+
+    def test_http_error(self):
+        """Test HTTP errors raise SystemError like the sync class"""
+        with self.assertRaises(SystemError):
+            self.run_async(AsyncStub.get_missing)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Unit Tests for the ResponseCache class, runs against a local stub API"""
+
+from messari.dataloader import DataLoader
+from messari.cache import ResponseCache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+import unittest
+
+ETAG = '"v1"'
+
+
+class CachedHandler(BaseHTTPRequestHandler):
+    """Serves a body w/ an ETag, answers 304 when the client already has it"""
+    count = 0
+    not_modified = 0
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET request"""
+        CachedHandler.count += 1
+        if self.headers.get('If-None-Match') == ETAG:
+            CachedHandler.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = f'{{"path": "{self.path}", "key": "{self.headers.get("x-api-key")}"}}'.encode()
+        self.send_response(200)
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep test output quiet"""
+
+
+class CachedLoader(DataLoader):
+    """DataLoader w/ TTL rules for the stub API"""
+    cache_ttls = [(r'/live', 0),
+                  (r'/short', 0.2),
+                  (r'/blocks/\d+', None)]
+
+
+class TestResponseCache(unittest.TestCase):
+    """This is a unit testing class for testing the ResponseCache class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), CachedHandler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        self.cache = ResponseCache(path=':memory:')
+        self.loader = CachedLoader(api_dict=None, taxonomy_dict=None)
+        self.loader.set_cache(self.cache)
+        # count every request that reaches the cache
+        self.loader.set_memo_lifetime(0)
+        CachedHandler.count, CachedHandler.not_modified = 0, 0
+
+    def test_fresh_hit(self):
+        """Test fresh responses are served w/o a request"""
+        first = self.loader.get_response(f'{self.base_url}/blocks/1', params={'page': 1})
+        second = self.loader.get_response(f'{self.base_url}/blocks/1', params={'page': 1})
+        self.assertEqual(first, second)
+        self.assertEqual(CachedHandler.count, 1)
+
+    def test_params_and_auth_scope(self):
+        """Test params & auth headers are part of the cache key"""
+        url = f'{self.base_url}/blocks/1'
+        self.loader.get_response(url, params={'page': 1})
+        self.loader.get_response(url, params={'page': 2})
+        keyed = self.loader.get_response(url, params={'page': 1}, headers={'x-api-key': 'a'})
+        self.assertEqual(keyed['key'], 'a')
+        self.assertEqual(CachedHandler.count, 3)
+
+    def test_ttl_zero_not_cached(self):
+        """Test endpoints w/ a ttl of 0 always hit the network"""
+        self.loader.get_response(f'{self.base_url}/live')
+        self.loader.get_response(f'{self.base_url}/live')
+        self.assertEqual(CachedHandler.count, 2)
+
+    def test_revalidation(self):
+        """Test stale responses w/ an ETag are revalidated"""
+        first = self.loader.get_response(f'{self.base_url}/short')
+        time.sleep(0.3)
+        second = self.loader.get_response(f'{self.base_url}/short')
+        self.assertEqual(first, second)
+        self.assertEqual(CachedHandler.not_modified, 1)
+
+        # revalidation restarts the ttl
+        self.loader.get_response(f'{self.base_url}/short')
+        self.assertEqual(CachedHandler.count, 2)
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted past max_size"""
+        self.cache.max_size = 100
+        for block in range(5):
+            self.loader.get_response(f'{self.base_url}/blocks/{block}')
+        self.assertLessEqual(self.cache.size(), 100)
+
+        CachedHandler.count = 0
+        self.loader.get_response(f'{self.base_url}/blocks/4')
+        self.assertEqual(CachedHandler.count, 0)
+        self.loader.get_response(f'{self.base_url}/blocks/0')
+        self.assertEqual(CachedHandler.count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
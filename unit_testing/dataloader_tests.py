@@ -0,0 +1,280 @@
+"""Unit Tests for the DataLoader class"""
+
+from messari.dataloader import DataLoader
+from messari.ratelimit import TokenBucket, parse_retry_after
+from messari.transport import TransportConfig
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import unittest
+import time
+import requests
+import pandas as pd
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 429 with Retry-After until `failures` requests were made"""
+    failures = 0
+    count = 0
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET request"""
+        FlakyHandler.count += 1
+        if FlakyHandler.count <= FlakyHandler.failures:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'{"ok": true}')
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep test output quiet"""
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Takes a moment to answer so identical requests overlap"""
+    count = 0
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET request"""
+        SlowHandler.count += 1
+        time.sleep(0.2)
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'{"ok": true}')
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep test output quiet"""
+
+
+class TestDataLoader(unittest.TestCase):
+    """This is a unit testing class for testing the DataLoader class"""
+
+    def test_init(self):
+        """Test initializing DataLoader class"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+        self.assertIsInstance(loader, DataLoader)
+
+    def test_fan_out_order(self):
+        """Test fan_out returns results in input order"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+
+        def slow_square(item):
+            time.sleep(0.01 * (5 - item))
+            return item * item
+
+        results = loader.fan_out(slow_square, range(5))
+        self.assertEqual(results, [0, 1, 4, 9, 16])
+
+    def test_fan_out_fail_fast(self):
+        """Test fan_out raises the first error by default"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+
+        def fail_on_two(item):
+            if item == 2:
+                raise SystemError('bad item')
+            return item
+
+        with self.assertRaises(SystemError):
+            loader.fan_out(fail_on_two, range(5))
+
+    def test_fan_out_collect_errors(self):
+        """Test fan_out collects errors when fail_fast is off"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+        loader.set_fail_fast(False)
+
+        def fail_on_two(item):
+            if item == 2:
+                raise SystemError('bad item')
+            return item
+
+        results = loader.fan_out(fail_on_two, range(5))
+        self.assertEqual(results, [0, 1, None, 3, 4])
+        self.assertEqual(len(loader.errors), 1)
+        self.assertEqual(loader.errors[0][0], 2)
+
+    def test_errors_per_call(self):
+        """Test errors are kept for the latest call only"""
+        class Source(DataLoader):
+            """Data source fanning out twice per call"""
+            def get_items(self, bad):
+                """Two rounds of requests, failing on bad"""
+                def fail_on_bad(item):
+                    if item == bad:
+                        raise SystemError('bad item')
+                    return item
+                with self.errors_scope():
+                    return (self.fan_out(fail_on_bad, range(3)) +
+                            self.fan_out(fail_on_bad, range(3)))
+
+        source = Source(api_dict=None, taxonomy_dict=None)
+        source.set_fail_fast(False)
+        source.get_items(1)
+        self.assertEqual([item for item, _ in source.errors], [1, 1])
+        source.get_items(2)
+        self.assertEqual([item for item, _ in source.errors], [2, 2])
+        source.get_items(5)
+        self.assertEqual(source.errors, [])
+
+        source.fan_out(lambda item: 1 / item, range(2))
+        source.fan_out(lambda item: 1 / item, range(2))
+        self.assertEqual(len(source.errors), 1)
+
+    def test_errors_per_thread(self):
+        """Test threads sharing a loader each keep their own errors"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+        loader.set_fail_fast(False)
+        started = threading.Barrier(2)
+        thread_errors = {}
+
+        def fail_on(bad):
+            def fail_on_bad(item):
+                if item == bad:
+                    raise SystemError('bad item')
+                started.wait(timeout=5)
+                return item
+            loader.fan_out(fail_on_bad, [bad, bad + 10])
+            thread_errors[bad] = [item for item, _ in loader.errors]
+
+        threads = [threading.Thread(target=fail_on, args=(bad,)) for bad in (1, 2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(thread_errors, {1: [1], 2: [2]})
+        self.assertEqual(loader.errors, [])
+
+    def test_fan_out_nested(self):
+        """Test fan_out can be called from inside a worker"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+        loader.set_max_workers(2)
+
+        def inner(item):
+            return loader.fan_out(lambda x: x + item, range(3))
+
+        results = loader.fan_out(inner, range(4))
+        self.assertEqual(results[3], [3, 4, 5])
+
+    def test_concat_entities(self):
+        """Test wide & long output of many entities"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+        frames = [pd.DataFrame({'value': [1, 2]}, index=[10, 11]),
+                  pd.DataFrame({'value': [3]}, index=[12]), None]
+        wide_df = loader.concat_entities(frames, ['a', 'b', 'c'], key_name='slug')
+        self.assertEqual(wide_df.shape, (3, 2))
+
+        loader.set_output_format('long')
+        long_df = loader.concat_entities(frames, ['a', 'b', 'c'], key_name='slug')
+        self.assertEqual(list(long_df.columns), ['slug', 'value'])
+        self.assertEqual(list(long_df.index), [10, 11, 12])
+        self.assertEqual(list(long_df['slug'].cat.categories), ['a', 'b', 'c'])
+        self.assertEqual(long_df['value'].to_list(), [1, 2, 3])
+
+        series_df = loader.concat_entities([pd.Series({'x': 1}), pd.Series({'x': 2, 'y': 3})],
+                                           ['a', 'b'])
+        self.assertEqual(series_df['entity'].to_list(), ['a', 'b'])
+        self.assertEqual(series_df['y'].isna().to_list(), [True, False])
+
+        loader.set_output_format('wide')
+        self.assertTrue(loader.concat_entities([None, None], ['a', 'b']).empty)
+        with self.assertRaises(ValueError):
+            loader.set_output_format('tall')
+
+    def test_token_bucket(self):
+        """Test token bucket waits once the burst is used up"""
+        bucket = TokenBucket(2, period=1)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5, places=1)
+        bucket.penalize(3)
+        self.assertGreater(bucket.reserve(), 2.5)
+
+    def test_parse_retry_after(self):
+        """Test parsing Retry-After seconds & dates"""
+        self.assertEqual(parse_retry_after('7'), 7)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+
+    def test_retry_429(self):
+        """Test 429 responses are retried until they succeed or retries run out"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_port}/'
+        try:
+            loader = DataLoader(api_dict=None, taxonomy_dict=None)
+            loader.backoff_base = 0.01
+            loader.set_rate_limit(100)
+            loader.set_memo_lifetime(0)
+
+            FlakyHandler.failures, FlakyHandler.count = 2, 0
+            self.assertEqual(loader.get_response(url), {'ok': True})
+            self.assertEqual(FlakyHandler.count, 3)
+
+            loader.set_max_retries(1)
+            FlakyHandler.failures, FlakyHandler.count = 5, 0
+            with self.assertRaises(SystemError):
+                loader.get_response(url)
+            self.assertEqual(FlakyHandler.count, 2)
+        finally:
+            server.shutdown()
+
+    def test_memo_single_flight(self):
+        """Test identical concurrent & recent requests share one response"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_port}/'
+        try:
+            loader = DataLoader(api_dict=None, taxonomy_dict=None)
+            SlowHandler.count = 0
+            responses = loader.fan_out(lambda _: loader.get_response(url), range(5))
+            self.assertEqual(responses, [{'ok': True}] * 5)
+            self.assertEqual(SlowHandler.count, 1)
+
+            loader.get_response(url)
+            self.assertEqual(SlowHandler.count, 1)
+
+            # ttl 0 endpoints join requests in progress but never reuse a response
+            loader.cache_ttls = [(r'live=1', 0)]
+            live_url = url + '?live=1'
+            SlowHandler.count = 0
+            loader.fan_out(lambda _: loader.get_response(live_url), range(5))
+            self.assertEqual(SlowHandler.count, 1)
+            loader.get_response(live_url)
+            self.assertEqual(SlowHandler.count, 2)
+
+            loader.set_memo_lifetime(0)
+            loader.get_response(url)
+            self.assertEqual(SlowHandler.count, 3)
+        finally:
+            server.shutdown()
+
+    def test_shared_transport(self):
+        """Test loaders opting into the shared pool use one session"""
+        transport = TransportConfig(pool_maxsize=16)
+        first = DataLoader(api_dict=None, taxonomy_dict=None)
+        second = DataLoader(api_dict=None, taxonomy_dict=None)
+        first.set_transport(transport, shared=True)
+        second.set_transport(transport, shared=True)
+        self.assertIs(first.session, second.session)
+
+        second.set_transport(transport)
+        self.assertIsNot(first.session, second.session)
+
+    def test_read_timeout(self):
+        """Test a hung response times out instead of blocking forever"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_port}/'
+        try:
+            loader = DataLoader(api_dict=None, taxonomy_dict=None)
+            loader.set_transport(TransportConfig(read_timeout=0.05))
+            with self.assertRaises(requests.exceptions.Timeout):
+                loader.get_response(url)
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
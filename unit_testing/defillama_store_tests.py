@@ -0,0 +1,182 @@
+"""Unit Tests for the DeFiLlama TVL store, runs against a local stub API"""
+
+from messari.defillama import defillama, DeFiLlama, AsyncDeFiLlama, TVLStore
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import pandas as pd
+
+DAY = 86400
+START = 1633046400  # 2021-10-01
+
+
+def make_protocol(days, dai_last=5.0):
+    """Stub /protocol response w/ one point per day & chain"""
+    def tvl(scale):
+        return [{'date': START + day * DAY, 'totalLiquidityUSD': scale * (day + 1)}
+                for day in range(days)]
+
+    def tokens(last):
+        items = [{'date': START + day * DAY, 'tokens': {'DAI': float(day + 1)}}
+                 for day in range(days)]
+        items[-1]['tokens'] = {'DAI': last, 'USDC': 1.0}
+        return items
+
+    return {'name': 'Stub', 'chains': ['Ethereum', 'Polygon'],
+            'chainTvls': {'Ethereum': {'tvl': tvl(10.0), 'tokens': tokens(dai_last),
+                                       'tokensInUsd': tokens(dai_last)},
+                          'Polygon': {'tvl': tvl(1.0), 'tokens': [], 'tokensInUsd': []}},
+            'tvl': tvl(11.0), 'tokens': tokens(dai_last), 'tokensInUsd': tokens(dai_last)}
+
+
+class ProtocolHandler(BaseHTTPRequestHandler):
+    """Serves ProtocolHandler.protocol for every slug"""
+    protocol: dict = {}
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET request"""
+        body = json.dumps(ProtocolHandler.protocol).encode()
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep test output quiet"""
+
+
+class TestTVLStore(unittest.TestCase):
+    """This is a unit testing class for testing incremental TVL syncs"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ProtocolHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.protocol_url = defillama.DL_GET_PROTOCOL_TVL_URL
+        defillama.DL_GET_PROTOCOL_TVL_URL = Template(
+            f'http://127.0.0.1:{cls.server.server_port}/protocol/$$slug')
+
+    @classmethod
+    def tearDownClass(cls):
+        defillama.DL_GET_PROTOCOL_TVL_URL = cls.protocol_url
+        cls.server.shutdown()
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = TVLStore(os.path.join(self.directory, 'tvl'))
+        self.dl = DeFiLlama()
+        self.dl.set_memo_lifetime(0)
+        self.dl.set_tvl_store(self.store)
+
+    def test_incremental_sync(self):
+        """Test a refresh only writes points from the watermark on"""
+        ProtocolHandler.protocol = make_protocol(3)
+        first = self.dl.sync_protocol_tvl('stub')['stub']
+        watermarks = self.store.watermarks('stub')
+        self.assertEqual(watermarks[('Ethereum', 'DAI_usd')], pd.Timestamp('2021-10-03'))
+        self.assertEqual(watermarks[('Polygon', 'totalLiquidityUSD')], pd.Timestamp('2021-10-03'))
+
+        # the last day changed & a day was added, both are written again
+        ProtocolHandler.protocol = make_protocol(4, dai_last=7.0)
+        second = self.dl.sync_protocol_tvl('stub')['stub']
+        self.assertLess(second, first)
+        self.assertEqual(second, 2 * 8 + 2)
+
+        points = self.store.read('stub', start_date=pd.Timestamp('2021-10-03'))
+        dai = points[(points['chain'] == 'all') & (points['asset'] == 'DAI')]
+        self.assertEqual(dai['value'].to_list(), [3.0, 7.0])
+        self.assertFalse(points.duplicated(['chain', 'asset', 'date']).any())
+
+        # days before the oldest watermark aren't parsed, bad values there go unnoticed
+        ProtocolHandler.protocol = make_protocol(4, dai_last=7.0)
+        ProtocolHandler.protocol['tokens'][0]['tokens'] = {'DAI': 'unparsable'}
+        # only the watermark day, TVL & DAI, USDC amounts & USD amounts of Ethereum & all
+        self.assertEqual(self.dl.sync_protocol_tvl('stub')['stub'], 5 + 1 + 5)
+        self.dl.set_tvl_store(None)
+        with self.assertRaises(ValueError):
+            self.dl.get_protocol_tvl_timeseries('stub')
+
+    def test_store_matches_parsed(self):
+        """Test answers from the store match parsing the whole response"""
+        ProtocolHandler.protocol = make_protocol(5)
+        stored_df = self.dl.get_protocol_tvl_timeseries('stub', start_date='2021-10-02',
+                                                        end_date='2021-10-04')
+        self.dl.set_tvl_store(None)
+        parsed_df = self.dl.get_protocol_tvl_timeseries('stub', start_date='2021-10-02',
+                                                        end_date='2021-10-04')
+        self.assertEqual(len(stored_df), 3)
+        pd.testing.assert_frame_equal(stored_df, parsed_df[stored_df.columns],
+                                      check_dtype=False)
+
+        self.dl.set_tvl_store(self.store)
+        self.dl.set_output_format('long')
+        long_df = self.dl.get_protocol_tvl_timeseries('stub', refresh=False)
+        self.assertEqual(list(long_df.columns[:2]), ['slug', 'chain'])
+        self.assertEqual(len(long_df), 3 * 5)
+
+    def test_balances(self):
+        """Test token amounts & USD amounts land on the same row"""
+        ProtocolHandler.protocol = make_protocol(3)
+        balances_df = self.dl.get_protocol_tvl_balances('stub', start_date='2021-10-03')
+        self.assertEqual(list(balances_df.columns),
+                         ['slug', 'date', 'chain', 'token', 'amount', 'amount_usd'])
+        usdc = balances_df[(balances_df['chain'] == 'Ethereum') & (balances_df['token'] == 'USDC')]
+        self.assertEqual(usdc[['amount', 'amount_usd']].values.tolist(), [[1.0, 1.0]])
+        tvl = balances_df[balances_df['token'] == 'totalLiquidityUSD']
+        self.assertEqual(list(tvl['chain']), ['Ethereum', 'Polygon', 'all'])
+        self.assertTrue(tvl['amount'].isna().all())
+
+    def test_bulk(self):
+        """Test bulk pulls match pulling protocols one by one & report progress"""
+        ProtocolHandler.protocol = make_protocol(3)
+        slugs = ['one', 'two', 'three']
+        progress = []
+        bulk_df = self.dl.get_protocol_tvl_bulk(slugs, processes=2,
+                                                progress=lambda *args: progress.append(args))
+        pd.testing.assert_frame_equal(bulk_df, self.dl.get_protocol_tvl_balances(slugs))
+        self.assertEqual([done for done, _, _ in progress], [1, 2, 3])
+        self.assertEqual(sorted(slug for _, _, slug in progress), sorted(slugs))
+
+        written = self.dl.sync_protocol_tvl_bulk(slugs, processes=2)
+        self.assertEqual(list(written.index), slugs)
+        self.assertEqual(written.to_list(), [len(self.store.read(slug)) for slug in slugs])
+
+        async def get_bulk():
+            async with AsyncDeFiLlama() as dl:
+                return await dl.get_protocol_tvl_bulk(slugs, processes=2)
+
+        pd.testing.assert_frame_equal(asyncio.run(get_bulk()), bulk_df)
+
+        # refreshes parse from the watermarks on in the workers too
+        ProtocolHandler.protocol = make_protocol(4)
+        ProtocolHandler.protocol['tokens'][0]['tokens'] = {'DAI': 'unparsable'}
+        written = self.dl.sync_protocol_tvl_bulk(slugs, processes=2)
+        self.assertEqual(list(written.index), slugs)
+        points = self.store.read('one')
+        self.assertEqual(points.loc[(points['chain'] == 'all') & (points['asset'] == 'DAI'),
+                                    'value'].to_list(), [1.0, 2.0, 3.0, 5.0])
+
+    def test_compaction(self):
+        """Test parts are merged once there are more than max_parts"""
+        store = TVLStore(os.path.join(self.directory, 'compacted'), max_parts=1)
+        self.dl.set_tvl_store(store)
+        ProtocolHandler.protocol = make_protocol(2)
+        self.dl.sync_protocol_tvl('stub')
+        ProtocolHandler.protocol = make_protocol(3, dai_last=9.0)
+        self.dl.sync_protocol_tvl('stub')
+        slug_path = os.path.join(store.path, 'stub')
+        parts = [name for name in os.listdir(slug_path) if name.endswith('.parquet')]
+        self.assertEqual(len(parts), 1)
+        points = store.read()
+        self.assertEqual(points.loc[(points['chain'] == 'all') & (points['asset'] == 'DAI'),
+                                    'value'].to_list(), [1.0, 2.0, 9.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,509 @@
+"""Unit Tests for the EventMonitor helpers that don't need an RPC node"""
+
+from messari.eventmonitor import (EventMonitor, SeenEvents, RollingBloomFilter, SyncStore,
+                                  HeadSubscription)
+from messari.eventmonitor.store import covers, synced_until
+from messari.eventmonitor.dedup import event_key
+from messari.eventmonitor.decoding import build_event_decoders
+from messari.eventmonitor.sync import GroupWindows, LogSyncer, SyncWindow, group_contracts
+from eth_utils import keccak
+from types import SimpleNamespace
+from aiohttp import web
+import asyncio
+import eth_abi
+import json
+import os
+import queue
+import random
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+abi_encode = getattr(eth_abi, 'encode', None) or eth_abi.encode_abi
+
+TOKEN = '0x6B175474E89094C44Da98b954EedeAC495271d0F'
+OWNER = '0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed'
+SPENDER = '0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359'
+TOKEN_ABI = json.dumps([
+    {'type': 'event', 'name': 'Transfer', 'anonymous': False,
+     'inputs': [{'name': 'from', 'type': 'address', 'indexed': True},
+                {'name': 'to', 'type': 'address', 'indexed': True},
+                {'name': 'value', 'type': 'uint256', 'indexed': False}]},
+    {'type': 'event', 'name': 'Memo', 'anonymous': False,
+     'inputs': [{'name': 'tag', 'type': 'string', 'indexed': True},
+                {'name': 'holders', 'type': 'address[]', 'indexed': False},
+                {'name': 'text', 'type': 'string', 'indexed': False}]},
+    {'type': 'function', 'name': 'transfer', 'inputs': [], 'outputs': []}])
+
+
+def make_event(index, block_number=100):
+    """Stub log entry w/ the fields events are keyed on"""
+    return {'transactionHash': index.to_bytes(32, 'big'), 'logIndex': index % 3,
+            'blockNumber': block_number}
+
+
+class TestSeenEvents(unittest.TestCase):
+    """This is a unit testing class for testing the handled events indexes"""
+
+    def test_event_key(self):
+        """Test keys differ by transaction & log index"""
+        self.assertNotEqual(event_key(make_event(1)), event_key(make_event(2)))
+        self.assertEqual(event_key(make_event(1)), event_key(make_event(1, block_number=7)))
+
+    def test_seen_events(self):
+        """Test repeats are found & counted in the hit rate"""
+        seen = SeenEvents()
+        for index in range(10):
+            key = event_key(make_event(index))
+            self.assertFalse(seen.contains(key))
+            seen.add(key, 100)
+        self.assertTrue(seen.contains(event_key(make_event(3))))
+        stats = seen.stats()
+        self.assertEqual(stats['size'], 10)
+        self.assertEqual((stats['lookups'], stats['hits']), (11, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 1 / 11)
+        self.assertGreater(stats['memory_bytes'], 0)
+
+    def test_pruning(self):
+        """Test keys below the block window are dropped"""
+        seen = SeenEvents(max_blocks=10)
+        for block_number in range(100):
+            seen.add(event_key(make_event(block_number, block_number)), block_number)
+        self.assertEqual(len(seen), 11)
+        self.assertTrue(seen.contains(event_key(make_event(89))))
+        self.assertFalse(seen.contains(event_key(make_event(88))))
+
+    def test_rolling_bloom_filter(self):
+        """Test the bloom filter remembers the last capacity keys in fixed memory"""
+        seen = RollingBloomFilter(capacity=1000, error_rate=1e-4)
+        memory = seen.memory_bytes()
+        keys = [event_key(make_event(index)) for index in range(5000)]
+        for key in keys:
+            seen.add(key)
+        self.assertEqual(seen.memory_bytes(), memory)
+        self.assertTrue(all(seen.contains(key) for key in keys[-1000:]))
+        self.assertLessEqual(len(seen), 2000)
+
+        fresh = RollingBloomFilter(capacity=1000, error_rate=1e-3)
+        for key in keys[:1000]:
+            fresh.add(key)
+        false_positives = sum(fresh.contains(key) for key in keys[1000:])
+        self.assertLess(false_positives, 20)
+
+
+class TestEventDecoder(unittest.TestCase):
+    """This is a unit testing class for testing decoding logs w/o receipts"""
+
+    def setUp(self):
+        self.decoders = build_event_decoders({TOKEN: TOKEN_ABI})
+
+    def make_log(self, topics, data):
+        """Stub log entry of the token"""
+        return {'address': TOKEN, 'topics': topics, 'data': '0x' + data.hex(),
+                'transactionHash': b'\x01' * 32, 'logIndex': 4, 'transactionIndex': 2,
+                'blockNumber': 100, 'blockHash': b'\x02' * 32}
+
+    def test_transfer(self):
+        """Test indexed & data arguments of a transfer"""
+        topic = keccak(text='Transfer(address,address,uint256)')
+        self.assertEqual(sorted(decoder.name for decoder in self.decoders.values()),
+                         ['Memo', 'Transfer'])
+        log = self.make_log([topic, abi_encode(['address'], [OWNER]),
+                             abi_encode(['address'], [SPENDER])],
+                            abi_encode(['uint256'], [10 ** 18]))
+        event = self.decoders[(TOKEN, topic)].decode(log)
+        self.assertEqual(event['args'], {'from': OWNER, 'to': SPENDER, 'value': 10 ** 18})
+        self.assertEqual(event['event'], 'Transfer')
+        self.assertEqual(event['transaction'], '0x' + '01' * 32)
+        self.assertEqual((event['log_index'], event['block_number']), (4, 100))
+
+        # an ERC-721 transfer logs the value as a topic
+        with self.assertRaises(ValueError):
+            self.decoders[(TOKEN, topic)].decode(self.make_log(log['topics'] + [topic], b''))
+
+    def test_dynamic_arguments(self):
+        """Test indexed strings stay hashed & arrays of addresses are checksummed"""
+        topic = keccak(text='Memo(string,address[],string)')
+        log = self.make_log([topic, keccak(text='tag')],
+                            abi_encode(['address[]', 'string'], [[OWNER.lower()], 'hello']))
+        args = self.decoders[(TOKEN, topic)].decode(log)['args']
+        self.assertEqual(args, {'tag': keccak(text='tag'), 'holders': [OWNER], 'text': 'hello'})
+
+
+class StubNode:
+    """eth_getLogs over two logs per block & address, refusing more than 40 results"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.most_active = 0
+        self.requests = []
+
+    def get_logs(self, params):
+        """Logs matching a filter"""
+        with self.lock:
+            self.active += 1
+            self.most_active = max(self.most_active, self.active)
+            self.requests.append(params)
+        try:
+            time.sleep(random.random() * 0.005)
+            logs = [{'address': address, 'blockNumber': block_number, 'logIndex': index}
+                    for block_number in range(params['fromBlock'], params['toBlock'] + 1)
+                    for address in params['address'] for index in (0, 1)]
+            if len(logs) > 40:
+                raise ValueError('query returned more than 40 results')
+            return logs[::-1]
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestLogSyncer(unittest.TestCase):
+    """This is a unit testing class for testing concurrent syncs"""
+
+    def test_plan(self):
+        """Test contracts sharing topics share requests & windows are sized per group"""
+        groups = group_contracts({'a': ['t1', 't2'], 'b': ['t2', 't1'], 'c': ['t1'],
+                                  'd': [], 'e': []}, max_addresses=1)
+        self.assertEqual(groups, [(('a',), ('t1', 't2')), (('b',), ('t1', 't2')),
+                                  (('c',), ('t1',)), (('d',), None), (('e',), None)])
+        groups = group_contracts({'a': ['t1', 't2'], 'b': ['t2', 't1'], 'd': []})
+        window = SyncWindow(groups[0][0], groups[0][1], 0, 9)
+        self.assertEqual(window.filter_params(),
+                         {'address': ['a', 'b'], 'fromBlock': 0, 'toBlock': 9,
+                          'topics': [['t1', 't2']]})
+        self.assertNotIn('topics', SyncWindow(('d',), None, 0, 9).filter_params())
+
+        group = GroupWindows(('a',), None, 0, 99, 10, target_logs=20)
+        window, skipped = group.next_window()
+        self.assertEqual((window.from_block, window.to_block, skipped), (0, 9, False))
+        group.fitted(window, 2)  # sparse, the next window doubles
+        window, _ = group.next_window()
+        self.assertEqual((window.from_block, window.to_block), (10, 29))
+        group.refused(window)  # halved for the rest of the sync
+        group.fitted(window.split()[0], 0)
+        window, _ = group.next_window()
+        self.assertEqual((window.from_block, window.to_block), (30, 39))
+        group.fitted(window, 100)  # dense, the next window halves
+        window, skipped = group.next_window(synced=lambda window: 42)
+        self.assertEqual((window.from_block, window.to_block, skipped), (40, 42, True))
+        window, _ = group.next_window()
+        self.assertEqual((window.from_block, window.to_block), (43, 47))
+        self.assertEqual(group.pop_done(), [])
+        self.assertEqual(group.frontier, -1)
+
+    def test_run(self):
+        """Test logs are emitted in chain order w/ limited concurrent requests"""
+        node = StubNode()
+        groups = group_contracts({'a': [], 'b': [], 'c': ['t1']})
+        logs, progress = [], []
+        syncer = LogSyncer(node.get_logs, max_workers=4, max_requests=2, window_size=16)
+        count = syncer.run(groups, 0, 99, logs.append,
+                           progress=lambda *args: progress.append(args))
+        self.assertEqual(count, 100 * 3 * 2)
+        self.assertEqual([(log['blockNumber'], log['logIndex']) for log in logs],
+                         sorted((log['blockNumber'], log['logIndex']) for log in logs))
+        self.assertEqual(len(set(map(repr, logs))), count)
+        self.assertLessEqual(node.most_active, 2)
+        self.assertEqual(progress[-1][1], 99)
+
+        # windows of a & b return 64 logs, they're halved & later ones start halved
+        spans = {params['fromBlock']: params['toBlock'] - params['fromBlock'] + 1
+                 for params in node.requests if params['address'] == ['a', 'b']}
+        self.assertEqual(spans[0], 8)
+        self.assertLessEqual(max(span for block, span in spans.items() if block >= 64), 8)
+
+        # checkpoints alone get the logs when there's no emit
+        checkpointed = []
+        LogSyncer(node.get_logs, window_size=16).run(
+            groups, 0, 99, None, checkpoint=lambda windows, logs: checkpointed.extend(logs))
+        self.assertEqual([(log['blockNumber'], log['logIndex']) for log in checkpointed],
+                         [(log['blockNumber'], log['logIndex']) for log in logs])
+
+    def test_adaptive(self):
+        """Test sparse responses grow windows & refused windows cap them"""
+        node = StubNode()
+        logs = []
+        LogSyncer(node.get_logs, max_workers=1, window_size=2, target_logs=100).run(
+            group_contracts({'a': []}), 0, 499, logs.append)
+        self.assertEqual(len(logs), 500 * 2)
+        spans = [params['toBlock'] - params['fromBlock'] + 1 for params in node.requests]
+        # windows planned ahead are sized before the responses before them arrive
+        self.assertEqual(spans[:2], [2, 2])
+        growing = spans[:spans.index(32) + 1]
+        self.assertEqual(growing, sorted(growing))
+        # 32 blocks are 64 logs & refused, the 16 block halves are the size from then on
+        refused = len(spans) - spans[::-1].index(32)
+        self.assertEqual(max(spans[refused:]), 16)
+        self.assertLess(len(spans), 500 // 16 + 16)
+
+    def test_stop(self):
+        """Test a sync stops between windows"""
+        node = StubNode()
+        logs = []
+        LogSyncer(node.get_logs, max_workers=2, window_size=10).run(
+            group_contracts({'a': []}), 0, 999, logs.append,
+            should_stop=lambda: len(logs) >= 100)
+        self.assertGreaterEqual(len(logs), 100)
+        self.assertLess(len(logs), 2 * 1000)
+
+
+class TestSyncStore(unittest.TestCase):
+    """This is a unit testing class for testing resumable syncs"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'sync.sqlite')
+
+    def make_event(self, block_number, address='a'):
+        """Event dict as EventMonitor decodes them"""
+        return {'args': {'value': 10 ** 30, 'data': b'\x01'}, 'event': 'Transfer',
+                'transaction': f'0x{address}{block_number:063x}', 'log_index': 0,
+                'transaction_index': 0, 'address': address, 'block_number': block_number,
+                'block': '0x00'}
+
+    def test_intervals(self):
+        """Test completed windows merge into intervals & watermarks"""
+        store = SyncStore(self.path)
+        store.complete([('a', 't1', 0, 9), ('a', 't1', 20, 29), ('b', '', 0, 9)], [])
+        store.complete([('a', 't1', 10, 19)], [])
+        self.assertEqual(store.intervals(), {('a', 't1'): [(0, 29)], ('b', ''): [(0, 9)]})
+        self.assertEqual(store.watermarks(), {('a', 't1'): 29, ('b', ''): 9})
+        self.assertEqual(store.watermarks(15), {('a', 't1'): 29})
+        self.assertTrue(covers([(0, 9), (20, 29)], 20, 29))
+        self.assertFalse(covers([(0, 9), (20, 29)], 5, 20))
+        self.assertEqual(synced_until([(0, 9), (20, 29)], 5), 9)
+        self.assertEqual(synced_until([(0, 9), (20, 29)], 15), 14)
+
+    def test_events(self):
+        """Test events survive reopening the store & are only kept once"""
+        store = SyncStore(self.path)
+        store.complete([('a', '', 0, 9)], [self.make_event(5), self.make_event(2, 'b')])
+        store.complete([('a', '', 0, 9)], [self.make_event(5)])
+
+        store = SyncStore(self.path)
+        events = store.read_events()
+        self.assertEqual([event['block_number'] for event in events], [2, 5])
+        self.assertEqual(events[1]['args'], {'value': 10 ** 30, 'data': '0x01'})
+        self.assertEqual(len(store.read_events(start_block=3)), 1)
+        self.assertEqual(len(store.read_events(addresses='b')), 1)
+
+    def test_resume(self):
+        """Test a stopped sync resumes w/o fetching completed windows again"""
+        store = SyncStore(self.path)
+        groups = group_contracts({'a': [], 'b': ['t1']})
+
+        def checkpoint(windows, logs):
+            store.complete([pair + (window.from_block, window.to_block)
+                            for window in windows for pair in window.pairs()],
+                           [self.make_event(log['blockNumber'], log['address'])
+                            for log in logs if log['logIndex'] == 0])
+
+        logs = []
+        LogSyncer(StubNode().get_logs, max_workers=1, window_size=10).run(
+            groups, 0, 99, logs.append, should_stop=lambda: len(logs) >= 40,
+            checkpoint=checkpoint)
+        watermarks = store.watermarks()
+        self.assertEqual(set(watermarks), {('a', ''), ('b', 't1')})
+        self.assertLess(watermarks[('a', '')], 99)
+
+        def synced(window):
+            intervals = store.intervals()
+            return min(synced_until(intervals.get(pair, []), window.from_block)
+                       for pair in window.pairs())
+
+        node = StubNode()
+        LogSyncer(node.get_logs, window_size=10).run(groups, 0, 99, logs.append,
+                                                     checkpoint=checkpoint, synced=synced)
+        for (address, _), watermark in watermarks.items():
+            self.assertEqual(min(params['fromBlock'] for params in node.requests
+                                 if params['address'] == [address]), watermark + 1)
+        self.assertEqual(store.watermarks(), {('a', ''): 99, ('b', 't1'): 99})
+        self.assertEqual(len(store.read_events()), 2 * 100)
+
+
+class TransferNode:
+    """eth_getLogs over one decodable token transfer per block"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_logs(self, params):
+        """Transfers of the token in the filter's block range"""
+        self.requests.append(params)
+        topics = [keccak(text='Transfer(address,address,uint256)'),
+                  abi_encode(['address'], [OWNER]), abi_encode(['address'], [SPENDER])]
+        return [{'address': TOKEN, 'topics': topics,
+                 'data': '0x' + abi_encode(['uint256'], [block_number]).hex(),
+                 'transactionHash': block_number.to_bytes(32, 'big'), 'logIndex': 0,
+                 'transactionIndex': 0, 'blockNumber': block_number, 'blockHash': b'\x02' * 32}
+                for block_number in range(params['fromBlock'], params['toBlock'] + 1)]
+
+
+class TestRunSync(unittest.TestCase):
+    """This is a unit testing class for testing EventMonitor syncs into a SyncStore"""
+
+    def make_monitor(self, node, store):
+        """EventMonitor syncing from node w/o the explorer & filters its __init__ sets up"""
+        monitor = EventMonitor.__new__(EventMonitor)
+        monitor.w3 = SimpleNamespace(eth=SimpleNamespace(get_logs=node.get_logs))
+        monitor.decoders = build_event_decoders({TOKEN: TOKEN_ABI})
+        monitor.events_list, monitor.seen_events = [], SeenEvents()
+        monitor.event_queue, monitor.sync_status = queue.Queue(), ''
+        monitor.sync_workers, monitor.sync_requests = 2, None
+        monitor.sync_window, monitor.sync_max_window = 10, None
+        monitor.sync_store, monitor.sync_flag = store, True
+        monitor.decoded = 0
+        decode_log = monitor.decode_log
+
+        def count_decodes(log):
+            monitor.decoded += 1
+            return decode_log(log)
+
+        monitor.decode_log = count_decodes
+        return monitor
+
+    def test_run_sync(self):
+        """Test synced logs are decoded once, stored, handled & not fetched again"""
+        store = SyncStore(':memory:')
+        monitor = self.make_monitor(TransferNode(), store)
+        self.assertEqual(monitor.run_sync([((TOKEN,), None)], 0, 49), 50)
+        while not monitor.event_queue.empty():
+            monitor.handle_event(monitor.event_queue.get())
+        self.assertEqual(monitor.decoded, 50)
+        self.assertEqual([event['args']['value'] for event in monitor.events_list],
+                         list(range(50)))
+        self.assertEqual(len(store.read_events()), 50)
+        self.assertEqual(store.watermarks(), {(TOKEN, ''): 49})
+
+        node = TransferNode()
+        self.assertEqual(self.make_monitor(node, store).run_sync([((TOKEN,), None)], 0, 59), 10)
+        self.assertEqual([params['fromBlock'] for params in node.requests], [50])
+
+        # w/o a store logs are queued as is & decoded by the handler
+        monitor = self.make_monitor(TransferNode(), None)
+        monitor.run_sync([((TOKEN,), None)], 0, 9)
+        self.assertNotIsInstance(monitor.event_queue.get(), tuple)
+        self.assertEqual(monitor.decoded, 0)
+
+
+class StubWebsocketNode:
+    """Websocket RPC answering eth_subscribe w/ `heads` new heads, or an error if refuse.
+    The first `garbled` connections get a frame that isn't JSON instead"""
+
+    def __init__(self, heads=3, refuse=False, garbled=0):
+        self.heads = heads
+        self.refuse = refuse
+        self.garbled = garbled
+        self.loop = asyncio.new_event_loop()
+        self.runner = None
+        self.port = None
+        started = threading.Event()
+        threading.Thread(target=self.serve, args=(started,), daemon=True).start()
+        started.wait()
+
+    def serve(self, started):
+        """Run the server on a loop of its own"""
+        asyncio.set_event_loop(self.loop)
+        app = web.Application()
+        app.router.add_get('/', self.handle)
+        self.runner = web.AppRunner(app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        self.loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+        started.set()
+        self.loop.run_forever()
+        self.loop.close()
+
+    async def handle(self, request):
+        """Answer the subscription & push heads"""
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        request_id = (await websocket.receive_json())['id']
+        if self.refuse:
+            await websocket.send_json({'id': request_id, 'error': {'code': -32601}})
+            return websocket
+        await websocket.send_json({'id': request_id, 'result': '0x1'})
+        if self.garbled > 0:
+            self.garbled -= 1
+            await websocket.send_str('not json')
+        for number in range(self.heads):
+            await asyncio.sleep(0.01)
+            await websocket.send_json({'method': 'eth_subscription',
+                                       'params': {'subscription': '0x1',
+                                                  'result': {'number': hex(100 + number)}}})
+        async for _ in websocket:  # until the client closes
+            pass
+        return websocket
+
+    def close(self):
+        """Stop the server"""
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class TestHeadSubscription(unittest.TestCase):
+    """This is a unit testing class for testing new heads subscriptions"""
+
+    def test_heads(self):
+        """Test new heads are forwarded as they arrive & stop ends the thread"""
+        node = StubWebsocketNode()
+        heads, arrived = [], threading.Event()
+
+        def on_head(number):
+            heads.append(number)
+            if len(heads) == 3:
+                arrived.set()
+
+        subscription = HeadSubscription(f'ws://127.0.0.1:{node.port}/', on_head)
+        try:
+            subscription.start()
+            self.assertTrue(arrived.wait(2))
+            self.assertEqual(heads, [100, 101, 102])
+            self.assertEqual(subscription.last_head, 102)
+        finally:
+            subscription.stop()
+            subscription._thread.join(2)  # pylint: disable=protected-access
+            node.close()
+        self.assertFalse(subscription.is_alive())
+
+    def test_garbled(self):
+        """Test a frame that isn't JSON reconnects instead of ending the thread"""
+        node = StubWebsocketNode(garbled=1)
+        heads, arrived = [], threading.Event()
+
+        def on_head(number):
+            heads.append(number)
+            arrived.set()
+
+        subscription = HeadSubscription(f'ws://127.0.0.1:{node.port}/', on_head,
+                                        reconnect_delay=0.01)
+        try:
+            subscription.start()
+            self.assertTrue(arrived.wait(2))
+            self.assertEqual(heads[0], 100)
+            self.assertTrue(subscription.is_alive())
+        finally:
+            subscription.stop()
+            subscription._thread.join(2)  # pylint: disable=protected-access
+            node.close()
+
+    def test_refused(self):
+        """Test a node w/o subscriptions ends the subscription"""
+        node = StubWebsocketNode(refuse=True)
+        subscription = HeadSubscription(f'ws://127.0.0.1:{node.port}/', lambda _: None)
+        try:
+            subscription.start()
+            subscription._thread.join(2)  # pylint: disable=protected-access
+            self.assertFalse(subscription.is_alive())
+            self.assertFalse(subscription.running)
+        finally:
+            node.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
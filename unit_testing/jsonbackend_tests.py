@@ -0,0 +1,119 @@
+"""Unit Tests & micro-benchmark for the JSON backends
+
+Run w/ --benchmark to time every installed backend on each fixture payload
+"""
+
+from messari.dataloader import DataLoader
+from messari.jsonbackend import available_json_backends, get_json_loads
+import json
+import random
+import sys
+import timeit
+import unittest
+
+
+def make_fixtures() -> dict:
+    """Payloads shaped like each data source's heaviest responses,
+    seeded so every run is the same"""
+    rng = random.Random(0)
+    tokens = [f'TOKEN{i}' for i in range(40)]
+
+    def tvl_series(days):
+        return [{'date': 1600000000 + day * 86400, 'totalLiquidityUSD': rng.random() * 1e9}
+                for day in range(days)]
+
+    def token_series(days):
+        return [{'date': 1600000000 + day * 86400,
+                 'tokens': {token: rng.random() * 1e6 for token in rng.sample(tokens, 10)}}
+                for day in range(days)]
+
+    chains = ['Ethereum', 'Polygon', 'Arbitrum', 'Avalanche']
+    defillama_protocol = {
+        'id': '1', 'name': 'Stub', 'chains': chains,
+        'chainTvls': {chain: {'tvl': tvl_series(700), 'tokens': token_series(700),
+                              'tokensInUsd': token_series(700)} for chain in chains},
+        'tvl': tvl_series(700), 'tokens': token_series(700), 'tokensInUsd': token_series(700)}
+
+    scanner_txlist = {'status': '1', 'message': 'OK', 'result': [
+        {'blockNumber': str(14000000 + i), 'timeStamp': str(1640000000 + i * 13),
+         'hash': f'0x{rng.getrandbits(256):064x}', 'nonce': str(i),
+         'blockHash': f'0x{rng.getrandbits(256):064x}', 'transactionIndex': str(i % 200),
+         'from': f'0x{rng.getrandbits(160):040x}', 'to': f'0x{rng.getrandbits(160):040x}',
+         'value': str(rng.getrandbits(70)), 'gas': '21000', 'gasPrice': str(rng.getrandbits(36)),
+         'isError': '0', 'txreceipt_status': '1', 'input': '0x', 'contractAddress': '',
+         'cumulativeGasUsed': str(rng.getrandbits(24)), 'gasUsed': '21000',
+         'confirmations': str(rng.getrandbits(16))} for i in range(10000)]}
+
+    messari_timeseries = {'status': {'elapsed': 10, 'timestamp': '2022-01-01T00:00:00Z'},
+                          'data': {'parameters': {'asset_key': 'bitcoin', 'interval': '1d'},
+                                   'values': [[1500000000000 + i * 86400000] +
+                                              [rng.random() * 1e4 for _ in range(5)]
+                                              for i in range(2000)]}}
+
+    deepdao_people = [{'address': f'0x{rng.getrandbits(160):040x}', 'name': f'member{i}',
+                       'daoAmount': rng.randint(1, 50), 'proposalsAmount': rng.randint(0, 100),
+                       'votesAmount': rng.randint(0, 1000)} for i in range(20000)]
+
+    solscan_token_list = {'data': [{'address': f'{rng.getrandbits(256):x}', 'tokenName': f'T{i}',
+                                    'tokenSymbol': f'T{i}', 'decimals': 9,
+                                    'marketCapRank': i, 'priceUst': rng.random(),
+                                    'marketCapFD': rng.random() * 1e9,
+                                    'extensions': {'website': 'https://example.com'}}
+                                   for i in range(5000)],
+                          'total': 5000}
+
+    return {name: json.dumps(payload).encode()
+            for name, payload in [('defillama_protocol', defillama_protocol),
+                                  ('scanner_txlist', scanner_txlist),
+                                  ('messari_timeseries', messari_timeseries),
+                                  ('deepdao_people', deepdao_people),
+                                  ('solscan_token_list', solscan_token_list)]}
+
+
+def benchmark(number: int = 5) -> None:
+    """Prints the best of `number` decodes for each backend & fixture, in ms"""
+    fixtures = make_fixtures()
+    backends = available_json_backends()
+    print(f'{"fixture":<20}{"size":>10}' + ''.join(f'{name:>10}' for name in backends))
+    for name, content in fixtures.items():
+        timings = [min(timeit.repeat(lambda loads=loads, content=content: loads(content),
+                                     number=1, repeat=number))
+                   for loads in backends.values()]
+        print(f'{name:<20}{len(content) // 1024:>8}kB'
+              + ''.join(f'{timing * 1000:>8.1f}ms' for timing in timings))
+
+
+class TestJsonBackends(unittest.TestCase):
+    """This is a unit testing class for testing the JSON backends"""
+
+    def test_backends_agree(self):
+        """Test every installed backend decodes the fixtures like json"""
+        for name, content in make_fixtures().items():
+            expected = json.loads(content)
+            for backend, loads in available_json_backends().items():
+                with self.subTest(fixture=name, backend=backend):
+                    self.assertEqual(loads(content), expected)
+
+    def test_stdlib_edge_cases(self):
+        """Test documents faster backends reject still decode like json"""
+        loads = get_json_loads()
+        self.assertTrue(loads(b'[NaN]')[0] != loads(b'[NaN]')[0])
+        with self.assertRaises(ValueError):
+            loads(b'{"broken": ')
+        self.assertEqual(get_json_loads('json')(b'{"value": 123456789012345678901234567890}'),
+                         {'value': 123456789012345678901234567890})
+
+    def test_set_json_backend(self):
+        """Test picking a backend by name"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+        loader.set_json_backend('json')
+        self.assertIs(loader.json_loads, json.loads)
+        with self.assertRaises(ValueError):
+            loader.set_json_backend('yaml')
+
+
+if __name__ == "__main__":
+    if '--benchmark' in sys.argv:
+        benchmark()
+    else:
+        unittest.main()
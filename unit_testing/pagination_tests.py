@@ -0,0 +1,118 @@
+"""Unit Tests for the Paginator classes, runs against a local stub API"""
+
+from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+TOTAL_RECORDS = 25
+
+
+class PagedHandler(BaseHTTPRequestHandler):
+    """Serves TOTAL_RECORDS numbered records w/ offset & limit parameters"""
+    pages = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET request"""
+        query = parse_qs(urlparse(self.path).query)
+        offset, limit = int(query['offset'][0]), int(query['limit'][0])
+        PagedHandler.pages.append(offset // limit)
+        time.sleep(0.02)
+        body = json.dumps(list(range(offset, min(offset + limit, TOTAL_RECORDS)))).encode()
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep test output quiet"""
+
+
+class PagedLoader(DataLoader):
+    """Loader w/ one paginated endpoint"""
+
+    def __init__(self, base_url):
+        DataLoader.__init__(self, api_dict=None, taxonomy_dict=None)
+        self.base_url = base_url
+
+    def iter_numbers(self, page_size=10, prefetch=0, max_pages=None):
+        """Paginator over the stub records"""
+        def get_page(page):
+            params = {'offset': page * page_size, 'limit': page_size}
+            return self.get_response(self.base_url, params=params)
+
+        return self.paginate(get_page, page_size=page_size, prefetch=prefetch,
+                             max_pages=max_pages)
+
+
+class AsyncPagedLoader(AsyncDataLoader, PagedLoader):
+    """Async loader w/ one paginated endpoint"""
+
+
+class TestPaginator(unittest.TestCase):
+    """This is a unit testing class for testing the Paginator classes"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), PagedHandler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}/'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        self.loader = PagedLoader(self.base_url)
+        PagedHandler.pages = []
+
+    def tearDown(self):
+        # let prefetched requests still in flight finish before the next test counts pages
+        if self.loader._executor is not None:  # pylint: disable=protected-access
+            self.loader._executor.shutdown(wait=True)  # pylint: disable=protected-access
+
+    def test_lazy(self):
+        """Test pages are only requested as they're consumed"""
+        records = iter(self.loader.iter_numbers())
+        self.assertEqual(PagedHandler.pages, [])
+        self.assertEqual([next(records) for _ in range(10)], list(range(10)))
+        self.assertEqual(PagedHandler.pages, [0])
+
+    def test_short_page(self):
+        """Test iteration stops after a short page"""
+        self.assertEqual(list(self.loader.iter_numbers()), list(range(TOTAL_RECORDS)))
+        self.assertEqual(PagedHandler.pages, [0, 1, 2])
+
+    def test_empty_page(self):
+        """Test iteration stops on an empty page when the last page is full"""
+        pages = list(self.loader.iter_numbers(page_size=5).iter_pages())
+        self.assertEqual(len(pages), 5)
+        self.assertEqual(PagedHandler.pages, [0, 1, 2, 3, 4, 5])
+
+    def test_max_pages(self):
+        """Test iteration stops after max_pages"""
+        self.assertEqual(list(self.loader.iter_numbers(max_pages=2)), list(range(20)))
+        self.assertEqual(PagedHandler.pages, [0, 1])
+
+    def test_prefetch(self):
+        """Test prefetched pages are requested concurrently & yielded in order"""
+        start = time.time()
+        records = list(self.loader.iter_numbers(page_size=2, prefetch=4))
+        self.assertEqual(records, list(range(TOTAL_RECORDS)))
+        self.assertLess(time.time() - start, 0.02 * 13)
+
+    def test_async(self):
+        """Test async paginators yield the same records"""
+        async def get_records():
+            async with AsyncPagedLoader(self.base_url) as loader:
+                return [record async for record in loader.iter_numbers(page_size=4, prefetch=2)]
+
+        self.assertEqual(asyncio.run(get_records()), list(range(TOTAL_RECORDS)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,368 @@
+"""Unit Tests for the Scanner class response validation, runs against a local stub API"""
+
+from messari.blockexplorers import Scanner, ScannerError, ScannerRateLimitError, AsyncEtherscan
+from messari.blockexplorers import scanner as scanner_module
+from messari.blockexplorers.helpers import decode_columns, int_to_hex, parse_int_strings
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import asyncio
+import json
+import threading
+import time
+import unittest
+import numpy as np
+import pandas as pd
+
+RATE_LIMITED = {'status': '0', 'message': 'NOTOK', 'result': 'Max rate limit reached'}
+NO_TRANSACTIONS = {'status': '0', 'message': 'No transactions found', 'result': []}
+NOT_VERIFIED = {'status': '0', 'message': 'NOTOK', 'result': 'Contract source code not verified'}
+TRANSACTIONS = {'status': '1', 'message': 'OK', 'result': [{'blockNumber': '1', 'hash': '0x1'}]}
+
+# 'busy' account history, block n has n % 4 transactions, capped at WINDOW per response
+WINDOW = 10
+LATEST_BLOCK = 60
+BUSY_HISTORY = [{'blockNumber': str(block), 'hash': f'0x{block}_{index}'}
+                for block in range(LATEST_BLOCK + 1) for index in range(block % 4)]
+
+# contract logs, block n has n % 5 logs, capped at LOGS_CAP per response
+LOGS_CAP = 20
+LOGS = [{'blockNumber': hex(block), 'logIndex': hex(index)}
+        for block in range(201) for index in range(block % 5)]
+
+
+def busy_result(query):
+    """Records of the busy history within the queried block range, sorted & capped"""
+    first = int(query.get('startblock', ['0'])[0])
+    last = int(query.get('endblock', [str(LATEST_BLOCK)])[0])
+    records = [record for record in BUSY_HISTORY if first <= int(record['blockNumber']) <= last]
+    if query.get('sort', ['asc'])[0] == 'desc':
+        records.reverse()
+    return {'status': '1', 'message': 'OK', 'result': records[:WINDOW]}
+
+
+def logs_result(query):
+    """Logs within the queried block range, capped"""
+    first, last = int(query['fromBlock'][0]), int(query['toBlock'][0])
+    logs = [log for log in LOGS if first <= int(log['blockNumber'], 16) <= last]
+    return {'status': '1', 'message': 'OK', 'result': logs[:LOGS_CAP]}
+
+
+def balance_of(account):
+    """Stub balance of an account"""
+    return str(int(account[2:], 16) * 10 ** 18)
+
+
+def balances_result(path, addresses):
+    """balancemulti answer, explorers under /legacy don't support the action"""
+    if path.startswith('/legacy'):
+        return {'status': '0', 'message': 'NOTOK',
+                'result': 'Error! Missing Or invalid Action name'}
+    return {'status': '1', 'message': 'OK',
+            'result': [{'account': account, 'balance': balance_of(account)}
+                       for account in addresses.split(',')]}
+
+
+class ScannerHandler(BaseHTTPRequestHandler):
+    """Stub explorer API, the 'address' parameter picks the answer"""
+    rate_limited = 0
+    count = 0
+    multi_calls = 0
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET request"""
+        ScannerHandler.count += 1
+        query = parse_qs(urlparse(self.path).query)
+        address = query.get('address', [''])[0]
+        if ScannerHandler.count <= ScannerHandler.rate_limited:
+            body = RATE_LIMITED
+        elif query['action'][0] == 'eth_blockNumber':
+            body = {'jsonrpc': '2.0', 'id': 83, 'result': hex(LATEST_BLOCK)}
+        elif query['action'][0] == 'balancemulti':
+            ScannerHandler.multi_calls += 1
+            body = balances_result(self.path, address)
+        elif query['action'][0] == 'balance':
+            body = {'status': '1', 'message': 'OK', 'result': balance_of(address)}
+        elif query['action'][0] == 'getlogs':
+            body = logs_result(query)
+        elif address == 'busy':
+            body = busy_result(query)
+        elif address == 'empty':
+            body = NO_TRANSACTIONS
+        elif address == 'error':
+            body = NOT_VERIFIED
+        else:
+            body = TRANSACTIONS
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode())
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep test output quiet"""
+
+
+class RPCHandler(BaseHTTPRequestHandler):
+    """Stub JSON-RPC node, batches over MAX_BATCH calls are rejected w/ a 413"""
+    MAX_BATCH = 16
+    batches = []
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Handle POST request"""
+        calls = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        RPCHandler.batches.append(len(calls))
+        if len(calls) > RPCHandler.MAX_BATCH:
+            self.send_response(413)
+            self.end_headers()
+            return
+        # answered in reverse, responses are matched to calls by id
+        body = [self.answer(call) for call in reversed(calls)]
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode())
+
+    @staticmethod
+    def answer(call):
+        """Answer a single call"""
+        method, params = call['method'], call['params']
+        if params[0] == 'bad':
+            return {'jsonrpc': '2.0', 'id': call['id'],
+                    'error': {'code': -32602, 'message': 'invalid argument'}}
+        if method == 'eth_getTransactionReceipt':
+            result = {'transactionHash': params[0], 'status': '0x1',
+                      'logs': [{'logIndex': '0x0'}]}
+        else:
+            result = hex(int(params[0], 16) % 7)
+        return {'jsonrpc': '2.0', 'id': call['id'], 'result': result}
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep test output quiet"""
+
+
+class TestScanner(unittest.TestCase):
+    """This is a unit testing class for testing Scanner response validation"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ScannerHandler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}/api'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.rpc_server = ThreadingHTTPServer(('127.0.0.1', 0), RPCHandler)
+        cls.rpc_url = f'http://127.0.0.1:{cls.rpc_server.server_port}'
+        threading.Thread(target=cls.rpc_server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.rpc_server.shutdown()
+
+    def setUp(self):
+        self.scanner = Scanner(base_url=self.base_url, api_key='test')
+        self.scanner.backoff_base = 0.01
+        ScannerHandler.rate_limited, ScannerHandler.count = 0, 0
+        ScannerHandler.multi_calls = 0
+
+    def test_rate_limit_retried(self):
+        """Test soft rate limits are retried transparently"""
+        ScannerHandler.rate_limited = 2
+        transactions = self.scanner.get_account_normal_transactions('0xabc')
+        self.assertEqual(ScannerHandler.count, 3)
+        self.assertEqual(transactions['0xabc']['hash'].tolist(), ['0x1'])
+
+    def test_rate_limit_exhausted(self):
+        """Test a rate limit that outlasts every retry raises ScannerRateLimitError"""
+        ScannerHandler.rate_limited = 100
+        self.scanner.set_max_retries(1)
+        with self.assertRaises(ScannerRateLimitError):
+            self.scanner.get_account_normal_transactions('0xabc')
+
+    def test_empty_result(self):
+        """Test empty results return an empty frame w/ the action's columns"""
+        transactions = self.scanner.get_account_normal_transactions('empty')
+        self.assertIsInstance(transactions, pd.DataFrame)
+        self.assertEqual(len(transactions), 0)
+        self.assertIn('hash', transactions['empty'].columns)
+
+    def test_iter_transactions(self):
+        """Test account pages stop on a short page & the empty result"""
+        transactions = list(self.scanner.iter_account_normal_transactions('0xabc', page_size=2))
+        self.assertEqual(transactions, TRANSACTIONS['result'])
+        self.assertEqual(list(self.scanner.iter_account_normal_transactions('empty')), [])
+        self.assertEqual(ScannerHandler.count, 2)
+        with self.assertRaises(ValueError):
+            self.scanner.iter_account_normal_transactions('0xabc', page_size=20000)
+
+    def test_crawl_capped_history(self):
+        """Test ranges hitting the result cap are split until the history is complete"""
+        window, scanner_module.RESULT_WINDOW = scanner_module.RESULT_WINDOW, WINDOW
+        self.scanner.set_rate_limit(1000)
+        try:
+            for shards in (1, 4):
+                for ascending in (True, False):
+                    records = self.scanner.crawl_account_records('txlist', {'address': 'busy'},
+                                                                 ascending=ascending,
+                                                                 shards=shards)
+                    expected = BUSY_HISTORY if ascending else BUSY_HISTORY[::-1]
+                    self.assertEqual([record['hash'] for record in records],
+                                     [record['hash'] for record in expected])
+
+            transactions = self.scanner.get_account_normal_transactions('busy', end_block=30)
+            self.assertEqual(len(transactions), 45)
+        finally:
+            scanner_module.RESULT_WINDOW = window
+
+    def test_native_balances(self):
+        """Test balances are fetched 20 accounts per request & merged in order"""
+        accounts = [hex(account) for account in range(1, 46)]
+        balances = self.scanner.get_account_native_balance(accounts)
+        self.assertEqual(balances.index.tolist(), accounts)
+        self.assertEqual(balances['balances'].tolist(), [balance_of(a) for a in accounts])
+        self.assertEqual(ScannerHandler.multi_calls, 3)
+        self.assertEqual(ScannerHandler.count, 3)
+
+    def test_native_balances_fallback(self):
+        """Test explorers w/o balancemulti fall back to one request per account"""
+        legacy = Scanner(base_url=self.base_url.replace('/api', '/legacy/api'), api_key='test')
+        legacy.set_rate_limit(1000)
+        accounts = [hex(account) for account in range(1, 26)]
+        balances = legacy.get_account_native_balance(accounts)
+        self.assertEqual(balances['balances'].tolist(), [balance_of(a) for a in accounts])
+        self.assertFalse(legacy.balance_multi)
+        self.assertEqual(ScannerHandler.count, 2 + len(accounts))
+
+    def test_rpc_batches(self):
+        """Test proxy calls are batched to the node & oversized batches are halved"""
+        RPCHandler.batches = []
+        self.scanner.set_rate_limit(1000)
+        self.scanner.set_rpc_url(self.rpc_url, max_batch_size=64)
+        self.scanner.rpc_batch_size = 40
+        accounts = [hex(account) for account in range(200)]
+        counts = self.scanner.get_eth_account_transaction_count(accounts)
+        self.assertEqual(counts['transaction_count'].tolist(), [a % 7 for a in range(200)])
+        self.assertLessEqual(self.scanner.rpc_batch_size, RPCHandler.MAX_BATCH)
+        self.assertLess(len(RPCHandler.batches), 40)
+        self.assertEqual(ScannerHandler.count, 0)
+
+        receipts = self.scanner.get_eth_transaction_receipt(['0x1', '0x2'])
+        self.assertEqual(receipts['0x2']['transactionHash'].tolist(), ['0x2'])
+
+        self.scanner.set_fail_fast(False)
+        self.assertEqual(self.scanner.rpc_batch('eth_getBlockTransactionCountByNumber',
+                                                [['0x8'], ['bad']]), ['0x1', None])
+        self.assertEqual(len(self.scanner.errors), 1)
+        self.scanner.set_fail_fast(True)
+        with self.assertRaises(ScannerError):
+            self.scanner.rpc_batch('eth_getBlockTransactionCountByNumber', [['bad']])
+
+    def test_rpc_rate_limit(self):
+        """Test the explorer's default limit doesn't slow down batches to the node"""
+        unkeyed = Scanner(base_url=self.base_url)
+        unkeyed.set_rpc_url(self.rpc_url, batch_size=10)
+        start = time.time()
+        counts = unkeyed.get_eth_account_transaction_count([hex(a) for a in range(100)])
+        self.assertEqual(counts['transaction_count'].tolist(), [a % 7 for a in range(100)])
+        self.assertLess(time.time() - start, 2)
+
+        # the node's own limit survives changing the explorer's
+        unkeyed.set_rpc_url(self.rpc_url, batch_size=10, rate_limit=2)
+        unkeyed.set_rate_limit(1, period=5)
+        self.assertEqual(unkeyed.rate_limiter.reserve(self.rpc_url), 0)
+        self.assertEqual(unkeyed.rate_limiter.reserve(self.rpc_url), 0)
+        self.assertGreater(unkeyed.rate_limiter.reserve(self.rpc_url), 0)
+        self.assertGreater(unkeyed.rate_limiter.reserve(self.base_url) +
+                           unkeyed.rate_limiter.reserve(self.base_url), 4)
+
+    def test_async_rpc_batches(self):
+        """Test async scanners POST the same batches"""
+        async def get_counts():
+            async with AsyncEtherscan() as etherscan:
+                etherscan.set_rate_limit(1000)
+                etherscan.set_rpc_url(self.rpc_url)
+                return await etherscan.get_eth_block_transaction_count(list(range(300)))
+
+        counts = asyncio.run(get_counts())
+        self.assertEqual(counts['transaction_count'].tolist(), [block % 7 for block in range(300)])
+
+    def test_decode_columns(self):
+        """Test hex & decimal columns are parsed whole, wei-scale ones w/o overflowing"""
+        values = [0, 1, 255, 2 ** 63 - 1]
+        for base, to_string in ((16, hex), (10, str)):
+            parsed = parse_int_strings([to_string(value) for value in values], base)
+            self.assertEqual(parsed.dtype, np.int64)
+            self.assertEqual(parsed.tolist(), values)
+            self.assertEqual(parse_int_strings([to_string(2 ** 64 - 1)], base).dtype, np.uint64)
+            wei = parse_int_strings([to_string(3 * 10 ** 30)], base)
+            self.assertEqual(wei.dtype, np.longdouble)
+            self.assertAlmostEqual(float(wei[0]) / 1e30, 3.0)
+            with self.assertRaises(ValueError):
+                parse_int_strings(['0x1g' if base == 16 else '1.5'], base)
+        self.assertEqual(int_to_hex(np.arange(3)), ['0x0', '0x1', '0x2'])
+
+        frame = decode_columns(pd.DataFrame({'timeStamp': ['1640000000', '1640000013'],
+                                             'gasUsed': ['0x5208', None],
+                                             'type': ['call', 'create']}))
+        self.assertEqual(frame['timeStamp'].iloc[0], pd.Timestamp('2021-12-20 11:33:20'))
+        self.assertEqual(frame['gasUsed'].tolist(), [21000, pd.NA])
+        self.assertEqual(frame['type'].tolist(), ['call', 'create'])
+
+    def test_typed_output(self):
+        """Test typed Scanners return numeric columns"""
+        self.scanner.set_rate_limit(1000)
+        self.scanner.set_typed_output()
+        transactions = self.scanner.get_account_normal_transactions('busy', end_block=5)
+        self.assertEqual(transactions['busy']['blockNumber'].dtype, np.int64)
+        accounts = [hex(account) for account in range(1, 26)]
+        balances = self.scanner.get_account_native_balance(accounts)
+        self.assertEqual(balances['balances'].iloc[-1], Decimal(25 * 10 ** 18))
+        self.scanner.set_typed_output(exact=False)
+        balances = self.scanner.get_account_native_balance(accounts)
+        self.assertEqual(balances['balances'].dtype, np.longdouble)
+
+    def test_long_output(self):
+        """Test long output stacks every account's records w/o padding"""
+        self.scanner.set_rate_limit(1000)
+        self.scanner.set_output_format('long')
+        transactions = self.scanner.get_account_normal_transactions(['busy', '0xabc', 'empty'],
+                                                                    end_block=5)
+        busy = [record for record in BUSY_HISTORY if int(record['blockNumber']) <= 5]
+        self.assertEqual(len(transactions), len(busy) + 1)
+        self.assertEqual(transactions['account'].tolist(), ['busy'] * len(busy) + ['0xabc'])
+        self.assertEqual(transactions['hash'].tolist(),
+                         [record['hash'] for record in busy] + ['0x1'])
+        self.assertIsInstance(transactions['hash'].dtype, pd.ArrowDtype)
+
+        arrow_dtype = pd.ArrowDtype
+        del pd.ArrowDtype  # pandas < 1.5
+        try:
+            transactions = self.scanner.get_account_normal_transactions(['busy'], end_block=5)
+        finally:
+            pd.ArrowDtype = arrow_dtype
+        self.assertEqual(transactions['hash'].tolist(), [record['hash'] for record in busy])
+
+        self.scanner.set_typed_output()
+        transactions = self.scanner.get_account_normal_transactions(['busy'], end_block=5)
+        self.assertEqual(transactions['blockNumber'].dtype, np.int64)
+        with self.assertRaises(ValueError):
+            self.scanner.set_output_format('tall')
+
+    def test_logs_range(self):
+        """Test full log windows are split & logs come out complete in block order"""
+        cap, scanner_module.LOGS_CAP = scanner_module.LOGS_CAP, LOGS_CAP
+        self.scanner.set_rate_limit(1000)
+        try:
+            logs = list(self.scanner.iter_logs_range('0xabc', 0, 200, window=50))
+            self.assertEqual(logs, LOGS)
+            logs_df = self.scanner.get_logs_range('0xabc', 100, 120, topic0='0x1')
+            self.assertEqual(len(logs_df), sum(block % 5 for block in range(100, 121)))
+            with self.assertRaises(ValueError):
+                self.scanner.get_logs_range('0xabc', 0, 10, topic4='0x1')
+        finally:
+            scanner_module.LOGS_CAP = cap
+
+    def test_error(self):
+        """Test error payloads raise ScannerError"""
+        with self.assertRaises(ScannerError):
+            self.scanner.get_account_normal_transactions('error')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Unit Tests for streamed JSON responses, runs against a local stub API"""
+
+from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
+from messari import streaming
+from messari.streaming import ColumnBuffer, stream_columns
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import io
+import json
+import threading
+import unittest
+
+PROTOCOL = {'name': 'Stub', 'description': 'x' * 1000,
+            'chains': ['Ethereum', 'Polygon'],
+            'chainTvls': {'Ethereum': {'tvl': [{'date': 1, 'totalLiquidityUSD': 10.0},
+                                               {'date': 2, 'totalLiquidityUSD': 11.5}],
+                                       'tokens': [{'date': 1, 'tokens': {'DAI': 5}},
+                                                  {'date': 2, 'tokens': {'USDC': 6}}]},
+                          'Polygon': {'tvl': [{'date': 1, 'totalLiquidityUSD': 1.0}]}},
+            'tvl': [{'date': 1, 'totalLiquidityUSD': 11.0}]}
+
+PATTERNS = ['chains.item', 'tvl.item', 'chainTvls.*.tvl.item', 'chainTvls.*.tokens.item']
+
+
+class ProtocolHandler(BaseHTTPRequestHandler):
+    """Serves the stub protocol in small chunks"""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET request"""
+        if self.path.startswith('/missing'):
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = json.dumps(PROTOCOL).encode()
+        self.send_response(200)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for start in range(0, len(body), 64):
+            chunk = body[start:start + 64]
+            self.wfile.write(f'{len(chunk):x}\r\n'.encode() + chunk + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep test output quiet"""
+
+
+class AsyncLoader(AsyncDataLoader, DataLoader):
+    """Async loader w/ a method streaming the stub protocol"""
+
+    def get_chains(self, url):
+        """Chains of the stub protocol"""
+        return self.stream_response(url, ['chains.item'])['chains.item'].to_list()
+
+
+class TestStreaming(unittest.TestCase):
+    """This is a unit testing class for testing streamed responses"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ProtocolHandler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def check_protocol(self, buffers):
+        """Assert the stub protocol was split into the expected columns"""
+        self.assertEqual(buffers['chains.item'].to_list(), ['Ethereum', 'Polygon'])
+        self.assertEqual(buffers['tvl.item'].columns, {'date': [1], 'totalLiquidityUSD': [11.0]})
+        self.assertEqual(buffers['chainTvls.Ethereum.tvl.item'].columns['totalLiquidityUSD'],
+                         [10.0, 11.5])
+        self.assertEqual(len(buffers['chainTvls.Polygon.tvl.item']), 1)
+        self.assertNotIn('chainTvls.Polygon.tokens.item', buffers)
+
+    def test_column_buffer(self):
+        """Test keys missing from an item are filled w/ None"""
+        buffer = ColumnBuffer(flatten=True)
+        buffer.append({'date': 1, 'tokens': {'DAI': 5}})
+        buffer.append({'date': 2, 'tokens': {'USDC': 6}})
+        self.assertEqual(buffer.columns, {'date': [1, 2], 'DAI': [5, None], 'USDC': [None, 6]})
+        self.assertEqual(buffer.to_frame().shape, (2, 3))
+
+    def test_stream_columns(self):
+        """Test only the items at the patterns are kept"""
+        buffers = stream_columns(io.BytesIO(json.dumps(PROTOCOL).encode()), PATTERNS)
+        self.check_protocol(buffers)
+        self.assertEqual(len(buffers), 5)
+
+    def test_without_ijson(self):
+        """Test the whole document fallback finds the same items"""
+        content = json.dumps(PROTOCOL).encode()
+        streamed = stream_columns(io.BytesIO(content), PATTERNS, flatten=True)
+        ijson, streaming.ijson = streaming.ijson, None
+        try:
+            parsed = stream_columns(io.BytesIO(content), PATTERNS, flatten=True)
+        finally:
+            streaming.ijson = ijson
+        self.assertEqual({prefix: buffer.columns for prefix, buffer in streamed.items()},
+                         {prefix: buffer.columns for prefix, buffer in parsed.items()})
+
+    def test_stream_response(self):
+        """Test a chunked response is parsed off the socket"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+        self.check_protocol(loader.stream_response(f'{self.base_url}/protocol', PATTERNS))
+        with self.assertRaises(SystemError):
+            loader.stream_response(f'{self.base_url}/missing', PATTERNS)
+
+    def test_get_columns(self):
+        """Test bodies are decoded whole unless over the stream threshold"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+        url = f'{self.base_url}/protocol'
+        self.check_protocol(loader.get_columns(url, PATTERNS))
+
+        # a chunked body's size isn't known up front, it's streamed
+        loader.set_stream_threshold(10 ** 6)
+        self.check_protocol(loader.get_columns(url, PATTERNS))
+
+    def test_async_stream_response(self):
+        """Test async loaders parse the fetched body the same way"""
+        async def get_chains():
+            async with AsyncLoader(api_dict=None, taxonomy_dict=None) as loader:
+                return await loader.get_chains(f'{self.base_url}/protocol')
+
+        self.assertEqual(asyncio.run(get_chains()), ['Ethereum', 'Polygon'])
+
+
+if __name__ == "__main__":
+    unittest.main()